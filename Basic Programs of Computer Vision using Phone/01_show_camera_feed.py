@@ -1,7 +1,8 @@
 import cv2
+from CaptureModule import FrameReader
 
 url = 'http://192.168.31.118:8080/video'
-cap = cv2.VideoCapture(url)
+cap = FrameReader(url).start()
 
 while True:
     ret, frame = cap.read()
@@ -1,17 +1,17 @@
 import cv2
+from CaptureModule import FrameReader
+from cvkit.faces import FaceEngine, drawFaces
 
 url = 'http://192.168.31.118:8080/video'
-cap = cv2.VideoCapture(url)
-face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+cap = FrameReader(url).start()
+engine = FaceEngine(scale=0.5, interval=5, minNeighbors=4)
 
 while True:
     ret, frame = cap.read()
     if not ret:
         break
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    faces = face_cascade.detectMultiScale(gray, 1.1, 4)
-    for (x, y, w, h) in faces:
-        cv2.rectangle(frame, (x,y), (x+w, y+h), (0,255,0), 2)
+    faces = engine.process(frame)
+    drawFaces(frame, faces)
     cv2.imshow("Face Detection", frame)
     if cv2.waitKey(1) == ord('q'):
         break
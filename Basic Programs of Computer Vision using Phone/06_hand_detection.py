@@ -1,8 +1,9 @@
 import cv2
 import mediapipe as mp
+from CaptureModule import FrameReader
 
 url = 'http://192.168.31.118:8080/video'
-cap = cv2.VideoCapture(url)
+cap = FrameReader(url).start()
 mp_hands = mp.solutions.hands
 hands = mp_hands.Hands()
 mp_draw = mp.solutions.drawing_utils
@@ -1,19 +1,20 @@
 import cv2
-import numpy as np
+from CaptureModule import FrameReader
+from cvkit.color import ColorEngine, drawBlobs
 
 url = 'http://192.168.31.118:8080/video'
-cap = cv2.VideoCapture(url)
+cap = FrameReader(url).start()
+# Every class in cvkit.color.COLORS, labelled in one lookup-table pass
+engine = ColorEngine(level=1, minArea=1000)
 
 while True:
     ret, frame = cap.read()
     if not ret:
         break
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-    lower = (0, 120, 70)
-    upper = (10, 255, 255)
-    mask = cv2.inRange(hsv, lower, upper)
-    result = cv2.bitwise_and(frame, frame, mask=mask)
-    cv2.imshow("Red Color Detection", result)
+    engine.apply(frame)
+    result = cv2.bitwise_and(frame, frame, mask=engine.foreground())
+    drawBlobs(result, engine)
+    cv2.imshow("Color Detection", result)
     if cv2.waitKey(1) == ord('q'):
         break
 cap.release()
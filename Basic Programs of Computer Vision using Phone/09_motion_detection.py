@@ -1,28 +1,21 @@
 import cv2
+from CaptureModule import FrameReader
+from cvkit.motion import MotionEngine
 
 url = 'http://192.168.31.118:8080/video'
-cap = cv2.VideoCapture(url)
+cap = FrameReader(url).start()
 
-ret, frame1 = cap.read()
-ret, frame2 = cap.read()
+engine = MotionEngine("running_avg", level=1, threshold=20, dilate=3, minArea=1000)
 
 while True:
-    diff = cv2.absdiff(frame1, frame2)
-    gray = cv2.cvtColor(diff, cv2.COLOR_BGR2GRAY)
-    blur = cv2.GaussianBlur(gray, (5,5), 0)
-    _, thresh = cv2.threshold(blur, 20, 255, cv2.THRESH_BINARY)
-    dilated = cv2.dilate(thresh, None, iterations=3)
-    contours, _ = cv2.findContours(dilated, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    ret, frame = cap.read()
+    if not ret:
+        break
 
-    for c in contours:
-        if cv2.contourArea(c) < 1000:
-            continue
-        (x, y, w, h) = cv2.boundingRect(c)
-        cv2.rectangle(frame1, (x, y), (x + w, y + h), (0,255,0), 2)
+    for (x, y, w, h) in engine.apply(frame):
+        cv2.rectangle(frame, (x, y), (x + w, y + h), (0,255,0), 2)
 
-    cv2.imshow("Motion Detection", frame1)
-    frame1 = frame2
-    ret, frame2 = cap.read()
+    cv2.imshow("Motion Detection", frame)
     if cv2.waitKey(1) == ord('q'):
         break
 cap.release()
@@ -1,16 +1,16 @@
 import cv2
+from CaptureModule import FrameReader
+from cvkit.sketch import SketchFilter
 
 url = 'http://192.168.31.118:8080/video'
-cap = cv2.VideoCapture(url)
+cap = FrameReader(url).start()
+sketcher = SketchFilter(ksize=21)
 
 while True:
     ret, frame = cap.read()
     if not ret:
         break
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    inv = 255 - gray
-    blur = cv2.GaussianBlur(inv, (21, 21), 0)
-    sketch = cv2.divide(gray, 255 - blur, scale=256)
+    sketch = sketcher.apply(frame)
     cv2.imshow("Sketch Effect", sketch)
     if cv2.waitKey(1) == ord('q'):
         break
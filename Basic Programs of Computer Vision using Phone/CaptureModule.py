@@ -0,0 +1,273 @@
+import collections
+import random
+import threading
+import time
+
+import cv2
+
+
+class FrameReader:
+    """
+    Reads and decodes a video source on a background thread.
+
+    Decoded frames go into a small ring buffer that only keeps the newest
+    `bufferSize` frames, so a slow consumer never builds up a backlog of
+    stale MJPEG frames. Frames that are overwritten before being read are
+    counted in `dropped`.
+
+    For network streams (any `src` with "://", or reconnect=True) the reader
+    survives Wi-Fi drop-outs. A failed read, or a watchdog seeing no frame
+    for `readTimeout` seconds, counts as a stall. The capture is then
+    reopened with jittered exponential backoff (`backoff` doubling up to
+    `maxBackoff` seconds), and the delay resets after a good frame. An
+    open() or grab() that hangs can't be interrupted safely, so the
+    capture thread stamps its progress before each step, with how long the
+    step may take, and the watchdog starts a fresh capture thread when a
+    step overruns; the hung one exits when it returns. Throughout, read()
+    waits, so the caller's loop and its state (background models,
+    trackers) stay warm. `stalls` and `reconnects` count events and
+    `connected` tells whether frames are flowing.
+
+    read() gives up after `timeout` seconds without a new frame (None waits
+    for good), so a script whose phone is unreachable still ends instead of
+    hanging, while shorter drop-outs are ridden out. A source that isn't a
+    network stream and fails to open ends the reader at once.
+
+    Usage:
+        cap = FrameReader('http://192.168.31.118:8080/video').start()
+        ret, frame = cap.read()
+    """
+
+    def __init__(self, src, bufferSize=1, apiPreference=cv2.CAP_ANY, reconnect=None,
+                 readTimeout=5.0, backoff=0.5, maxBackoff=30.0, timeout=15.0):
+        self.src = src
+        self.apiPreference = apiPreference
+        self.reconnect = ("://" in str(src)) if reconnect is None else reconnect
+        self.readTimeout = readTimeout
+        self.backoff = backoff
+        self.maxBackoff = maxBackoff
+        self.timeout = timeout
+
+        self.buffer = collections.deque(maxlen=bufferSize)
+        self.cond = threading.Condition()
+        self.stopEvent = threading.Event()
+        self.thread = None
+        self.watchdog = None
+        self.running = False
+        self.cap = None
+        self.generation = 0       # Bumped to abandon a capture thread stuck in grab()
+        self.lastFrameTime = None
+        self.lastProgress = None  # When the capture thread last finished a step
+        self.progressLimit = 0.0  # Seconds its current step may take
+
+        self.frameId = 0      # Frames decoded since start
+        self.dropped = 0      # Frames overwritten before anyone read them
+        self.lastId = -1      # Id of the last frame handed to the caller
+        self.stalls = 0       # Times the stream stopped delivering
+        self.reconnects = 0   # Successful reopenings after a stall
+        self.connected = False
+
+    def _open(self):
+        params = []
+        # FFmpeg backend: bound the time open() and grab() may block
+        for prop, seconds in (("CAP_PROP_OPEN_TIMEOUT_MSEC", self.readTimeout * 2),
+                              ("CAP_PROP_READ_TIMEOUT_MSEC", self.readTimeout)):
+            if self.reconnect and hasattr(cv2, prop):
+                params += [getattr(cv2, prop), int(seconds * 1000)]
+        if params:
+            return cv2.VideoCapture(self.src, self.apiPreference, params)
+        return cv2.VideoCapture(self.src, self.apiPreference)
+
+    def start(self):
+        self.cap = self._open()
+        self.running = True
+        self.lastFrameTime = time.monotonic()
+        self._progress(self.generation, self.readTimeout)
+        self.thread = self._spawn(self.cap)
+        if self.reconnect:
+            self.watchdog = threading.Thread(target=self._watch, daemon=True)
+            self.watchdog.start()
+        return self
+
+    def _spawn(self, cap):
+        thread = threading.Thread(target=self._update, args=(cap, self.generation), daemon=True)
+        thread.start()
+        return thread
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def _backoffDelay(self, attempt):
+        delay = min(self.maxBackoff, self.backoff * 2 ** attempt)
+        # Equal jitter: many cameras dropping together don't retry in lockstep
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _progress(self, generation, limit):
+        """Stamps progress of the capture thread, whose next step may take `limit` seconds."""
+        with self.cond:
+            if generation == self.generation:
+                self.lastProgress = time.monotonic()
+                self.progressLimit = limit
+
+    def _update(self, cap, generation):
+        attempt = 0
+        while self.running and generation == self.generation:
+            if cap is None or not cap.isOpened():
+                if cap is not None:
+                    cap.release()
+                    cap = None
+                if not self.reconnect:
+                    break
+                delay = self._backoffDelay(attempt)
+                self._progress(generation, delay + self.readTimeout)
+                if self.stopEvent.wait(delay) or generation != self.generation:
+                    break
+                attempt += 1
+                # FFmpeg gives up on open() after 2 * readTimeout; a hang past that is the watchdog's
+                self._progress(generation, 3 * self.readTimeout)
+                cap = self._open()
+                if generation != self.generation:
+                    break
+                self.cap = cap
+                # The first grab() after a reopen is watched like any other
+                self._progress(generation, self.readTimeout)
+                continue
+
+            if not cap.grab():
+                if generation != self.generation:
+                    break
+                if not self.reconnect:
+                    break
+                self._stalled()
+                cap.release()
+                cap = None
+                continue
+            # Stamp right after grab, before the (slower) decode step
+            timestamp = time.monotonic()
+            ret, frame = cap.retrieve()
+            if generation != self.generation:
+                break
+            if not ret:
+                continue
+
+            with self.cond:
+                if not self.connected and self.frameId > 0:
+                    self.reconnects += 1
+                self.connected = True
+                attempt = 0
+                self.lastFrameTime = timestamp
+                self.lastProgress = timestamp
+                self.progressLimit = self.readTimeout
+                if len(self.buffer) == self.buffer.maxlen:
+                    self.dropped += 1
+                self.buffer.append((self.frameId, timestamp, frame))
+                self.frameId += 1
+                self.cond.notify_all()
+
+        if cap is not None:
+            cap.release()
+        if generation == self.generation:
+            with self.cond:
+                self.running = False
+                self.connected = False
+                self.cond.notify_all()
+
+    def _stalled(self):
+        with self.cond:
+            if self.connected or self.frameId == 0:
+                self.stalls += 1
+            self.connected = False
+
+    def _watch(self):
+        while not self.stopEvent.wait(self.readTimeout / 4):
+            if not self.running:
+                break
+            if time.monotonic() - self.lastProgress > self.progressLimit:
+                # open() or grab() is stuck on a dead connection: abandon that thread
+                self._stalled()
+                with self.cond:
+                    self.generation += 1
+                self._progress(self.generation, self.readTimeout)
+                self.thread = self._spawn(None)
+
+    def readWithInfo(self, timeout=None):
+        """
+        Returns (ret, frame, timestamp, frameId) for the newest unread frame.
+        Blocks until a new frame arrives, the reader stops or `timeout`
+        seconds pass (the reader's `timeout` if None). `timestamp` is on the
+        time.monotonic() clock.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        with self.cond:
+            ready = self.cond.wait_for(lambda: self.buffer or not self.running, timeout)
+            if not ready or not self.buffer:
+                return False, None, None, None
+
+            frameId, timestamp, frame = self.buffer.pop()
+            # Anything still buffered is older than what we hand out
+            self.dropped += len(self.buffer)
+            self.buffer.clear()
+            self.lastId = frameId
+            return True, frame, timestamp, frameId
+
+    def read(self, timeout=None):
+        """Drop-in replacement for cv2.VideoCapture.read()."""
+        ret, frame, _, _ = self.readWithInfo(timeout)
+        return ret, frame
+
+    def latency(self, timestamp):
+        """Seconds between capture of `timestamp` and now."""
+        return time.monotonic() - timestamp
+
+    def release(self):
+        self.stopEvent.set()
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+        if self.watchdog is not None:
+            self.watchdog.join(timeout=2.0)
+        # The capture thread releases its own capture on the way out, but not
+        # if it is still stuck; close the stream and its socket either way
+        cap, self.cap = self.cap, None
+        if cap is not None:
+            cap.release()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show a stream through FrameReader")
+    parser.add_argument("url", nargs="?", default="http://192.168.31.118:8080/video")
+    args = parser.parse_args()
+
+    cap = FrameReader(args.url).start()
+    while True:
+        ret, frame, timestamp, frameId = cap.readWithInfo(timeout=0.5)
+        if not ret:
+            if not cap.running:
+                break
+            # Reconnecting; keep the window responsive
+            if cv2.waitKey(1) == ord('q'):
+                break
+            continue
+        text = (f"Latency: {cap.latency(timestamp) * 1000:.0f} ms  Dropped: {cap.dropped}  "
+                f"Stalls: {cap.stalls}  Reconnects: {cap.reconnects}")
+        cv2.putText(frame, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        cv2.imshow("FrameReader", frame)
+        if cv2.waitKey(1) == ord('q'):
+            break
+    cap.release()
+    cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import http.server
+import socket
+import socketserver
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip('/') != '/video':
+            self.send_error(404)
+            return
+
+        server = self.server.stub
+        # Accepted, but no response yet: the client hangs in open()
+        while server.running and server.connectStalled():
+            time.sleep(0.05)
+        self.send_response(200)
+        self.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=frame')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        interval = 1.0 / server.fps
+        nextTime = time.monotonic()
+        server.track(self.connection, True)
+        try:
+            while server.running:
+                if server.stalled():
+                    # Keep the socket open but send nothing, like a phone on bad Wi-Fi
+                    time.sleep(0.05)
+                    nextTime = time.monotonic()
+                    continue
+                jpeg = server.nextJpeg()
+                self.wfile.write(b'--frame\r\n')
+                self.wfile.write(b'Content-Type: image/jpeg\r\n')
+                self.wfile.write(f'Content-Length: {len(jpeg)}\r\n\r\n'.encode())
+                self.wfile.write(jpeg)
+                self.wfile.write(b'\r\n')
+
+                nextTime += interval
+                delay = nextTime - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            server.track(self.connection, False)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class MjpegStubServer:
+    """
+    Local stand-in for the IP Webcam app on the phone.
+
+    Serves a synthetic MJPEG stream at http://<host>:<port>/video. Each frame
+    has its index burned in as text and as a moving square, so a client can
+    tell which frame it received.
+
+    killConnections() drops every open client connection, stall(seconds)
+    keeps connections open but stops sending, and stallConnects(seconds)
+    accepts new connections but holds back the response, so reconnect logic
+    can be exercised on demand.
+
+    Usage:
+        with MjpegStubServer(port=8080, fps=30) as server:
+            cap = cv2.VideoCapture(server.url)
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, fps=30, width=640, height=480):
+        self.fps = fps
+        self.width = width
+        self.height = height
+        self.frameCount = 0
+        self.lock = threading.Lock()
+        self.running = False
+        self.connections = set()
+        self.stallUntil = 0.0
+        self.connectStallUntil = 0.0
+
+        self.httpd = _ThreadingServer((host, port), _Handler)
+        self.httpd.stub = self
+        self.host, self.port = self.httpd.server_address[:2]
+        self.thread = None
+
+    @property
+    def url(self):
+        return f'http://{self.host}:{self.port}/video'
+
+    def makeFrame(self, index):
+        frame = np.zeros((self.height, self.width, 3), np.uint8)
+        size = 60
+        x = (index * 8) % (self.width - size)
+        cv2.rectangle(frame, (x, self.height // 2 - size // 2),
+                      (x + size, self.height // 2 + size // 2), (0, 255, 0), cv2.FILLED)
+        cv2.putText(frame, str(index), (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+        return frame
+
+    def nextJpeg(self):
+        with self.lock:
+            index = self.frameCount
+            self.frameCount += 1
+        ok, jpeg = cv2.imencode('.jpg', self.makeFrame(index))
+        return jpeg.tobytes()
+
+    def track(self, conn, active):
+        with self.lock:
+            if active:
+                self.connections.add(conn)
+            else:
+                self.connections.discard(conn)
+
+    def killConnections(self):
+        """Resets every open client connection; returns how many were dropped."""
+        with self.lock:
+            conns = list(self.connections)
+        for conn in conns:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        return len(conns)
+
+    def stall(self, seconds):
+        """Stop sending frames for `seconds` without closing connections."""
+        self.stallUntil = time.monotonic() + seconds
+
+    def stalled(self):
+        return time.monotonic() < self.stallUntil
+
+    def stallConnects(self, seconds):
+        """Leave new connections without a response for `seconds`."""
+        self.connectStallUntil = time.monotonic() + seconds
+
+    def connectStalled(self):
+        return time.monotonic() < self.connectStallUntil
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a synthetic MJPEG stream at /video")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--kill-every", type=float, default=0, help="Drop all connections every N seconds")
+    parser.add_argument("--stall-every", type=float, default=0, help="Stall the stream every N seconds")
+    parser.add_argument("--stall-for", type=float, default=10.0, help="Length of each stall in seconds")
+    args = parser.parse_args()
+
+    server = MjpegStubServer(args.host, args.port, args.fps).start()
+    print(f"[INFO] serving {server.url} (Ctrl+C to stop)")
+    start = time.monotonic()
+    nextKill = start + args.kill_every
+    nextStall = start + args.stall_every
+    try:
+        while True:
+            time.sleep(0.1)
+            now = time.monotonic()
+            if args.kill_every and now >= nextKill:
+                nextKill = now + args.kill_every
+                print(f"[INFO] dropped {server.killConnections()} connections")
+            if args.stall_every and now >= nextStall:
+                nextStall = now + args.stall_every + args.stall_for
+                server.stall(args.stall_for)
+                print(f"[INFO] stalling for {args.stall_for:.0f} s")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Runs many phone camera streams, each through one processing stage, spread
+over a pool of worker processes.
+
+The config is a JSON file listing the streams and the stage for each (see
+streams.example.json and StreamStages.py for the stage names and options):
+
+    {"workers": null,
+     "streams": [{"name": "door", "url": "http://192.168.31.118:8080/video",
+                  "stage": "faces", "options": {"interval": 5}}]}
+
+Streams are dealt round-robin to min(workers, streams) processes; workers
+defaults to the CPU count. Each stream has its own FrameReader thread, so
+a worker always processes the newest frame of each stream and never falls
+behind. Every --interval seconds each worker reports per-stream FPS,
+capture-to-output latency, dropped frames and stall/reconnect counts,
+which are printed here and optionally appended to a CSV. A camera that
+drops off Wi-Fi is reconnected by its FrameReader with backoff while the
+stage keeps its state. --snapshot-dir saves the latest output of
+every stream as <name>.jpg at the same interval.
+
+    python MultiStreamServer.py streams.json --interval 5 --metrics-csv streams.csv
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import queue
+import time
+
+import cv2
+from CaptureModule import FrameReader
+from StreamStages import makeStage
+from cvkit.pipeline import LatencyHistogram
+
+
+class StreamWorker:
+    """One stream inside a worker process: reader, stage and metrics."""
+
+    def __init__(self, config):
+        self.name = config["name"]
+        self.url = config["url"]
+        self.stage = makeStage(config["stage"], **config.get("options", {}))
+        self.reader = FrameReader(self.url).start()
+        self.output = None
+        self._resetMetrics()
+
+    def _resetMetrics(self):
+        self.frames = 0
+        self.latency = LatencyHistogram(self.name)
+        self.since = time.monotonic()
+
+    def poll(self):
+        """Processes the newest frame if there is one; returns True if it did."""
+        ret, frame, timestamp, _ = self.reader.readWithInfo(timeout=0)
+        if not ret:
+            return False
+        self.output = self.stage(frame)
+        self.latency.record(self.reader.latency(timestamp))
+        self.frames += 1
+        return True
+
+    def report(self):
+        elapsed = max(time.monotonic() - self.since, 1e-9)
+        metrics = {
+            "stream": self.name,
+            "fps": round(self.frames / elapsed, 2),
+            "latency_mean_ms": round(self.latency.mean, 1),
+            "latency_p90_ms": round(self.latency.percentile(90), 1),
+            "dropped": self.reader.dropped,
+            "stalls": self.reader.stalls,
+            "reconnects": self.reader.reconnects,
+            "up": self.reader.connected,
+        }
+        self._resetMetrics()
+        return metrics
+
+
+def runWorker(configs, metrics, stop, interval, snapshotDir):
+    # Leave the cores to the other workers; OpenCV would otherwise start a
+    # thread pool per process
+    cv2.setNumThreads(1)
+    streams = [StreamWorker(c) for c in configs]
+    lastReport = time.monotonic()
+    try:
+        while not stop.is_set():
+            busy = False
+            for stream in streams:
+                busy |= stream.poll()
+            if not busy:
+                # Nothing new on any stream; wait a little instead of spinning
+                time.sleep(0.002)
+
+            if time.monotonic() - lastReport >= interval:
+                lastReport = time.monotonic()
+                for stream in streams:
+                    if snapshotDir and stream.output is not None:
+                        cv2.imwrite(os.path.join(snapshotDir, f"{stream.name}.jpg"), stream.output)
+                    metrics.put(stream.report())
+    except KeyboardInterrupt:
+        # Ctrl+C reaches the whole process group; the parent handles shutdown
+        pass
+    finally:
+        for stream in streams:
+            stream.reader.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("config", help="JSON file listing the streams")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: config, then CPU count)")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between metrics reports")
+    parser.add_argument("--metrics-csv", default=None, help="Append per-stream metrics to this CSV")
+    parser.add_argument("--snapshot-dir", default=None, help="Save each stream's latest output here")
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        config = json.load(f)
+    streams = config["streams"]
+    workers = min(args.workers or config.get("workers") or os.cpu_count() or 1, len(streams))
+    if args.snapshot_dir:
+        os.makedirs(args.snapshot_dir, exist_ok=True)
+
+    ctx = multiprocessing.get_context("spawn")
+    metrics = ctx.Queue()
+    stop = ctx.Event()
+    procs = []
+    for w in range(workers):
+        p = ctx.Process(target=runWorker, args=(streams[w::workers], metrics, stop, args.interval, args.snapshot_dir),
+                        name=f"streams-{w}", daemon=True)
+        p.start()
+        procs.append(p)
+    print(f"[INFO] {len(streams)} streams on {workers} worker processes (Ctrl+C to stop)")
+
+    writer = None
+    if args.metrics_csv:
+        exists = os.path.exists(args.metrics_csv)
+        csvFile = open(args.metrics_csv, "a", newline="")
+        writer = csv.writer(csvFile)
+        if not exists:
+            writer.writerow(["timestamp", "stream", "fps", "latency_mean_ms", "latency_p90_ms", "dropped",
+                             "stalls", "reconnects", "up"])
+
+    try:
+        while any(p.is_alive() for p in procs):
+            try:
+                m = metrics.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            print(f"{m['stream']:<16} {m['fps']:6.1f} FPS  latency {m['latency_mean_ms']:6.1f} ms "
+                  f"(p90 {m['latency_p90_ms']:6.1f})  dropped {m['dropped']:<6} stalls {m['stalls']:<4} "
+                  f"reconnects {m['reconnects']:<4} {'up' if m['up'] else 'DOWN'}")
+            if writer:
+                writer.writerow([f"{time.time():.3f}", m["stream"], m["fps"], m["latency_mean_ms"],
+                                 m["latency_p90_ms"], m["dropped"], m["stalls"], m["reconnects"], int(m["up"])])
+                csvFile.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        for p in procs:
+            p.join(timeout=5.0)
+        if writer:
+            csvFile.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Processing stages of the numbered phone programs, as a registry for
+MultiStreamServer.py.
+
+Each entry maps a stage name to a factory. Calling the factory with the
+stage options from the config returns a callable frame -> output frame.
+Stages that keep state (motion background, face IDs, MediaPipe graph) are
+built once per stream, inside the worker process that runs it.
+"""
+
+import cv2
+from cvkit import handDetector
+from cvkit.color import ColorEngine, drawBlobs
+from cvkit.faces import FaceEngine, drawFaces
+from cvkit.motion import MotionEngine
+from cvkit.qr import QrScanner, drawCodes
+from cvkit.sketch import SketchFilter
+
+
+def grayStage():
+    # 02_grayscale_feed.py
+    return lambda frame: cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+def edgesStage(low=100, high=200):
+    # 04_edge_detection.py
+    return lambda frame: cv2.Canny(frame, low, high)
+
+
+def blurStage(ksize=15):
+    # 05_blur_effect.py
+    return lambda frame: cv2.GaussianBlur(frame, (ksize, ksize), 0)
+
+
+def facesStage(scale=0.5, interval=5, minNeighbors=4):
+    # 03_face_detection.py
+    engine = FaceEngine(scale=scale, interval=interval, minNeighbors=minNeighbors)
+    return lambda frame: drawFaces(frame, engine.process(frame))
+
+
+def handsStage(maxHands=2):
+    # 06_hand_detection.py
+    detector = handDetector(maxHands=maxHands)
+    return lambda frame: detector.findHands(frame)
+
+
+def qrStage(scale=0.5, fullInterval=30):
+    # 07_qr_code_scanner.py
+    scanner = QrScanner(scale=scale, fullInterval=fullInterval)
+    return lambda frame: drawCodes(frame, scanner.scan(frame))
+
+
+def colorStage(colors=None, level=1, minArea=1000):
+    # 08_color_detection.py; colors is a list of names from cvkit.color.COLORS (default all)
+    engine = ColorEngine(colors, level=level, minArea=minArea)
+
+    def process(frame):
+        engine.apply(frame)
+        return drawBlobs(cv2.bitwise_and(frame, frame, mask=engine.foreground()), engine)
+    return process
+
+
+def motionStage(model="running_avg", level=1, threshold=20, dilate=3, minArea=1000):
+    # 09_motion_detection.py
+    engine = MotionEngine(model, level=level, threshold=threshold, dilate=dilate, minArea=minArea)
+
+    def process(frame):
+        for (x, y, w, h) in engine.apply(frame):
+            cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        return frame
+    return process
+
+
+def sketchStage(ksize=21, level=1):
+    # 10_sketch_effect.py
+    return SketchFilter(ksize, level=level).apply
+
+
+STAGES = {
+    "gray": grayStage,
+    "edges": edgesStage,
+    "blur": blurStage,
+    "faces": facesStage,
+    "hands": handsStage,
+    "qr": qrStage,
+    "color": colorStage,
+    "motion": motionStage,
+    "sketch": sketchStage,
+}
+
+
+def makeStage(name, **options):
+    if name not in STAGES:
+        raise ValueError(f"Unknown stage {name!r}, expected one of {sorted(STAGES)}")
+    return STAGES[name](**options)
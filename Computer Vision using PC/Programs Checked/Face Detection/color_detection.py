@@ -1,5 +1,6 @@
 
 import cv2
+from cvkit.faces import FaceEngine, drawFaces
 
 # Initialize the USB webcam (0 is typically the default camera)
 cap = cv2.VideoCapture(0)
@@ -9,11 +10,10 @@ if not cap.isOpened():
     print("Error: Could not open webcam")
     exit()
 
-# Load the pre-trained Haar Cascade classifier for face detection
-face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-
-# Check if the cascade classifier loaded successfully
-if face_cascade.empty():
+# Haar face detection on a half-size frame, re-run every 5 frames with tracking in between
+try:
+    engine = FaceEngine(scale=0.5, interval=5, minSize=(30, 30))
+except IOError:
     print("Error: Could not load Haar Cascade classifier")
     exit()
 
@@ -25,21 +25,11 @@ try:
             print("Error: Could not read frame")
             break
 
-        # Convert frame to grayscale (Haar Cascade works better with grayscale)
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-        # Detect faces in the frame
-        faces = face_cascade.detectMultiScale(
-            gray,
-            scaleFactor=1.1,
-            minNeighbors=5,
-            minSize=(30, 30)
-        )
+        # Detect or track faces
+        faces = engine.process(frame)
 
         # Draw rectangles around detected faces
-        for (x, y, w, h) in faces:
-            cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
-            cv2.putText(frame, 'Face', (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
+        drawFaces(frame, faces)
 
         # Display the frame with detected faces
         cv2.imshow("Face Detection", frame)
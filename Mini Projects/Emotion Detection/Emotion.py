@@ -1,10 +1,21 @@
-
+import argparse
 import cv2
-from fer import FER
-import numpy as np
+from cvkit.emotion import EmotionEngine, loadFer
+
+parser = argparse.ArgumentParser(description="Live emotion detection with FER")
+parser.add_argument("--interval", type=int, default=10,
+                    help="Run face detection every N frames and track faces in between")
+parser.add_argument("--alpha", type=float, default=0.4, help="Smoothing weight of new emotion scores")
+parser.add_argument("--no-cache", action="store_true", help="Disable the perceptual-hash emotion cache")
+parser.add_argument("--cache-ttl", type=float, default=30.0, help="Seconds a cached emotion vector stays valid")
+parser.add_argument("--every-frame", action="store_true",
+                    help="Old behaviour: full FER detection and classification on every frame")
+args = parser.parse_args()
 
 # Initialize the FER detector (using MTCNN for face detection)
-detector = FER(mtcnn=True)
+detector = loadFer(mtcnn=True)
+engine = None if args.every_frame else EmotionEngine(detector, interval=args.interval, alpha=args.alpha,
+                                                     cache=not args.no_cache, cacheTtl=args.cache_ttl)
 
 # Start the webcam feed
 cap = cv2.VideoCapture(0)
@@ -20,8 +31,8 @@ while True:
         print("Error: Could not read frame.")
         break
 
-    # Detect emotions in the frame
-    result = detector.detect_emotions(frame)
+    # Detect emotions; the engine only re-classifies new or changed faces
+    result = detector.detect_emotions(frame) if engine is None else engine.process(frame)
 
     # Process detected faces and emotions
     for face in result:
@@ -47,6 +58,9 @@ while True:
     if cv2.waitKey(1) & 0xFF == ord('q'):
         break
 
+if engine is not None:
+    print(f"[INFO] {engine.summary()}")
+
 # Release the capture and close windows
 cap.release()
 cv2.destroyAllWindows()
@@ -0,0 +1,79 @@
+"""
+Headless emotion analytics over recorded video.
+
+The video is split into chunks on keyframes (found with ffprobe; a uniform
+split is used without it) and the chunks are processed in parallel by a
+process pool. Each worker loads its own FER model once. The result is a
+per-second timeline: frames analysed, mean faces per frame, the mean score
+of every emotion over all faces in that second, and the dominant emotion.
+
+    python batch.py session.mp4 --out timeline.csv
+    python batch.py session.mp4 --out timeline.parquet --workers 8 --stride 3
+"""
+
+import argparse
+import concurrent.futures
+import os
+import time
+
+import numpy as np
+
+from cvkit.emotion import analyzeChunk, initWorker
+from cvkit.offline import RecordWriter, frameCount, videoChunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video")
+    parser.add_argument("--out", required=True, help="Output .csv, .jsonl or .parquet file")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunks-per-worker", type=int, default=4,
+                        help="More chunks balance load better; fewer mean less per-chunk warm-up")
+    parser.add_argument("--stride", type=int, default=1, help="Analyse every Nth frame")
+    parser.add_argument("--interval", type=int, default=10, help="Frames between face detections")
+    parser.add_argument("--no-mtcnn", action="store_true", help="Use FER's Haar face detector instead of MTCNN")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    total, fps = frameCount(args.video)
+    chunks = videoChunks(args.video, workers * args.chunks_per_worker, minFrames=max(30, args.stride))
+    print(f"[INFO] {total} frames at {fps:.1f} FPS in {len(chunks)} chunks across {workers} workers")
+
+    timeline = {}
+    labels = None
+    done = 0
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=initWorker,
+                                                initargs=(not args.no_mtcnn,)) as pool:
+        futures = [pool.submit(analyzeChunk, args.video, s, e, fps, args.stride, args.interval)
+                   for s, e in chunks]
+        for future in concurrent.futures.as_completed(futures):
+            seconds, chunkLabels = future.result()
+            labels = labels or chunkLabels
+            # Chunks can split a second; merge the partial sums
+            for second, (frames, faces, sums) in seconds.items():
+                entry = timeline.setdefault(second, [0, 0, None])
+                entry[0] += frames
+                entry[1] += faces
+                if sums is not None:
+                    entry[2] = sums if entry[2] is None else entry[2] + sums
+            done += 1
+            print(f"\r[INFO] {done}/{len(chunks)} chunks, {time.perf_counter() - start:.1f} s", end="")
+    print()
+
+    with RecordWriter(args.out) as writer:
+        for second in sorted(timeline):
+            frames, faces, sums = timeline[second]
+            record = {"second": second, "frames": frames, "faces": round(faces / frames, 3)}
+            means = sums / faces if sums is not None else np.zeros(len(labels or ()))
+            for label, value in zip(labels or (), means):
+                record[label] = round(float(value), 4)
+            record["dominant"] = labels[int(np.argmax(means))] if sums is not None else ""
+            writer.write(record)
+
+    elapsed = time.perf_counter() - start
+    print(f"[INFO] {total} frames in {elapsed:.1f} s ({total / elapsed:.1f} FPS); timeline written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,70 @@
+import argparse
+import time
+
 import cv2
-from ultralytics import YOLO
+from cvkit.detection import BACKENDS, drawDetections, makeDetector
+from cvkit.pipeline import Pipeline
+from cvkit.scheduler import DetectionScheduler
 
-model = YOLO("yolov8m.pt")
+parser = argparse.ArgumentParser(description="YOLOv8 webcam object detection")
+parser.add_argument("--weights", default="yolov8m.pt")
+parser.add_argument("--backend", choices=BACKENDS, default="ultralytics",
+                    help="onnxruntime/opencv export the weights to ONNX once and cache it")
+parser.add_argument("--threads", type=int, default=None, help="Inference threads (ONNX backends)")
+parser.add_argument("--source", default="0", help="Camera index or video file")
+parser.add_argument("--interval", type=int, default=1,
+                    help="Run the detector every N frames and track boxes in between")
+parser.add_argument("--async-detect", action="store_true",
+                    help="Run the detector on a worker thread whenever it is free")
+parser.add_argument("--pipeline", action="store_true",
+                    help="Run capture, inference and rendering on separate threads")
+parser.add_argument("--backpressure", choices=["drop_oldest", "block"], default="drop_oldest",
+                    help="What a full pipeline queue does (use block for video files)")
+args = parser.parse_args()
 
-# Open the default webcam
-cap = cv2.VideoCapture(0)
+detector = makeDetector(args.backend, args.weights, threads=args.threads)
+scheduler = DetectionScheduler(detector, interval=args.interval, asyncDetect=args.async_detect)
+source = int(args.source) if args.source.isdigit() else args.source
+pTime = time.time()
 
-while cap.isOpened():
-    ret, frame = cap.read()
-    if not ret:
-        break
 
-    # Detect objects
-    results = model(frame, stream=True)
+def render(frame, dets):
+    global pTime
 
     # Draw results
-    for r in results:
-        for box in r.boxes:
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
-            label = f"{model.names[int(box.cls[0])]} {box.conf[0]:.2f}"
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-            cv2.putText(frame, label, (x1, y1 - 10),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+    drawDetections(frame, dets, detector.names)
+
+    cTime = time.time()
+    fps = 1 / (cTime - pTime + 1e-6)
+    pTime = cTime
+    cv2.putText(frame, f"FPS: {fps:.1f}  Detect FPS: {scheduler.inferenceFps:.1f}", (10, 25),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 0), 2)
 
     # Display the frame
     cv2.imshow("YOLOv8 - Object Detection", frame)
+    return cv2.waitKey(1) & 0xFF != ord('q')
+
+
+if args.pipeline:
+    pipeline = Pipeline(source, scheduler.process,
+                        lambda packet: render(packet.frame, packet.result),
+                        policy=args.backpressure)
+    pipeline.run()
+    print(pipeline.report())
+else:
+    # Open the default webcam
+    cap = cv2.VideoCapture(source)
+
+    while cap.isOpened():
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        # Detect objects (or carry the last detections forward)
+        dets = scheduler.process(frame)
+        if not render(frame, dets):
+            break
 
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
+    cap.release()
 
-cap.release()
 cv2.destroyAllWindows()
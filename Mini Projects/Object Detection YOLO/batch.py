@@ -0,0 +1,69 @@
+"""
+Headless YOLOv8 detection over archived footage.
+
+Reads a video file or a directory of images, decodes frames in a process
+pool, runs the model on batches of frames and writes one record per
+detection to JSONL or Parquet. No windows are opened.
+
+    python batch.py footage.mp4 --out detections.jsonl --batch-size 8
+    python batch.py frames/ --out detections.parquet --workers 4
+"""
+
+import argparse
+import time
+
+from cvkit.detection import BACKENDS, makeDetector
+from cvkit.offline import RecordWriter, batched, iterFrames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Video file or directory of images")
+    parser.add_argument("--out", required=True, help="Output .jsonl or .parquet file")
+    parser.add_argument("--weights", default="yolov8m.pt")
+    parser.add_argument("--backend", choices=BACKENDS, default="ultralytics")
+    parser.add_argument("--threads", type=int, default=None, help="Inference threads (ONNX backends)")
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=None, help="Decode processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Frames decoded per worker job")
+    parser.add_argument("--max-buffer-mb", type=int, default=1024, help="Decoded frames held in flight, in MiB")
+    args = parser.parse_args()
+
+    detector = makeDetector(args.backend, args.weights, conf=args.conf, threads=args.threads)
+    names = detector.names
+
+    frames = 0
+    inferTime = 0.0
+    start = time.perf_counter()
+
+    with RecordWriter(args.out) as writer:
+        frameIter = iterFrames(args.source, args.workers, args.chunk_size, args.max_buffer_mb << 20)
+        for batch in batched(frameIter, args.batch_size):
+            t = time.perf_counter()
+            results = detector.batch(frame for _, _, frame in batch)
+            inferTime += time.perf_counter() - t
+
+            for (index, name, _), dets in zip(batch, results):
+                for box, score, classId in zip(dets.boxes.tolist(), dets.scores.tolist(), dets.classIds.tolist()):
+                    writer.write({
+                        "frame": index,
+                        "source": name,
+                        "class_id": classId,
+                        "label": names.get(classId, str(classId)),
+                        "score": round(score, 4),
+                        "x1": round(box[0], 1), "y1": round(box[1], 1),
+                        "x2": round(box[2], 1), "y2": round(box[3], 1),
+                    })
+            frames += len(batch)
+            print(f"\r[INFO] {frames} frames, {frames / (time.perf_counter() - start):.1f} FPS", end="")
+
+    elapsed = time.perf_counter() - start
+    print()
+    print(f"[INFO] {frames} frames in {elapsed:.1f} s: {frames / elapsed:.1f} FPS overall, "
+          f"{frames / inferTime if inferTime else 0:.1f} FPS inference only")
+    print(f"[INFO] detections written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
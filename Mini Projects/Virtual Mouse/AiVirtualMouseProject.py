@@ -1,6 +1,6 @@
 import cv2
 import numpy as np
-import HandTrackingModule as htm
+from cvkit import hand_tracking as htm
 import time
 import autopy
 
@@ -14,6 +14,9 @@ pTime = 0
 plocX, plocY = 0, 0
 clocX, clocY = 0, 0
 
+# MediaPipe loads in the background while the camera opens
+detector = htm.handDetector(maxHands=1, preload=True, roiTracking=True)
+
 # Try default camera index 0
 cap = cv2.VideoCapture(0)
 if not cap.isOpened():
@@ -27,7 +30,6 @@ if not cap.isOpened():
 cap.set(3, wCam)
 cap.set(4, hCam)
 
-detector = htm.handDetector(maxHands=1)
 wScr, hScr = autopy.screen.size()
 # print(wScr, hScr)
 
@@ -39,15 +41,16 @@ while True:
         continue
 
     img = detector.findHands(img)
-    lmList, bbox = detector.findPosition(img)
+    hands = detector.findPositions(img, draw=True)
 
     # 2. Get the tip of the index and middle fingers
-    if len(lmList) != 0:
-        x1, y1 = lmList[8][1:]
-        x2, y2 = lmList[12][1:]
+    if len(hands) != 0:
+        bbox = htm.bboxArray(hands)[0]
+        cv2.rectangle(img, (bbox[0] - 20, bbox[1] - 20), (bbox[2] + 20, bbox[3] + 20), (0, 255, 0), 2)
+        (x1, y1), (x2, y2) = hands[0, [8, 12], :2].astype(int)
 
         # 3. Check which fingers are up
-        fingers = detector.fingersUp()
+        fingers = htm.fingersUpArray(hands)[0]
 
         # 4. Draw a rectangle for movement area
         cv2.rectangle(img, (frameR, frameR), (wCam - frameR, hCam - frameR), (255, 0, 255), 2)
@@ -70,11 +73,16 @@ while True:
         # 9. Both Index and Middle Fingers are up: Clicking Mode
         if fingers[1] == 1 and fingers[2] == 1:
             # 10. Find distance between fingers
-            length, img, lineInfo = detector.findDistance(8, 12, img)
+            length = htm.distanceArray(hands, 8, 12)[0]
+            cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+            cv2.circle(img, (x1, y1), 15, (255, 0, 255), cv2.FILLED)
+            cv2.circle(img, (x2, y2), 15, (255, 0, 255), cv2.FILLED)
+            cv2.line(img, (x1, y1), (x2, y2), (255, 0, 255), 3)
+            cv2.circle(img, (cx, cy), 15, (255, 0, 255), cv2.FILLED)
 
             # 11. Click mouse if distance short
             if length < 40:
-                cv2.circle(img, (lineInfo[4], lineInfo[5]), 15, (0, 255, 0), cv2.FILLED)
+                cv2.circle(img, (cx, cy), 15, (0, 255, 0), cv2.FILLED)
                 autopy.mouse.click()
 
     # 12. Frame Rate
@@ -1,7 +1,7 @@
 import cv2
 import time
 import numpy as np
-import HandTrackingModule as htm
+from cvkit import hand_tracking as htm
 import math
 from ctypes import cast, POINTER
 from comtypes import CLSCTX_ALL
@@ -12,6 +12,11 @@ from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
 # -----------------------------------
 FRAME_WIDTH, FRAME_HEIGHT = 640, 480
 
+# -----------------------------------
+# Hand Detector
+# -----------------------------------
+detector = htm.handDetector(detectionCon=0.7, preload=True)  # MediaPipe loads while the camera opens
+
 # -----------------------------------
 # Webcam Initialization
 # -----------------------------------
@@ -19,11 +24,6 @@ cap = cv2.VideoCapture(0)
 cap.set(3, FRAME_WIDTH)
 cap.set(4, FRAME_HEIGHT)
 
-# -----------------------------------
-# Hand Detector
-# -----------------------------------
-detector = htm.handDetector(detectionCon=0.7)
-
 # -----------------------------------
 # Pycaw Volume Setup (Scalar for accurate %)
 # -----------------------------------
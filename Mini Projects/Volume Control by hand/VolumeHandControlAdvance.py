@@ -1,7 +1,7 @@
 import cv2
 import time
 import numpy as np
-import HandTrackingModule as htm
+from cvkit import hand_tracking as htm
 import math
 from ctypes import cast, POINTER
 from comtypes import CLSCTX_ALL
@@ -11,14 +11,14 @@ from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
 wCam, hCam = 640, 480
 ################################
 
+# Hand detector (MediaPipe loads in the background while the camera opens)
+detector = htm.handDetector(detectionCon=0.7, maxHands=1, preload=True, roiTracking=True)
+
 cap = cv2.VideoCapture(1)  # Change to 0 if default webcam
 cap.set(3, wCam)
 cap.set(4, hCam)
 pTime = 0
 
-# Hand detector
-detector = htm.handDetector(detectionCon=0.7, maxHands=1)
-
 # Audio control
 devices = AudioUtilities.GetSpeakers()
 interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
@@ -38,14 +38,22 @@ while True:
 
     # Find hand
     img = detector.findHands(img)
-    lmList, bbox = detector.findPosition(img, draw=True)
+    hands = detector.findPositions(img, draw=True)
 
-    if len(lmList) != 0:
+    if len(hands) != 0:
         # Filter based on size
+        bbox = htm.bboxArray(hands)[0]
+        cv2.rectangle(img, (bbox[0] - 20, bbox[1] - 20), (bbox[2] + 20, bbox[3] + 20), (0, 255, 0), 2)
         area = (bbox[2] - bbox[0]) * (bbox[3] - bbox[1]) // 100
         if 250 < area < 1000:
             # Distance between thumb and index finger
-            length, img, lineInfo = detector.findDistance(4, 8, img)
+            length = htm.distanceArray(hands, 4, 8)[0]
+            (x1, y1), (x2, y2) = hands[0, [4, 8], :2].astype(int)
+            cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+            cv2.circle(img, (x1, y1), 15, (255, 0, 255), cv2.FILLED)
+            cv2.circle(img, (x2, y2), 15, (255, 0, 255), cv2.FILLED)
+            cv2.line(img, (x1, y1), (x2, y2), (255, 0, 255), 3)
+            cv2.circle(img, (cx, cy), 15, (255, 0, 255), cv2.FILLED)
 
             # Convert length to volume
             volBar = np.interp(length, [50, 200], [400, 150])
@@ -56,12 +64,12 @@ while True:
             volPer = smoothness * round(volPer / smoothness)
 
             # Check which fingers are up
-            fingers = detector.fingersUp()
+            fingers = htm.fingersUpArray(hands)[0]
 
             # Set volume if pinky is down
-            if fingers and not fingers[4]:
+            if not fingers[4]:
                 volume.SetMasterVolumeLevelScalar(volPer / 100, None)
-                cv2.circle(img, (lineInfo[4], lineInfo[5]), 15, (0, 255, 0), cv2.FILLED)
+                cv2.circle(img, (cx, cy), 15, (0, 255, 0), cv2.FILLED)
                 colorVol = (0, 255, 0)
             else:
                 colorVol = (255, 0, 0)
@@ -1,10 +1,37 @@
+import argparse
 from imutils.video import VideoStream
 from PIL import Image
 import imutils
 import time
 import cv2
-from imutils.video import FPS
 import RPi.GPIO as GPIO
+from cvkit.instrumentation import MetricsExporter, StageTimer
+from cvkit.detection import drawDetections
+from cvkit.gating import MotionGate, detectRegions, mergeRegions
+from cvkit.ssd import COCO_NAMES, PERSON, SsdDetector, containsClass, postprocess
+
+MODEL_DIR = '/home/pi/Desktop/Object Detection/models1'
+
+parser = argparse.ArgumentParser(description="SSD object detection with person LED")
+parser.add_argument("--model", choices=["fp32", "int8"], default="fp32",
+                    help="int8 runs the QuantizeSSD.py output through onnxruntime")
+parser.add_argument("--onnx", default=f"{MODEL_DIR}/ssd_int8.onnx")
+parser.add_argument("--threads", type=int, default=None)
+parser.add_argument("--conf", type=float, default=0.6)
+parser.add_argument("--nms", type=float, default=None, help="IoU threshold for optional NMS")
+parser.add_argument("--person-only", action="store_true",
+                    help="Only look for people; skip box work on frames without one")
+parser.add_argument("--motion-gate", action="store_true",
+                    help="Only run SSD on frames with motion (plus a periodic keep-alive)")
+parser.add_argument("--keep-alive", type=float, default=10.0,
+                    help="With --motion-gate, re-run SSD at least every N seconds on a static scene")
+parser.add_argument("--roi", action="store_true",
+                    help="Run SSD on padded crops around motion at camera resolution (implies --motion-gate)")
+parser.add_argument("--max-regions", type=int, default=3, help="With --roi, merge motion into at most N crops")
+parser.add_argument("--metrics-csv", default=None, help="Append per-stage timings to this CSV")
+parser.add_argument("--metrics-prom", default=None, help="Write Prometheus text metrics to this file")
+parser.add_argument("--metrics-interval", type=float, default=5.0, help="Seconds between exports")
+args = parser.parse_args()
 
 # Setup LED on GPIO 21
 led = 21
@@ -12,84 +39,115 @@ GPIO.setmode(GPIO.BCM)
 GPIO.setup(led, GPIO.OUT)
 GPIO.output(led, GPIO.LOW)
 
-# COCO classes
-classNames = {
-    0: 'background', 1: 'person', 2: 'bicycle', 3: 'car', 4: 'motorcycle', 5: 'airplane',
-    6: 'bus', 7: 'train', 8: 'truck', 9: 'boat', 10: 'traffic light', 11: 'fire hydrant',
-    13: 'stop sign', 14: 'parking meter', 15: 'bench', 16: 'bird', 17: 'cat', 18: 'dog',
-    19: 'horse', 20: 'sheep', 21: 'cow', 22: 'elephant', 23: 'bear', 24: 'zebra', 25: 'giraffe',
-    27: 'backpack', 28: 'umbrella', 31: 'handbag', 32: 'tie', 33: 'suitcase', 34: 'frisbee',
-    35: 'skis', 36: 'snowboard', 37: 'sports ball', 38: 'kite', 39: 'baseball bat',
-    40: 'baseball glove', 41: 'skateboard', 42: 'surfboard', 43: 'tennis racket', 44: 'bottle',
-    46: 'wine glass', 47: 'cup', 48: 'fork', 49: 'knife', 50: 'spoon', 51: 'bowl', 52: 'banana',
-    53: 'apple', 54: 'sandwich', 55: 'orange', 56: 'broccoli', 57: 'carrot', 58: 'hot dog',
-    59: 'pizza', 60: 'donut', 61: 'cake', 62: 'chair', 63: 'couch', 64: 'potted plant',
-    65: 'bed', 67: 'dining table', 70: 'toilet', 72: 'tv', 73: 'laptop', 74: 'mouse',
-    75: 'remote', 76: 'keyboard', 77: 'cell phone', 78: 'microwave', 79: 'oven', 80: 'toaster',
-    81: 'sink', 82: 'refrigerator', 84: 'book', 85: 'clock', 86: 'vase', 87: 'scissors',
-    88: 'teddy bear', 89: 'hair drier', 90: 'toothbrush'
-}
-
-def id_class_name(class_id, classes):
-    return classes.get(int(class_id), "Unknown")
-
-# Load TensorFlow model
-model = cv2.dnn.readNetFromTensorflow(
-    '/home/pi/Desktop/Object Detection/models1/frozen_inference_graph.pb',
-    '/home/pi/Desktop/Object Detection/models1/dnngraph.pbtxt'
+# Load TensorFlow model (FP32) or its quantized ONNX export (INT8)
+model = SsdDetector(
+    args.model,
+    pb=f'{MODEL_DIR}/frozen_inference_graph.pb',
+    pbtxt=f'{MODEL_DIR}/dnngraph.pbtxt',
+    onnxPath=args.onnx,
+    threads=args.threads
 )
 
 print("[INFO] starting video stream...")
 vs = VideoStream(src=0).start()
 time.sleep(2.0)
 
-while True:
-    fps = FPS().start()
-    frame = vs.read()
-    frame = imutils.resize(frame, width=600)
-    orig = frame.copy()
-    image_height, image_width, _ = frame.shape
-
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    model.setInput(cv2.dnn.blobFromImage(rgb, size=(300, 300), swapRB=True))
-    output = model.forward()
+timer = StageTimer()
+exporter = MetricsExporter(timer, args.metrics_csv, args.metrics_prom, args.metrics_interval, prefix="ssd")
+gate = MotionGate(keepAlive=args.keep_alive) if args.motion_gate or args.roi else None
+classes = (PERSON,) if args.person_only else None
+crop_times = dict.fromkeys(("blob", "forward", "postprocess"), 0.0)
 
-    person_detected = False
 
-    for detection in output[0, 0, :, :]:
-        confidence = detection[2]
-        if confidence > 0.6:
-            class_id = int(detection[1])
-            class_name = id_class_name(class_id, classNames)
+def detectCrop(crop):
+    # Stages are summed over the crops and recorded once per frame, like the full pass
+    h, w = crop.shape[:2]
+    t0 = time.perf_counter()
+    blob = model.blob(crop)
+    t1 = time.perf_counter()
+    output = model.run(blob)
+    t2 = time.perf_counter()
+    dets = postprocess(output, w, h, args.conf, classes, args.nms)
+    t3 = time.perf_counter()
+    for name, seconds in zip(crop_times, (t1 - t0, t2 - t1, t3 - t2)):
+        crop_times[name] += seconds
+    return dets
 
-            box_x = int(detection[3] * image_width)
-            box_y = int(detection[4] * image_height)
-            box_width = int(detection[5] * image_width)
-            box_height = int(detection[6] * image_height)
 
-            cv2.rectangle(orig, (box_x, box_y), (box_width, box_height), (0, 255, 0), 2)
-            cv2.putText(orig, f"{class_name}: {confidence:.2f}",
-                        (box_x, box_y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
-                        (0, 0, 255), 2)
+dets, person_detected = None, False
 
-            if class_id == 1:
-                person_detected = True
+while True:
+    with timer.stage("read"):
+        raw = vs.read()
+    with timer.stage("resize"):
+        frame = imutils.resize(raw, width=600)
+        orig = frame.copy()
+        image_height, image_width, _ = frame.shape
+
+    # On a static scene the previous detections (and LED state) are kept
+    if gate is None:
+        run = True
+    else:
+        with timer.stage("gate"):
+            run = gate.check(raw if args.roi else frame)
+
+    # Crops around motion instead of the whole frame squeezed to 300x300;
+    # keep-alive runs and crops covering most of the frame fall back to a full pass
+    regions = None
+    if run and args.roi and len(gate.boxes):
+        with timer.stage("regions"):
+            regions = mergeRegions(gate.boxes, raw.shape, maxRegions=args.max_regions)
+
+    if regions is not None:
+        crop_times = dict.fromkeys(crop_times, 0.0)
+        dets = detectRegions(raw, regions, detectCrop, scale=image_width / raw.shape[1])
+        for name, seconds in crop_times.items():
+            timer.add(name, seconds)
+        person_detected = bool((dets.classIds == PERSON).any())
+        for x1, y1, x2, y2 in (regions * image_width / raw.shape[1]).astype(int):
+            cv2.rectangle(orig, (x1, y1), (x2, y2), (255, 0, 0), 1)
+    elif run:
+        with timer.stage("blob"):
+            blob = model.blob(frame)
+        with timer.stage("forward"):
+            output = model.run(blob)
+
+        with timer.stage("postprocess"):
+            if args.person_only:
+                # Cheap mask test first; boxes are only built when a person is there
+                person_detected = containsClass(output, PERSON, args.conf)
+                dets = postprocess(output, image_width, image_height, args.conf, (PERSON,), args.nms) \
+                    if person_detected else None
+            else:
+                dets = postprocess(output, image_width, image_height, args.conf, nms=args.nms)
+                person_detected = bool((dets.classIds == PERSON).any())
+
+    if dets is not None:
+        drawDetections(orig, dets, COCO_NAMES, textColor=(0, 0, 255), sep=": ")
 
     # LED control
-    GPIO.output(led, GPIO.HIGH if person_detected else GPIO.LOW)
+    with timer.stage("gpio"):
+        GPIO.output(led, GPIO.HIGH if person_detected else GPIO.LOW)
 
-    fps.update()
-    fps.stop()
+    timer.tick()
+    exporter.maybeExport()
 
-    # Display FPS
-    cv2.putText(orig, f"FPS: {fps.fps():.2f}", (10, 20),
+    # Display smoothed FPS and per-stage timings
+    cv2.putText(orig, f"FPS: {timer.fps:.2f}", (10, 20),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    for i, (name, (mean, _)) in enumerate(timer.stats().items()):
+        cv2.putText(orig, f"{name}: {mean:.1f} ms", (10, 40 + 16 * i),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
 
     cv2.imshow("Object Detection", orig)
     if cv2.waitKey(1) & 0xFF == ord("q"):
         break
 
 # Cleanup
+exporter.export()
+print(f"[INFO] {timer.summary()}")
+if gate is not None:
+    print(f"[INFO] motion gate: {gate.summary()}")
 cv2.destroyAllWindows()
 vs.stop()
 GPIO.output(led, GPIO.LOW)
@@ -1,28 +1,57 @@
+import argparse
 import cv2
+from cvkit.faces import FaceEngine, drawFaces
+from cvkit.gating import MotionGate
+from cvkit.instrumentation import StatsExporter
+from cvkit.tracking import TrackCounter
 
-# Load Haar Cascade for face detection
-face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+parser = argparse.ArgumentParser(description="Haar face detection and counting")
+parser.add_argument("--scale", type=float, default=0.5, help="Run the cascade on the frame resized by this factor")
+parser.add_argument("--interval", type=int, default=5, help="Re-detect every N frames; track in between")
+parser.add_argument("--motion-gate", action="store_true",
+                    help="Only run the cascade on frames with motion (plus a periodic keep-alive)")
+parser.add_argument("--keep-alive", type=float, default=5.0, help="Seconds between forced runs on a static scene")
+parser.add_argument("--line", type=int, nargs=4, metavar=("X1", "Y1", "X2", "Y2"), default=None,
+                    help="Counting line; crossings downward (for a left-to-right line) count as 'in'")
+parser.add_argument("--stats-csv", default=None, help="Append unique/in/out/dwell counts to this CSV")
+parser.add_argument("--stats-prom", default=None, help="Write the counts as Prometheus gauges to this file")
+parser.add_argument("--stats-interval", type=float, default=60.0, help="Seconds between stats exports")
+args = parser.parse_args()
+
+# Downscaled Haar cascade with template tracking between detections
+engine = FaceEngine(scale=args.scale, interval=args.interval)
 
 # Open webcam
 cap = cv2.VideoCapture(0)
+gate = MotionGate(keepAlive=args.keep_alive) if args.motion_gate else None
+faces = None
+
+# Unique faces, line crossings and dwell time, exported periodically
+line = ((args.line[0], args.line[1]), (args.line[2], args.line[3])) if args.line else None
+counter = TrackCounter(line=line)
+exporter = StatsExporter(counter.stats, args.stats_csv, args.stats_prom, args.stats_interval, prefix="faces")
 
 while True:
     ret, frame = cap.read()
     if not ret:
         break
 
-    # Convert to grayscale (required for Haar)
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    # Detect faces; on a static scene the previous faces are kept
+    if faces is None or gate is None or gate.check(frame):
+        faces = engine.process(frame)
+        xyxy = faces.boxes.copy()
+        xyxy[:, 2:] += xyxy[:, :2]
+        counter.update(faces.ids, xyxy, engine.removed)
+    exporter.maybeExport()
 
-    # Detect faces
-    faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5)
+    # Draw bounding boxes with face IDs
+    drawFaces(frame, faces)
 
-    # Draw bounding boxes
-    for (x, y, w, h) in faces:
-        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+    if line:
+        cv2.line(frame, line[0], line[1], (255, 0, 0), 2)
 
     # Display face count
-    count = len(faces)
+    count = len(faces.ids)
     cv2.putText(frame, f"Faces: {count}", (10, 30),
                 cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
 
@@ -33,5 +62,9 @@ while True:
     if cv2.waitKey(1) & 0xFF == 27:
         break
 
+print(f"[INFO] {counter.summary()}")
+exporter.export()
+if gate is not None:
+    print(f"[INFO] motion gate: {gate.summary()}")
 cap.release()
 cv2.destroyAllWindows()
@@ -1,6 +1,27 @@
+import argparse
 import cv2
 import numpy as np
-import os
+from cvkit.alerts import SINKS, AlertDispatcher, makeSinks
+from cvkit.gating import mergeRegions
+from cvkit.motion import MODELS, MotionEngine
+
+parser = argparse.ArgumentParser(description="Motion detection with a background model")
+parser.add_argument("--model", choices=MODELS, default="running_avg")
+parser.add_argument("--level", type=int, default=1, help="Pyramid levels to downscale before detection")
+parser.add_argument("--show-rois", action="store_true",
+                    help="Also draw the merged, padded crops a detector would run on")
+parser.add_argument("--alert", choices=SINKS, nargs="*", default=["beep"], help="Where motion alerts go")
+parser.add_argument("--alert-interval", type=float, default=5.0, help="At most one alert per N seconds")
+parser.add_argument("--alert-hold", type=int, default=3, help="Frames of motion before alerting")
+parser.add_argument("--webhook-url", default="http://127.0.0.1:8000/alert")
+parser.add_argument("--alert-log", default="motion_alerts.log")
+args = parser.parse_args()
+
+engine = MotionEngine(args.model, level=args.level)
+
+# Alerts run on a worker thread; a slow sink never stalls the capture loop
+alerts = AlertDispatcher(makeSinks(args.alert, args.webhook_url, args.alert_log),
+                         minInterval=args.alert_interval, holdFrames=args.alert_hold)
 
 cap = cv2.VideoCapture(0)
 
@@ -12,15 +33,6 @@ if not cap.isOpened():
     print("Error: Could not open webcam")
     exit()
 
-ret, frame1 = cap.read()
-if not ret:
-    print("Error: Could not read frame")
-    cap.release()
-    exit()
-
-gray1 = cv2.cvtColor(frame1, cv2.COLOR_BGR2GRAY)
-gray1 = cv2.GaussianBlur(gray1, (21, 21), 0)
-
 try:
     while True:
         ret, frame2 = cap.read()
@@ -28,31 +40,23 @@ try:
             print("Error: Could not read frame")
             break
 
-        gray2 = cv2.cvtColor(frame2, cv2.COLOR_BGR2GRAY)
-        gray2 = cv2.GaussianBlur(gray2, (21, 21), 0)
+        boxes = engine.apply(frame2)
 
-        delta = cv2.absdiff(gray1, gray2)
-        thresh = cv2.threshold(delta, 25, 255, cv2.THRESH_BINARY)[1]
-        thresh = cv2.dilate(thresh, None, iterations=2)
-
-        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-        motion_detected = False
-        for contour in contours:
-            if cv2.contourArea(contour) > 500:
-                (x, y, w, h) = cv2.boundingRect(contour)
-                cv2.rectangle(frame2, (x, y), (x + w, y + h), (0, 255, 0), 2)
-                motion_detected = True
+        motion_detected = len(boxes) > 0
+        for (x, y, w, h) in boxes:
+            cv2.rectangle(frame2, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        if args.show_rois and motion_detected:
+            rois = mergeRegions(boxes, frame2.shape, minSize=96)
+            for (x1, y1, x2, y2) in (rois if rois is not None else ()):
+                cv2.rectangle(frame2, (x1, y1), (x2, y2), (255, 0, 0), 1)
 
         if motion_detected:
             cv2.putText(frame2, "Motion Detected!", (10, 30),
                         cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            os.system('beep -f 1000 -l 100')  # replace with pygame if needed
+        alerts.update(motion_detected, event="motion", regions=len(boxes))
 
         cv2.imshow("Motion Detection", frame2)
-        cv2.imshow("Threshold", thresh)
-
-        gray1 = gray2
+        cv2.imshow("Threshold", engine.mask)
 
         if cv2.waitKey(1) & 0xFF == ord('q'):
             break
@@ -61,5 +65,6 @@ except KeyboardInterrupt:
     print("Program terminated by user")
 
 finally:
+    alerts.close()
     cap.release()
     cv2.destroyAllWindows()
@@ -0,0 +1,98 @@
+"""
+Converts the TensorFlow SSD frozen graph used by BasicObjectDetection.py
+into an INT8 ONNX model for onnxruntime.
+
+  1. tf2onnx turns frozen_inference_graph.pb into an FP32 ONNX model.
+  2. onnxruntime's static quantizer calibrates activations on a folder of
+     representative images and writes INT8 (QDQ) weights and activations.
+     Only Conv/MatMul are quantized; the SSD box decoding and NMS tail stays
+     in float, where quantization would hurt accuracy and save nothing.
+
+Run this on a desktop machine (needs tensorflow, tf2onnx, onnxruntime) and
+copy the result to the Pi, which then only needs onnxruntime:
+
+    python QuantizeSSD.py --pb models1/frozen_inference_graph.pb \\
+        --calib calibration_images/ --out models1/ssd_int8.onnx
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+import cv2
+import numpy as np
+
+INPUT_NAME = "image_tensor:0"
+OUTPUTS = "detection_boxes:0,detection_classes:0,detection_scores:0,num_detections:0"
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def exportFp32(pb, out, opset):
+    print(f"[INFO] converting {pb} -> {out}")
+    subprocess.run([
+        sys.executable, "-m", "tf2onnx.convert",
+        "--graphdef", pb,
+        "--inputs", INPUT_NAME,
+        "--outputs", OUTPUTS,
+        "--opset", str(opset),
+        "--output", out,
+    ], check=True)
+
+
+def calibrationReader(folder, size, limit):
+    from onnxruntime.quantization import CalibrationDataReader
+
+    paths = sorted(os.path.join(folder, f) for f in os.listdir(folder)
+                   if f.lower().endswith(IMAGE_EXTENSIONS))[:limit]
+    if not paths:
+        raise SystemExit(f"No calibration images found in {folder}")
+
+    class Reader(CalibrationDataReader):
+        def __init__(self):
+            self.paths = iter(paths)
+
+        def get_next(self):
+            path = next(self.paths, None)
+            if path is None:
+                return None
+            img = cv2.resize(cv2.imread(path), (size, size))
+            return {INPUT_NAME: cv2.cvtColor(img, cv2.COLOR_BGR2RGB)[None].astype(np.uint8)}
+
+    print(f"[INFO] calibrating on {len(paths)} images")
+    return Reader()
+
+
+def quantize(fp32, out, calib, size, limit):
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+
+    quantize_static(
+        fp32, out, calibrationReader(calib, size, limit),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+        op_types_to_quantize=["Conv", "MatMul"],
+    )
+    print(f"[INFO] wrote {out} ({os.path.getsize(out) / 1e6:.1f} MB, "
+          f"FP32 was {os.path.getsize(fp32) / 1e6:.1f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pb", required=True, help="frozen_inference_graph.pb")
+    parser.add_argument("--calib", required=True, help="Folder of representative images")
+    parser.add_argument("--out", default="ssd_int8.onnx")
+    parser.add_argument("--size", type=int, default=300)
+    parser.add_argument("--calib-limit", type=int, default=200)
+    parser.add_argument("--opset", type=int, default=13)
+    args = parser.parse_args()
+
+    fp32 = os.path.splitext(args.out)[0] + "_fp32.onnx"
+    if not os.path.exists(fp32):
+        exportFp32(args.pb, fp32, args.opset)
+    quantize(fp32, args.out, args.calib, args.size, args.calib_limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,37 @@
+import argparse
 import cv2
-import mediapipe as mp
+from cvkit import handDetector
+from cvkit.gating import MotionGate
 
-mp_hands = mp.solutions.hands
-mp_draw = mp.solutions.drawing_utils
+parser = argparse.ArgumentParser(description="MediaPipe hand landmarks")
+parser.add_argument("--motion-gate", action="store_true",
+                    help="Only run MediaPipe on frames with motion (plus a periodic keep-alive)")
+parser.add_argument("--keep-alive", type=float, default=2.0, help="Seconds between forced runs on a static scene")
+args = parser.parse_args()
 
-cap = cv2.VideoCapture(0)
-
-with mp_hands.Hands(
-    max_num_hands=2,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-) as hands:
+# MediaPipe loads in the background while the camera opens
+detector = handDetector(maxHands=2, detectionCon=0.5, trackCon=0.5, preload=True)
+gate = MotionGate(keepAlive=args.keep_alive) if args.motion_gate else None
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
+cap = cv2.VideoCapture(0)
 
-        frame = cv2.flip(frame, 1)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = hands.process(rgb_frame)
+while cap.isOpened():
+    ret, frame = cap.read()
+    if not ret:
+        break
 
-        if result.multi_hand_landmarks:
-            for hand_landmarks in result.multi_hand_landmarks:
-                mp_draw.draw_landmarks(
-                    frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+    frame = cv2.flip(frame, 1)
+    if gate is None or gate.check(frame):
+        frame = detector.findHands(frame)
+    else:
+        # Hands haven't moved; redraw the last landmarks
+        frame = detector.drawHands(frame)
 
-        cv2.imshow("Hand Landmarks", frame)
-        if cv2.waitKey(1) & 0xFF == 27:
-            break
+    cv2.imshow("Hand Landmarks", frame)
+    if cv2.waitKey(1) & 0xFF == 27:
+        break
 
+if gate is not None:
+    print(f"[INFO] motion gate: {gate.summary()}")
 cap.release()
 cv2.destroyAllWindows()
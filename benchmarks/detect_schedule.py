@@ -0,0 +1,102 @@
+"""
+Accuracy vs throughput of DetectionScheduler on a recorded clip.
+
+The detector runs once on every frame to build a reference. Each detect
+interval is then replayed with the cached reference detections standing in
+for the model, and the measured per-frame inference time is charged
+whenever the scheduler would have called it. Accuracy is measured against
+the per-frame reference:
+
+  recall  - share of reference boxes matched at IoU >= 0.5
+  mIoU    - mean IoU of the matched boxes
+
+    python benchmarks/detect_schedule.py clip.mp4 --weights yolov8m.pt --intervals 1 2 4 8
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from cvkit.detection import UltralyticsDetector, boxIou
+from cvkit.scheduler import DetectionScheduler
+
+
+def readFrames(path, limit):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def score(pred, ref, threshold=0.5):
+    if len(ref.boxes) == 0:
+        return 0, 0, []
+    if len(pred.boxes) == 0:
+        return 0, len(ref.boxes), []
+    iou = boxIou(ref.boxes, pred.boxes)
+    best = iou.max(axis=1)
+    matched = best[best >= threshold]
+    return len(matched), len(ref.boxes), list(matched)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video")
+    parser.add_argument("--weights", default="yolov8m.pt")
+    parser.add_argument("--intervals", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--max-frames", type=int, default=300)
+    args = parser.parse_args()
+
+    frames = readFrames(args.video, args.max_frames)
+    if not frames:
+        raise SystemExit(f"Could not read frames from {args.video}")
+
+    detector = UltralyticsDetector(args.weights)
+    detector(frames[0])   # Warm-up, not timed
+
+    reference, costs = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        reference.append(detector(frame))
+        costs.append(time.perf_counter() - start)
+
+    print(f"{len(frames)} frames, detector {np.mean(costs) * 1000:.1f} ms/frame")
+    print(f"{'interval':>8} {'FPS':>8} {'detect FPS':>11} {'recall':>8} {'mIoU':>6}")
+
+    for interval in args.intervals:
+        index = {"i": 0}
+
+        def cached(frame):
+            return reference[index["i"]]
+
+        scheduler = DetectionScheduler(cached, interval=interval)
+        matched = total = 0
+        ious = []
+        charged = 0.0
+        start = time.perf_counter()
+        for i, frame in enumerate(frames):
+            index["i"] = i
+            before = scheduler.detectCount
+            dets = scheduler.process(frame)
+            if scheduler.detectCount > before:
+                charged += costs[i]
+            m, t, iou = score(dets, reference[i])
+            matched, total, ious = matched + m, total + t, ious + iou
+        elapsed = time.perf_counter() - start - scheduler.detectTime + charged
+
+        fps = len(frames) / elapsed
+        detectFps = scheduler.detectCount / elapsed
+        recall = matched / total if total else 1.0
+        miou = float(np.mean(ious)) if ious else 0.0
+        print(f"{interval:>8} {fps:>8.1f} {detectFps:>11.1f} {recall:>8.3f} {miou:>6.3f}")
+
+
+if __name__ == "__main__":
+    main()
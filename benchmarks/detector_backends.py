@@ -0,0 +1,97 @@
+"""
+Compares YOLOv8 detector backends on CPU.
+
+Each backend runs in a fresh interpreter so import and model-load costs are
+measured honestly:
+
+  cold start   - imports, model load (and cached ONNX export) and warm-up
+  first frame  - latency of the first real frame after warm-up
+  steady FPS   - frames per second over the remaining frames
+
+Frames come from --video if given, otherwise random noise at 640x480.
+Run once beforehand (or pass --prepare) so the ONNX export is cached and
+not charged to the cold start.
+
+    python benchmarks/detector_backends.py --weights yolov8m.pt --threads 4 --video clip.mp4
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+
+def child(args):
+    start = time.perf_counter()
+    import cv2
+    import numpy as np
+    from cvkit.detection import makeDetector
+
+    detector = makeDetector(args.child, args.weights, threads=args.threads, imgsz=args.imgsz)
+    coldStart = time.perf_counter() - start
+
+    frames = []
+    if args.video:
+        cap = cv2.VideoCapture(args.video)
+        while len(frames) < args.frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        cap.release()
+    if not frames:
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 255, (480, 640, 3), np.uint8) for _ in range(args.frames)]
+
+    t = time.perf_counter()
+    detector(frames[0])
+    firstFrame = time.perf_counter() - t
+
+    t = time.perf_counter()
+    for frame in frames[1:]:
+        detector(frame)
+    steady = (len(frames) - 1) / (time.perf_counter() - t) if len(frames) > 1 else 0.0
+
+    print(json.dumps({"cold": coldStart, "first": firstFrame, "fps": steady}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weights", default="yolov8m.pt")
+    parser.add_argument("--backends", nargs="+", default=["ultralytics", "onnxruntime", "opencv"])
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--video", default=None)
+    parser.add_argument("--prepare", action="store_true", help="Export and cache the ONNX model first")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    if args.prepare:
+        from cvkit.detection import exportOnnx
+        print(f"[INFO] ONNX export cached at {exportOnnx(args.weights, args.imgsz)}")
+
+    print(f"{'backend':<12} {'cold start (s)':>15} {'first frame (ms)':>17} {'steady FPS':>11}")
+    for backend in args.backends:
+        cmd = [sys.executable, __file__, "--child", backend, "--weights", args.weights,
+               "--imgsz", str(args.imgsz), "--frames", str(args.frames)]
+        if args.threads:
+            cmd += ["--threads", str(args.threads)]
+        if args.video:
+            cmd += ["--video", args.video]
+        out = subprocess.run(cmd, capture_output=True, text=True)
+        if out.returncode != 0:
+            error = (out.stderr.strip().splitlines() or ["failed"])[-1]
+            print(f"{backend:<12} skipped ({error})")
+            continue
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{backend:<12} {r['cold']:>15.2f} {r['first'] * 1000:>17.1f} {r['fps']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
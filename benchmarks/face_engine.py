@@ -0,0 +1,92 @@
+"""
+Throughput of FaceEngine against full-resolution Haar on every frame.
+
+The baseline is what FaceCount.py used to do: detectMultiScale on the
+full-size grayscale frame, every frame. Its boxes are also the reference
+for recall (share of baseline faces matched at IoU >= 0.3). Each engine
+configuration replays the same decoded frames.
+
+    python benchmarks/face_engine.py crowd.mp4 --scales 1.0 0.5 --intervals 1 5 10
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from cvkit.detection import boxIou
+from cvkit.faces import HAAR_FRONTAL, FaceEngine
+
+
+def readFrames(path, limit):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def xyxy(boxes):
+    boxes = np.asarray(boxes, np.float32).reshape(-1, 4)
+    return np.column_stack([boxes[:, :2], boxes[:, :2] + boxes[:, 2:]])
+
+
+def baseline(frames):
+    cascade = cv2.CascadeClassifier(HAAR_FRONTAL)
+    start = time.perf_counter()
+    ref = []
+    for frame in frames:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        ref.append(cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5))
+    return ref, time.perf_counter() - start
+
+
+def recall(pred, ref, threshold=0.3):
+    hit = total = 0
+    for p, r in zip(pred, ref):
+        total += len(r)
+        if len(p) and len(r):
+            hit += int((boxIou(xyxy(r), xyxy(p)).max(axis=1) >= threshold).sum())
+    return hit / total if total else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1.0, 0.5])
+    parser.add_argument("--intervals", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--min-size", type=int, default=40, help="Smallest face side in full-frame pixels")
+    parser.add_argument("--max-frames", type=int, default=500)
+    args = parser.parse_args()
+
+    frames = readFrames(args.video, args.max_frames)
+    if not frames:
+        raise SystemExit(f"Could not read frames from {args.video}")
+    h, w = frames[0].shape[:2]
+    print(f"{args.video}: {len(frames)} frames at {w}x{h}")
+
+    ref, elapsed = baseline(frames)
+    print(f"{'config':<22} {'FPS':>8} {'ms/frame':>9} {'faces/frame':>12} {'recall':>7} {'unique IDs':>11}")
+    faces = np.mean([len(r) for r in ref])
+    print(f"{'baseline full-res':<22} {len(frames) / elapsed:>8.1f} {elapsed / len(frames) * 1000:>9.2f} "
+          f"{faces:>12.2f} {1.0:>7.2f} {'-':>11}")
+
+    for scale in args.scales:
+        for interval in args.intervals:
+            engine = FaceEngine(scale=scale, interval=interval, minSize=(args.min_size, args.min_size))
+            start = time.perf_counter()
+            pred = [engine.process(frame).boxes for frame in frames]
+            elapsed = time.perf_counter() - start
+            faces = np.mean([len(p) for p in pred])
+            name = f"scale {scale:g} every {interval}"
+            print(f"{name:<22} {len(frames) / elapsed:>8.1f} {elapsed / len(frames) * 1000:>9.2f} "
+                  f"{faces:>12.2f} {recall(pred, ref):>7.2f} {engine.nextId:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Import-time benchmark for cvkit.
+
+Every case runs in a fresh interpreter so module caches don't hide the cost.
+Compares the old eager `import mediapipe` startup against importing cvkit
+and constructing a handDetector, plus the one-off cost paid on the first
+findHands() call.
+
+    python benchmarks/import_time.py --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+CASES = {
+    "eager: import cv2, mediapipe": (
+        "import cv2, mediapipe"
+    ),
+    "lazy: import cvkit": (
+        "import cvkit"
+    ),
+    "lazy: cvkit.handDetector()": (
+        "import cvkit; cvkit.handDetector()"
+    ),
+    "lazy: first findHands()": (
+        "import numpy as np, cvkit;"
+        "cvkit.handDetector().findHands(np.zeros((480, 640, 3), np.uint8))"
+    ),
+}
+
+TIMER = (
+    "import time; _t = time.perf_counter();"
+    "{code};"
+    "print(time.perf_counter() - _t)"
+)
+
+# Run from the repo root so cvkit imports without being installed
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timeCase(code, repeat):
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", TIMER.format(code=code)],
+            capture_output=True, text=True, cwd=ROOT
+        )
+        if out.returncode != 0:
+            return None, out.stderr.strip().splitlines()[-1]
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'case':<34} {'median (ms)':>12}")
+    for name, code in CASES.items():
+        median, error = timeCase(code, args.repeat)
+        if error:
+            print(f"{name:<34} {'skipped':>12}  ({error})")
+        else:
+            print(f"{name:<34} {median * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
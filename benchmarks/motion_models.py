@@ -0,0 +1,69 @@
+"""
+CPU cost of the MotionEngine background models on recorded clips.
+
+Every model runs over the same decoded frames at each pyramid level. CPU
+time is process time (what limits cameras per Pi), not wall time.
+"baseline" is the old MotionDetection.py pipeline: frame differencing with
+a 21x21 blur at full size.
+
+    python benchmarks/motion_models.py clip1.mp4 clip2.mp4 --levels 0 1 2
+"""
+
+import argparse
+import time
+
+import cv2
+
+from cvkit.motion import MODELS, MotionEngine
+
+
+def readFrames(path, limit):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def measure(engine, frames):
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    active = 0
+    for frame in frames:
+        if len(engine.apply(frame)):
+            active += 1
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    return cpu / len(frames) * 1000, wall / len(frames) * 1000, active / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clips", nargs="+")
+    parser.add_argument("--levels", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--max-frames", type=int, default=500)
+    args = parser.parse_args()
+
+    for clip in args.clips:
+        frames = readFrames(clip, args.max_frames)
+        if not frames:
+            print(f"{clip}: no frames")
+            continue
+        h, w = frames[0].shape[:2]
+        print(f"\n{clip}: {len(frames)} frames at {w}x{h}")
+        print(f"{'model':<12} {'level':>5} {'CPU ms/frame':>13} {'wall ms/frame':>14} {'motion frames':>14}")
+
+        cpu, wall, active = measure(MotionEngine("frame_diff", level=0, blur=21), frames)
+        print(f"{'baseline':<12} {0:>5} {cpu:>13.2f} {wall:>14.2f} {active:>13.0%}")
+        for model in MODELS:
+            for level in args.levels:
+                cpu, wall, active = measure(MotionEngine(model, level=level), frames)
+                print(f"{model:<12} {level:>5} {cpu:>13.2f} {wall:>14.2f} {active:>13.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+CPU cost of QrScanner against full-frame detectAndDecodeMulti on every
+frame (the old 07_qr_code_scanner.py, extended to many codes), on
+recorded clips.
+
+Both run over the same decoded frames. "payloads" counts the distinct
+payloads each found over the clip; "decodes" is how many crops QrScanner
+actually decoded (for the baseline, the full-frame decodes). CPU time is
+process time.
+
+    python benchmarks/qr_scanner.py shelf.mp4 --scales 0.5 0.33
+"""
+
+import argparse
+import time
+
+import cv2
+
+from cvkit.qr import QrScanner
+
+
+def readFrames(path, limit):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def measure(scan, frames):
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    payloads = set()
+    for frame in frames:
+        payloads.update(d for d in scan(frame) if d)
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    return cpu / len(frames) * 1000, wall / len(frames) * 1000, payloads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clips", nargs="+")
+    parser.add_argument("--scales", type=float, nargs="+", default=[0.5, 0.33])
+    parser.add_argument("--max-frames", type=int, default=300)
+    args = parser.parse_args()
+
+    for clip in args.clips:
+        frames = readFrames(clip, args.max_frames)
+        if not frames:
+            print(f"{clip}: no frames")
+            continue
+        h, w = frames[0].shape[:2]
+        print(f"\n{clip}: {len(frames)} frames at {w}x{h}")
+        print(f"{'scanner':<10} {'scale':>5} {'CPU ms/frame':>13} {'wall ms/frame':>14} {'payloads':>9} {'decodes':>8}")
+
+        detector = cv2.QRCodeDetector()
+        cpu, wall, payloads = measure(lambda f: detector.detectAndDecodeMulti(f)[1] or (), frames)
+        print(f"{'baseline':<10} {1.0:>5} {cpu:>13.2f} {wall:>14.2f} {len(payloads):>9} {len(frames):>8}")
+        for scale in args.scales:
+            scanner = QrScanner(scale=scale)
+            cpu, wall, payloads = measure(lambda f: scanner.scan(f).data, frames)
+            print(f"{'QrScanner':<10} {scale:>5} {cpu:>13.2f} {wall:>14.2f} {len(payloads):>9} "
+                  f"{scanner.decodeCount:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+SketchFilter against the original sketch pipeline of 10_sketch_effect.py,
+for speed and for how close the output is.
+
+Frames are decoded once and resized to --size (1080p by default). For
+every level the filter is checked pixel by pixel against the original
+output: mean and 99th percentile absolute difference, and the share of
+pixels within --tolerance grey levels. The dodge step divides by the blur,
+so in near-black areas a blur off by one level moves the output a lot;
+those pixels are what the last column counts. CPU time is process time.
+
+    python benchmarks/sketch_filter.py clip1.mp4 --levels 0 1 2 --tolerance 8
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from cvkit.sketch import SketchFilter
+
+
+def readFrames(path, limit):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def original(frame, ksize=21):
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    inv = 255 - gray
+    blur = cv2.GaussianBlur(inv, (ksize, ksize), 0)
+    return cv2.divide(gray, 255 - blur, scale=256)
+
+
+def measure(fn, frames):
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    for frame in frames:
+        fn(frame)
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    return cpu / len(frames) * 1000, wall / len(frames) * 1000
+
+
+def compare(sketcher, frames, expected, tolerance):
+    diffs = np.concatenate([np.abs(sketcher.apply(f).astype(np.int16) - e).ravel()
+                            for f, e in zip(frames, expected)])
+    return diffs.mean(), np.percentile(diffs, 99), (diffs <= tolerance).mean()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clips", nargs="+")
+    parser.add_argument("--size", type=int, nargs=2, default=[1920, 1080], metavar=("W", "H"))
+    parser.add_argument("--ksize", type=int, default=21)
+    parser.add_argument("--levels", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--passes", type=int, default=4, help="Box filter passes")
+    parser.add_argument("--tolerance", type=int, default=8, help="Grey levels a pixel may differ by")
+    parser.add_argument("--max-frames", type=int, default=100)
+    args = parser.parse_args()
+
+    for clip in args.clips:
+        frames = [cv2.resize(f, tuple(args.size), interpolation=cv2.INTER_CUBIC)
+                  for f in readFrames(clip, args.max_frames)]
+        if not frames:
+            print(f"{clip}: no frames")
+            continue
+        expected = [original(f, args.ksize) for f in frames]
+        print(f"\n{clip}: {len(frames)} frames at {args.size[0]}x{args.size[1]}")
+        print(f"{'filter':<10} {'level':>5} {'boxes':>9} {'CPU ms/frame':>13} {'wall ms/frame':>14} "
+              f"{'mean diff':>10} {'p99 diff':>9} {f'within {args.tolerance}':>10}")
+
+        cpu, wall = measure(lambda f: original(f, args.ksize), frames)
+        print(f"{'original':<10} {'':>5} {'':>9} {cpu:>13.2f} {wall:>14.2f} {0:>10.2f} {0:>9.0f} {1:>10.2%}")
+        for level in args.levels:
+            sketcher = SketchFilter(args.ksize, level=level, passes=args.passes)
+            mean, p99, within = compare(sketcher, frames, expected, args.tolerance)
+            cpu, wall = measure(sketcher.apply, frames)
+            boxes = ",".join(map(str, sketcher.widths)) if sketcher.level else "gauss"
+            print(f"{'sketch':<10} {sketcher.level:>5} {boxes:>9} {cpu:>13.2f} {wall:>14.2f} "
+                  f"{mean:>10.2f} {p99:>9.0f} {within:>10.2%}")
+
+
+if __name__ == "__main__":
+    main()
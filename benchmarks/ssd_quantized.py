@@ -0,0 +1,103 @@
+"""
+Accuracy / latency of the FP32 and INT8 SSD detectors on a fixed image set.
+
+FP32 detections at --ref-threshold are the reference. For each variant and
+score threshold the script reports precision and recall against that
+reference (same class, IoU >= 0.5), plus per-image latency. Use it to pick
+the threshold that gives INT8 the same operating point as FP32.
+
+    python benchmarks/ssd_quantized.py --images eval_images/ \\
+        --pb models1/frozen_inference_graph.pb --pbtxt models1/dnngraph.pbtxt \\
+        --onnx models1/ssd_int8.onnx --threads 4
+"""
+
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+from cvkit.detection import boxIou
+from cvkit.ssd import SsdDetector
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def runVariant(detector, images):
+    outputs, times = [], []
+    detector.forward(images[0])   # Warm-up
+    for img in images:
+        start = time.perf_counter()
+        outputs.append(detector.forward(img)[0, 0])
+        times.append(time.perf_counter() - start)
+    return outputs, np.array(times) * 1000
+
+
+def select(rows, threshold):
+    rows = rows[rows[:, 2] >= threshold]
+    return rows[:, 3:7], rows[:, 1].astype(int)
+
+
+def match(pred, ref, iouThreshold=0.5):
+    predBoxes, predCls = pred
+    refBoxes, refCls = ref
+    if len(predBoxes) == 0 or len(refBoxes) == 0:
+        return 0
+    iou = boxIou(predBoxes, refBoxes)
+    iou[predCls[:, None] != refCls[None, :]] = 0
+    # Greedy one-to-one matching, best pairs first
+    hits = 0
+    while iou.size and iou.max() >= iouThreshold:
+        i, j = np.unravel_index(iou.argmax(), iou.shape)
+        iou[i, :] = 0
+        iou[:, j] = 0
+        hits += 1
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", required=True)
+    parser.add_argument("--pb", required=True)
+    parser.add_argument("--pbtxt", required=True)
+    parser.add_argument("--onnx", required=True)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--ref-threshold", type=float, default=0.5)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.3, 0.4, 0.5, 0.6])
+    args = parser.parse_args()
+
+    paths = sorted(os.path.join(args.images, f) for f in os.listdir(args.images)
+                   if f.lower().endswith(IMAGE_EXTENSIONS))
+    images = [cv2.imread(p) for p in paths]
+    if not images:
+        raise SystemExit(f"No images in {args.images}")
+
+    variants = {
+        "fp32": SsdDetector("fp32", pb=args.pb, pbtxt=args.pbtxt, threads=args.threads),
+        "int8": SsdDetector("int8", onnxPath=args.onnx, threads=args.threads),
+    }
+    results = {name: runVariant(det, images) for name, det in variants.items()}
+    reference = [select(rows, args.ref_threshold) for rows in results["fp32"][0]]
+    refCount = sum(len(r[0]) for r in reference)
+
+    print(f"{len(images)} images, {refCount} reference detections (FP32 >= {args.ref_threshold})")
+    print(f"{'variant':<8} {'mean ms':>8} {'p90 ms':>8} {'FPS':>6}")
+    for name, (_, ms) in results.items():
+        print(f"{name:<8} {ms.mean():>8.1f} {np.percentile(ms, 90):>8.1f} {1000 / ms.mean():>6.1f}")
+
+    print(f"\n{'variant':<8} {'thresh':>6} {'precision':>10} {'recall':>8}")
+    for name, (outputs, _) in results.items():
+        for t in args.thresholds:
+            hits = predicted = 0
+            for rows, ref in zip(outputs, reference):
+                pred = select(rows, t)
+                predicted += len(pred[0])
+                hits += match(pred, ref)
+            precision = hits / predicted if predicted else 1.0
+            recall = hits / refCount if refCount else 1.0
+            print(f"{name:<8} {t:>6.2f} {precision:>10.3f} {recall:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""
+Shared computer-vision helpers for the scripts in this repository.
+
+Heavy optional dependencies (MediaPipe, ultralytics, ...) are imported
+lazily by the modules that need them, so `import cvkit` stays cheap.
+"""
+
+from .hand_tracking import (
+    handDetector,
+    fingersUpArray,
+    distanceArray,
+    pairwiseDistanceArray,
+    bboxArray,
+)
+
+__version__ = "0.1.0"
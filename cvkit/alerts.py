@@ -0,0 +1,236 @@
+import http.server
+import importlib
+import json
+import queue
+import shutil
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+
+class BeepSink:
+    """Runs the `beep` command, or rings the terminal bell when it isn't installed."""
+
+    def __init__(self, frequency=1000, length=100):
+        self.cmd = ["beep", "-f", str(frequency), "-l", str(length)] if shutil.which("beep") else None
+
+    def send(self, alert):
+        if self.cmd:
+            subprocess.run(self.cmd, check=False)
+        else:
+            sys.stdout.write("\a")
+            sys.stdout.flush()
+
+
+class GpioSink:
+    """Pulses a GPIO pin (BCM numbering) high for `duration` seconds."""
+
+    def __init__(self, pin, duration=0.5):
+        self.GPIO = importlib.import_module("RPi.GPIO")
+        self.pin = pin
+        self.duration = duration
+        self.GPIO.setmode(self.GPIO.BCM)
+        self.GPIO.setup(pin, self.GPIO.OUT)
+
+    def send(self, alert):
+        self.GPIO.output(self.pin, self.GPIO.HIGH)
+        time.sleep(self.duration)
+        self.GPIO.output(self.pin, self.GPIO.LOW)
+
+
+class WebhookSink:
+    """POSTs the alert as JSON to `url`."""
+
+    def __init__(self, url, timeout=2.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alert):
+        req = urllib.request.Request(self.url, data=json.dumps(alert).encode(),
+                                     headers={"Content-Type": "application/json"})
+        urllib.request.urlopen(req, timeout=self.timeout).close()
+
+
+class LogFileSink:
+    """Appends one JSON line per alert."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, alert):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(alert) + "\n")
+
+
+class AlertDispatcher:
+    """
+    Sends alerts to sinks on a worker thread so the capture loop never waits.
+
+    Call update(active) once per frame. An alert fires once the condition
+    has held for `holdFrames` consecutive frames (debounce), and at most
+    once every `minInterval` seconds (rate limit). Firing only puts a dict
+    on a bounded queue. If the worker is still busy with earlier alerts, the
+    new one is dropped and counted rather than blocking.
+    """
+
+    def __init__(self, sinks, minInterval=5.0, holdFrames=3, queueSize=8):
+        self.sinks = list(sinks)
+        self.minInterval = minInterval
+        self.holdFrames = holdFrames
+        self.queue = queue.Queue(maxsize=queueSize)
+
+        self.streak = 0
+        self.lastFired = -float("inf")
+        self.fired = 0
+        self.suppressed = 0    # Rate-limited while the condition held
+        self.dropped = 0       # Queue full
+        self.errors = 0        # Sink raised
+
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+
+    def update(self, active, **data):
+        """Feeds this frame's condition; returns True if an alert was queued."""
+        if not active:
+            self.streak = 0
+            return False
+        self.streak += 1
+        if self.streak < self.holdFrames:
+            return False
+
+        now = time.monotonic()
+        if now - self.lastFired < self.minInterval:
+            self.suppressed += 1
+            return False
+        return self.fire(**data)
+
+    def fire(self, **data):
+        """Queues an alert now, bypassing debounce and rate limit."""
+        self.lastFired = time.monotonic()
+        alert = {"time": time.time(), **data}
+        try:
+            self.queue.put_nowait(alert)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.fired += 1
+        return True
+
+    def _worker(self):
+        while True:
+            alert = self.queue.get()
+            if alert is None:
+                break
+            for sink in self.sinks:
+                try:
+                    sink.send(alert)
+                except Exception as e:
+                    self.errors += 1
+                    print(f"[WARNING] alert sink {type(sink).__name__} failed: {e}")
+
+    def close(self, timeout=2.0):
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.thread.join(timeout=timeout)
+
+
+SINKS = ("beep", "gpio", "webhook", "log")
+
+
+def makeSinks(names, webhookUrl=None, logPath="alerts.log", gpioPin=21):
+    sinks = []
+    for name in names:
+        if name == "beep":
+            sinks.append(BeepSink())
+        elif name == "gpio":
+            sinks.append(GpioSink(gpioPin))
+        elif name == "webhook":
+            sinks.append(WebhookSink(webhookUrl or "http://127.0.0.1:8000/alert"))
+        elif name == "log":
+            sinks.append(LogFileSink(logPath))
+        else:
+            raise ValueError(f"Unknown alert sink: {name}")
+    return sinks
+
+
+class WebhookStub:
+    """
+    Local HTTP server that accepts webhook POSTs and keeps the JSON bodies
+    in `received`, standing in for a real alert endpoint.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, delay=0.0):
+        stub = self
+        self.received = []
+        self.delay = delay    # Simulate a slow endpoint
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(stub.delay)
+                stub.received.append(json.loads(body or b"{}"))
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        self.httpd = Server((host, port), Handler)
+        self.host, self.port = self.httpd.server_address[:2]
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/alert"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local webhook stub that prints alerts")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    stub = WebhookStub(port=args.port).start()
+    print(f"[INFO] webhook stub listening on {stub.url} (Ctrl+C to stop)")
+    seen = 0
+    try:
+        while True:
+            time.sleep(0.5)
+            # The stub keeps appending from its own thread; count only what was printed
+            new = stub.received[seen:]
+            seen += len(new)
+            for alert in new:
+                print(alert)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
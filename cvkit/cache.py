@@ -0,0 +1,114 @@
+import collections
+import time
+
+import cv2
+import numpy as np
+
+
+def dHash(img, size=8):
+    """
+    64-bit difference hash of an image or crop (for size=8).
+
+    The image is shrunk to (size + 1) x size grayscale pixels and each bit
+    records whether a pixel is brighter than its right neighbour, so small
+    shifts, noise and exposure changes flip only a few bits.
+    """
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    small = cv2.resize(gray, (size + 1, size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(x):
+        return np.bitwise_count(x)
+else:
+    def _popcount(x):
+        return np.unpackbits(x.view(np.uint8)).reshape(len(x), -1).sum(axis=1)
+
+
+class HashCache:
+    """
+    LRU + TTL cache keyed by perceptual hash, matching within a Hamming
+    distance.
+
+    get() returns the value stored under the closest hash at most
+    `maxDistance` bits away, if it is younger than `ttl` seconds. Lookups
+    compare against all stored hashes in one vector XOR + popcount, which
+    for a few hundred entries costs microseconds. Once `maxSize` entries are
+    stored, the least recently used one is evicted.
+
+    hits, misses, hitRate and the mean lookup time are kept as metrics.
+    """
+
+    def __init__(self, maxSize=256, ttl=30.0, maxDistance=5):
+        self.maxSize = maxSize
+        self.ttl = ttl
+        self.maxDistance = maxDistance
+        self.entries = collections.OrderedDict()    # hash -> (value, time stored)
+        self._keys = None                           # uint64 array of the hashes, rebuilt on change
+
+        self.hits = 0
+        self.misses = 0
+        self.lookupTime = 0.0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def hitRate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def lookupMs(self):
+        total = self.hits + self.misses
+        return self.lookupTime / total * 1000 if total else 0.0
+
+    def _expire(self, now):
+        while self.entries:
+            key, (_, stored) = next(iter(self.entries.items()))
+            if now - stored < self.ttl:
+                break
+            # Oldest-used first, so expired entries are usually at the front
+            del self.entries[key]
+            self._keys = None
+
+    def get(self, key, now=None):
+        start = time.perf_counter()
+        now = time.monotonic() if now is None else now
+        value = None
+        if self.entries:
+            if self._keys is None:
+                self._keys = np.fromiter(self.entries, np.uint64, len(self.entries))
+            dist = _popcount(self._keys ^ np.uint64(key))
+            best = int(dist.argmin())
+            if dist[best] <= self.maxDistance:
+                match = int(self._keys[best])
+                cached, stored = self.entries[match]
+                if now - stored < self.ttl:
+                    self.entries.move_to_end(match)
+                    self._keys = None
+                    value = cached
+                else:
+                    del self.entries[match]
+                    self._keys = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.lookupTime += time.perf_counter() - start
+        return value
+
+    def put(self, key, value, now=None):
+        now = time.monotonic() if now is None else now
+        self.entries[key] = (value, now)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+        self._expire(now)
+        self._keys = None
+
+    def summary(self):
+        return f"cache {len(self)} entries, hit rate {self.hitRate:.0%}, lookup {self.lookupMs:.3f} ms"
@@ -0,0 +1,203 @@
+import collections
+
+import cv2
+import numpy as np
+
+
+# OpenCV HSV ranges (H 0-179) per colour class. Red wraps around the end
+# of the hue circle, so it needs two ranges.
+COLORS = {
+    "red": [((0, 120, 70), (10, 255, 255)), ((170, 120, 70), (179, 255, 255))],
+    "orange": [((11, 120, 70), (22, 255, 255))],
+    "yellow": [((23, 100, 100), (34, 255, 255))],
+    "green": [((35, 80, 50), (85, 255, 255))],
+    "blue": [((90, 100, 50), (130, 255, 255))],
+    "purple": [((131, 80, 50), (169, 255, 255))],
+}
+
+# BGR colours to draw each class with
+DRAW_COLORS = {
+    "red": (0, 0, 255),
+    "orange": (0, 140, 255),
+    "yellow": (0, 255, 255),
+    "green": (0, 255, 0),
+    "blue": (255, 0, 0),
+    "purple": (255, 0, 160),
+}
+
+# boxes: (N, 4) int32 x, y, w, h, centroids: (N, 2) float32 x, y,
+# areas: (N,) int32 pixels; all in full-frame coordinates, largest first
+Blobs = collections.namedtuple("Blobs", ["boxes", "centroids", "areas"])
+
+
+def emptyBlobs():
+    return Blobs(np.zeros((0, 4), np.int32), np.zeros((0, 2), np.float32), np.zeros(0, np.int32))
+
+
+def buildLut(classes, bins=32):
+    """
+    A bins**3 table from quantized BGR to class label (0 = none, then 1, 2,
+    ... in the order of `classes`, a dict of name -> HSV ranges).
+
+    Each cell is labelled by converting its centre colour to HSV and
+    testing the ranges, so a range boundary is only as sharp as the cell
+    size (8 grey levels for 32 bins). Where ranges overlap, the first class
+    wins. Index the table with b << 2k | g << k | r for k = log2(bins).
+    """
+    step = 256 // bins
+    centers = np.arange(bins, dtype=np.uint8) * step + step // 2
+    b, g, r = np.meshgrid(centers, centers, centers, indexing="ij")
+    bgr = np.stack([b, g, r], axis=-1).reshape(-1, 1, 3)
+    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+
+    lut = np.zeros(bins ** 3, np.uint8)
+    for label, ranges in enumerate(classes.values(), start=1):
+        hit = np.zeros(bins ** 3, bool)
+        for lower, upper in ranges:
+            hit |= cv2.inRange(hsv, lower, upper).ravel() > 0
+        lut[hit & (lut == 0)] = label
+    return lut
+
+
+class ColorEngine:
+    """
+    Labels every pixel with one of several colour classes in a single
+    pass, whatever the number of classes.
+
+    The frame is shrunk `level` times by half (INTER_AREA, which also
+    smooths sensor noise), each pixel is quantized to `bins` levels per BGR
+    channel, and a precomputed bins**3 lookup table (buildLut) gives its
+    class. There is no HSV conversion or per-class inRange on the frame, so
+    six colours cost the same as one. The table agrees with inRange on HSV
+    for about 97% of uniformly random colours and for all colours a couple
+    of hue steps inside a range (both ends of red included); the rest lie
+    within one cell of a range boundary.
+
+    apply() returns the label image (reduced size, 0 = no class, otherwise
+    the 1-based index into `names`) and counts each class's area with one
+    histogram. Masks and blobs are built on request, per class:
+
+        engine = ColorEngine(["red", "blue"])
+        engine.apply(frame)
+        engine.areas["red"]                 # pixels, full-frame scale
+        mask = engine.mask("red")           # full-size uint8 0/255
+        blobs = engine.blobs("blue")        # Blobs of at least minArea pixels
+
+    `classes` is a list of names from COLORS, or a dict of name -> HSV
+    ranges for custom classes. The label image and masks are reused between
+    frames.
+    """
+
+    def __init__(self, classes=None, level=1, bins=32, minArea=300):
+        if classes is None:
+            classes = COLORS
+        elif not isinstance(classes, dict):
+            unknown = [name for name in classes if name not in COLORS]
+            if unknown:
+                raise ValueError(f"Unknown colours {unknown}, expected names from {sorted(COLORS)}")
+            classes = {name: COLORS[name] for name in classes}
+        if bins & (bins - 1) or not 2 <= bins <= 128:
+            raise ValueError(f"bins must be a power of two up to 128, got {bins}")
+        if len(classes) > 254:
+            raise ValueError("At most 254 colour classes fit in a uint8 label image")
+
+        self.names = list(classes)
+        self.level = level
+        self.minArea = minArea
+        self.lut = buildLut(classes, bins)
+        bits = bins.bit_length() - 1
+        shift = (np.arange(256, dtype=np.uint16) >> (8 - bits)).reshape(256, 1)
+        # Per-channel tables that quantize and move each channel into its bits of the index
+        self._tables = [shift << (2 * bits), shift << bits, shift]
+
+        self.shape = None
+        self.labels = None
+        self.areas = {name: 0 for name in self.names}
+        self._masks = {}
+        self._blobs = {}
+
+    def _allocate(self, shape):
+        h, w = shape
+        f = 2 ** self.level
+        self.small = np.empty((h // f, w // f, 3), np.uint8) if self.level else None
+        size = (h // f, w // f)
+        self.index = np.empty(size, np.uint16)
+        self._channel = np.empty(size, np.uint16)
+        self.labels = np.empty(size, np.uint8)
+        self.shape = shape
+
+    def label(self, frame):
+        """Class label per pixel of `frame` (reduced by `level`), into self.labels."""
+        if frame.shape[:2] != self.shape:
+            self._allocate(frame.shape[:2])
+        if self.level:
+            h, w = self.labels.shape
+            frame = cv2.resize(frame, (w, h), dst=self.small, interpolation=cv2.INTER_AREA)
+        for i, channel in enumerate(cv2.split(frame)):
+            if i == 0:
+                cv2.LUT(channel, self._tables[0], dst=self.index)
+            else:
+                cv2.LUT(channel, self._tables[i], dst=self._channel)
+                cv2.bitwise_or(self.index, self._channel, dst=self.index)
+        np.take(self.lut, self.index, out=self.labels)
+        return self.labels
+
+    def apply(self, frame):
+        labels = self.label(frame)
+        counts = cv2.calcHist([labels], [0], None, [len(self.names) + 1], [0, len(self.names) + 1]).ravel()
+        scale = 4 ** self.level
+        self.areas = {name: int(counts[i]) * scale for i, name in enumerate(self.names, start=1)}
+        self._masks.clear()
+        self._blobs.clear()
+        return labels
+
+    def _smallMask(self, name):
+        if name not in self._masks:
+            self._masks[name] = cv2.compare(self.labels, self.names.index(name) + 1, cv2.CMP_EQ)
+        return self._masks[name]
+
+    def mask(self, name, fullSize=True):
+        """0/255 mask of one class on the last frame, at frame size or at the labelling size."""
+        small = self._smallMask(name)
+        if not fullSize or not self.level:
+            return small
+        h, w = self.shape
+        return cv2.resize(small, (w, h), interpolation=cv2.INTER_NEAREST)
+
+    def foreground(self, fullSize=True):
+        """0/255 mask of pixels in any class."""
+        mask = cv2.compare(self.labels, 0, cv2.CMP_GT)
+        if not fullSize or not self.level:
+            return mask
+        h, w = self.shape
+        return cv2.resize(mask, (w, h), interpolation=cv2.INTER_NEAREST)
+
+    def blobs(self, name):
+        """Connected regions of one class with at least minArea full-frame pixels, largest first."""
+        if name in self._blobs:
+            return self._blobs[name]
+        blobs = emptyBlobs()
+        # Skip the labelling when the class can't hold a big enough blob
+        if self.areas.get(name, 0) >= self.minArea:
+            _, _, stats, centroids = cv2.connectedComponentsWithStats(self._smallMask(name), connectivity=8)
+            f = 2 ** self.level
+            areas = stats[1:, cv2.CC_STAT_AREA] * f * f
+            keep = np.flatnonzero(areas >= self.minArea)
+            keep = keep[np.argsort(-areas[keep])]
+            blobs = Blobs((stats[1:, :4][keep] * f).astype(np.int32),
+                          ((centroids[1:][keep] + 0.5) * f - 0.5).astype(np.float32),
+                          areas[keep].astype(np.int32))
+        self._blobs[name] = blobs
+        return blobs
+
+
+def drawBlobs(img, engine, names=None):
+    """Outlines the blobs of each class (all by default) with its name and area."""
+    for name in names or engine.names:
+        color = DRAW_COLORS.get(name, (255, 255, 255))
+        blobs = engine.blobs(name)
+        for (x, y, w, h), (cx, cy), area in zip(blobs.boxes, blobs.centroids, blobs.areas):
+            cv2.rectangle(img, (int(x), int(y)), (int(x + w), int(y + h)), color, 2)
+            cv2.circle(img, (int(cx), int(cy)), 4, color, -1)
+            cv2.putText(img, f"{name} {area}", (int(x), int(y) - 8), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+    return img
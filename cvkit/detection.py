@@ -0,0 +1,277 @@
+import ast
+import collections
+import contextlib
+import hashlib
+import importlib
+import os
+import shutil
+
+import cv2
+import numpy as np
+
+
+# boxes: (N, 4) float32 x1, y1, x2, y2 in pixels
+# scores: (N,) float32, classIds: (N,) int32
+Detections = collections.namedtuple("Detections", ["boxes", "scores", "classIds"])
+
+
+def emptyDetections():
+    return Detections(np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.int32))
+
+
+@contextlib.contextmanager
+def cvThreads(threads):
+    """
+    Caps OpenCV's thread pool at `threads` inside the block and restores
+    the previous count on exit. The pool is process-wide, so while the
+    block runs the cap also applies to cv2 calls made on other threads.
+    """
+    previous = cv2.getNumThreads()
+    if not threads or threads == previous:
+        yield
+        return
+    cv2.setNumThreads(threads)
+    try:
+        yield
+    finally:
+        cv2.setNumThreads(previous)
+
+
+class UltralyticsDetector:
+    """
+    Wraps an ultralytics YOLO model so it returns Detections.
+
+    ultralytics (and PyTorch behind it) is only imported when the model is
+    first needed.
+    """
+
+    def __init__(self, weights="yolov8m.pt", conf=0.25):
+        self.weights = weights
+        self.conf = conf
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            YOLO = importlib.import_module("ultralytics").YOLO
+            self._model = YOLO(self.weights)
+        return self._model
+
+    @property
+    def names(self):
+        return self.model.names
+
+    def _toDetections(self, r):
+        boxes = r.boxes
+        if boxes is None or len(boxes) == 0:
+            return emptyDetections()
+        return Detections(
+            boxes.xyxy.cpu().numpy().astype(np.float32),
+            boxes.conf.cpu().numpy().astype(np.float32),
+            boxes.cls.cpu().numpy().astype(np.int32),
+        )
+
+    def __call__(self, frame):
+        r = self.model(frame, conf=self.conf, verbose=False)[0]
+        return self._toDetections(r)
+
+    def batch(self, frames):
+        """Runs one forward pass over a list of frames."""
+        return [self._toDetections(r) for r in self.model(list(frames), conf=self.conf, verbose=False)]
+
+    def warmup(self, imgsz=640):
+        self(np.zeros((imgsz, imgsz, 3), np.uint8))
+        return self
+
+
+def exportOnnx(weights, imgsz=640, cacheDir=None):
+    """
+    Exports an ultralytics .pt model to ONNX once and returns the cached
+    path. The cache key covers the weights file contents and the input size,
+    so retrained weights get a fresh export.
+    """
+    cacheDir = cacheDir or os.path.join(os.path.expanduser("~"), ".cache", "cvkit", "onnx")
+    os.makedirs(cacheDir, exist_ok=True)
+
+    digest = hashlib.sha1()
+    if os.path.exists(weights):
+        with open(weights, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    else:
+        # Not downloaded yet; ultralytics fetches it by name
+        digest.update(weights.encode())
+    stem = os.path.splitext(os.path.basename(weights))[0]
+    cached = os.path.join(cacheDir, f"{stem}-{imgsz}-{digest.hexdigest()[:12]}.onnx")
+    if os.path.exists(cached):
+        return cached
+
+    YOLO = importlib.import_module("ultralytics").YOLO
+    exported = YOLO(weights).export(format="onnx", imgsz=imgsz, dynamic=False)
+    shutil.move(exported, cached + ".tmp")
+    os.replace(cached + ".tmp", cached)
+    return cached
+
+
+def letterbox(img, size):
+    """Resizes keeping aspect ratio and pads to size x size. Returns image, scale, (padX, padY)."""
+    h, w = img.shape[:2]
+    scale = min(size / h, size / w)
+    nw, nh = int(round(w * scale)), int(round(h * scale))
+    padX, padY = (size - nw) // 2, (size - nh) // 2
+    out = np.full((size, size, 3), 114, np.uint8)
+    out[padY:padY + nh, padX:padX + nw] = cv2.resize(img, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    return out, scale, (padX, padY)
+
+
+def decodeYolo(output, conf, iou, scale, pad):
+    """
+    Turns a raw YOLOv8 head output of shape (1, 4 + classes, anchors) into
+    Detections in original image pixels, with class-aware NMS.
+    """
+    pred = output[0].T                      # (anchors, 4 + classes)
+    classScores = pred[:, 4:]
+    classIds = classScores.argmax(axis=1)
+    scores = classScores[np.arange(len(pred)), classIds]
+    keep = scores > conf
+    if not keep.any():
+        return emptyDetections()
+
+    pred, scores, classIds = pred[keep], scores[keep], classIds[keep]
+    cx, cy, bw, bh = pred[:, 0], pred[:, 1], pred[:, 2], pred[:, 3]
+    boxes = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1)
+    boxes = (boxes - np.array([pad[0], pad[1], pad[0], pad[1]], np.float32)) / scale
+
+    xywh = np.column_stack([boxes[:, :2], boxes[:, 2:] - boxes[:, :2]])
+    idx = cv2.dnn.NMSBoxesBatched(xywh.tolist(), scores.tolist(), classIds.tolist(), conf, iou)
+    idx = np.asarray(idx, np.int64).reshape(-1)
+    return Detections(boxes[idx].astype(np.float32), scores[idx].astype(np.float32),
+                      classIds[idx].astype(np.int32))
+
+
+class OnnxDetector:
+    """
+    Runs an exported YOLOv8 ONNX model through onnxruntime
+    (backend="onnxruntime") or cv2.dnn (backend="opencv").
+
+    `threads` caps the inference thread count. onnxruntime keeps it per
+    session; cv2.dnn only has the process-wide OpenCV pool, so the opencv
+    backend sets it around each forward pass (see cvThreads) rather than
+    for the whole process. warmup() pushes a dummy tensor through the
+    network so the first real frame doesn't pay for lazy allocations.
+    """
+
+    def __init__(self, onnxPath, backend="onnxruntime", threads=None, conf=0.25, iou=0.45,
+                 imgsz=640, names=None):
+        self.onnxPath = onnxPath
+        self.backend = backend
+        self.conf = conf
+        self.iou = iou
+        self.imgsz = imgsz
+        self.threads = threads
+        self._names = names
+
+        if backend == "onnxruntime":
+            ort = importlib.import_module("onnxruntime")
+            options = ort.SessionOptions()
+            if threads:
+                options.intra_op_num_threads = threads
+            self.session = ort.InferenceSession(onnxPath, options, providers=["CPUExecutionProvider"])
+            self.inputName = self.session.get_inputs()[0].name
+            if self._names is None:
+                meta = self.session.get_modelmeta().custom_metadata_map
+                if "names" in meta:
+                    self._names = ast.literal_eval(meta["names"])
+        elif backend == "opencv":
+            self.net = cv2.dnn.readNetFromONNX(onnxPath)
+            self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+            self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        else:
+            raise ValueError(f"Unknown ONNX backend: {backend}")
+
+    @property
+    def names(self):
+        if self._names is None:
+            # cv2.dnn can't read model metadata; use the onnx package if present
+            self._names = {}
+            try:
+                onnx = importlib.import_module("onnx")
+            except ImportError:
+                return self._names
+            meta = {p.key: p.value for p in onnx.load(self.onnxPath, load_external_data=False).metadata_props}
+            if "names" in meta:
+                self._names = ast.literal_eval(meta["names"])
+        return self._names
+
+    def _forward(self, blob):
+        if self.backend == "onnxruntime":
+            return self.session.run(None, {self.inputName: blob})[0]
+        self.net.setInput(blob)
+        with cvThreads(self.threads):
+            return self.net.forward()
+
+    def __call__(self, frame):
+        img, scale, pad = letterbox(frame, self.imgsz)
+        blob = cv2.dnn.blobFromImage(img, 1 / 255.0, swapRB=True)
+        return decodeYolo(self._forward(blob), self.conf, self.iou, scale, pad)
+
+    def batch(self, frames):
+        # The export has a static batch of 1
+        return [self(frame) for frame in frames]
+
+    def warmup(self, imgsz=None):
+        size = imgsz or self.imgsz
+        self._forward(np.zeros((1, 3, size, size), np.float32))
+        return self
+
+
+BACKENDS = ("ultralytics", "onnxruntime", "opencv")
+
+
+def makeDetector(backend="ultralytics", weights="yolov8m.pt", conf=0.25, threads=None,
+                 imgsz=640, cacheDir=None, warmup=True):
+    """
+    Builds a detector for `backend`. The ONNX backends export `weights`
+    on first use and reuse the cached export afterwards.
+    """
+    if backend == "ultralytics":
+        detector = UltralyticsDetector(weights, conf=conf)
+    elif backend in ("onnxruntime", "opencv"):
+        onnxPath = weights if weights.endswith(".onnx") else exportOnnx(weights, imgsz, cacheDir)
+        detector = OnnxDetector(onnxPath, backend, threads=threads, conf=conf, imgsz=imgsz)
+    else:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    return detector.warmup(imgsz) if warmup else detector
+
+
+def drawDetections(img, dets, names, color=(0, 255, 0), textColor=None, sep=" "):
+    textColor = textColor or color
+    for (x1, y1, x2, y2), score, classId in zip(dets.boxes.astype(int), dets.scores, dets.classIds):
+        label = f"{names.get(int(classId), classId)}{sep}{score:.2f}"
+        cv2.rectangle(img, (x1, y1), (x2, y2), color, 2)
+        cv2.putText(img, label, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, textColor, 2)
+    return img
+
+
+def boxIou(a, b):
+    """(len(a), len(b)) IoU matrix for two arrays of x1, y1, x2, y2 boxes."""
+    a = np.asarray(a, np.float32).reshape(-1, 4)
+    b = np.asarray(b, np.float32).reshape(-1, 4)
+    # Per-coordinate broadcasting with in-place ops keeps to a few (N, M)
+    # temporaries, which matters for trackers matching hundreds of boxes
+    ax1, ay1, ax2, ay2 = (a[:, i, None] for i in range(4))
+    bx1, by1, bx2, by2 = b.T
+    inter = np.minimum(ax2, bx2)
+    inter -= np.maximum(ax1, bx1)
+    np.maximum(inter, 0, out=inter)
+    h = np.minimum(ay2, by2)
+    h -= np.maximum(ay1, by1)
+    np.maximum(h, 0, out=h)
+    inter *= h
+    areaA = np.clip(ax2 - ax1, 0, None) * np.clip(ay2 - ay1, 0, None)
+    areaB = np.clip(bx2 - bx1, 0, None) * np.clip(by2 - by1, 0, None)
+    union = areaA + areaB
+    union -= inter
+    np.maximum(union, 1e-9, out=union)
+    inter /= union
+    return inter
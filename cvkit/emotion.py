@@ -0,0 +1,224 @@
+import importlib
+import time
+
+import cv2
+import numpy as np
+
+from .cache import HashCache, dHash
+from .faces import FaceEngine
+
+
+def loadFer(mtcnn=True):
+    """A FER detector; the fer package (and TensorFlow behind it) is imported here."""
+    return importlib.import_module("fer").FER(mtcnn=mtcnn)
+
+
+def _crop(frame, box):
+    x, y, w, h = box
+    crop = frame[max(y, 0):y + h, max(x, 0):x + w]
+    if crop.size == 0:
+        return None
+    return cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+
+
+def _thumb(crop, size=24):
+    return cv2.resize(crop, (size, size), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+class EmotionEngine:
+    """
+    Live emotion recognition that avoids re-running FER's networks on
+    every frame.
+
+    Faces are found with FER's own detector (MTCNN) every `interval` frames
+    and followed by a FaceEngine tracker in between, so each face has a
+    stable ID. The emotion CNN only sees faces that are new, whose crop
+    changed (mean absolute difference of a small grayscale thumbnail above
+    `changeThreshold`), or that haven't been classified for `maxAge`
+    frames. All of those go through one detect_emotions(face_rectangles=...)
+    call, which classifies them as a single batch. Per-face scores are
+    smoothed with an exponential moving average (`alpha` = weight of the
+    new scores).
+
+    With `cache` on, a face without scores yet (new, or back after leaving
+    the frame) is first looked up by the dHash of its crop in a HashCache
+    (LRU, `cacheTtl` seconds, `cacheDistance` bits of tolerance). Faces
+    that reached `maxAge` or whose crop changed always go to the network,
+    so the refresh and expression changes are never answered from the
+    coarse hash. Everything classified is cached, so a returning face at a
+    kiosk is served without inference.
+
+    process() returns a list of {"id", "box", "emotions"} dicts, like
+    FER.detect_emotions plus the face ID.
+    """
+
+    def __init__(self, fer=None, interval=10, scale=0.5, alpha=0.4, changeThreshold=8.0, maxAge=15,
+                 mtcnn=True, cache=True, cacheSize=256, cacheTtl=30.0, cacheDistance=5):
+        self.fer = fer or loadFer(mtcnn)
+        self.faces = FaceEngine(scale=scale, interval=interval, maxMissed=2,
+                                detector=lambda frame: self.fer.find_faces(frame, bgr=True))
+        self.alpha = alpha
+        self.changeThreshold = changeThreshold
+        self.maxAge = maxAge
+        self.cache = HashCache(cacheSize, cacheTtl, cacheDistance) if cache else None
+
+        self.labels = None
+        self.scores = {}    # face ID -> smoothed score vector
+        self.thumbs = {}    # face ID -> thumbnail the scores were computed on
+        self.age = {}       # face ID -> frames since last classified
+        self.classifyCount = 0
+        self.classifiedFaces = 0
+        self.classifyTime = 0.0
+
+    def _stale(self, frame, faces):
+        """Indices of faces that need fresh scores, with their grayscale crops and thumbnails."""
+        stale, crops, thumbs = [], {}, {}
+        for i, (faceId, box) in enumerate(zip(faces.ids, faces.boxes)):
+            faceId = int(faceId)
+            crop = _crop(frame, box)
+            if crop is None:
+                continue
+            crops[faceId] = crop
+            thumbs[faceId] = thumb = _thumb(crop)
+            old = self.thumbs.get(faceId)
+            if (old is None or self.age.get(faceId, 0) >= self.maxAge
+                    or np.abs(thumb - old).mean() > self.changeThreshold):
+                stale.append(i)
+        return stale, crops, thumbs
+
+    def _classify(self, frame, rects):
+        """Raw score vectors for face rectangles, in one detect_emotions batch; None where FER failed."""
+        start = time.perf_counter()
+        results = self.fer.detect_emotions(frame, face_rectangles=rects)
+        self.classifyTime += time.perf_counter() - start
+        self.classifyCount += 1
+        self.classifiedFaces += len(rects)
+
+        # detect_emotions skips crops it can't resize; match results back by box
+        byBox = {tuple(int(v) for v in r["box"]): r["emotions"] for r in results}
+        out = []
+        for rect in rects:
+            emotions = byBox.get(rect)
+            if emotions is not None and self.labels is None:
+                self.labels = list(emotions)
+            out.append(None if emotions is None else np.array([emotions[k] for k in self.labels], np.float32))
+        return out
+
+    def _score(self, frame, faces, stale, crops, thumbs):
+        raws = {}
+        misses = []
+        hits = set()
+        for i in stale:
+            faceId = int(faces.ids[i])
+            key = dHash(crops[faceId]) if self.cache is not None else None
+            # Only faces without scores may come from the cache; aged and
+            # changed faces are what the refresh is for
+            raw = self.cache.get(key) if key is not None and faceId not in self.scores else None
+            if raw is None:
+                misses.append((i, key))
+            else:
+                raws[i] = raw
+                hits.add(i)
+
+        if misses:
+            rects = [tuple(int(v) for v in faces.boxes[i]) for i, _ in misses]
+            for (i, key), raw in zip(misses, self._classify(frame, rects)):
+                if raw is None:
+                    continue
+                raws[i] = raw
+                if key is not None:
+                    self.cache.put(key, raw)
+
+        for i, raw in raws.items():
+            faceId = int(faces.ids[i])
+            prev = self.scores.get(faceId)
+            self.scores[faceId] = raw if prev is None else self.alpha * raw + (1 - self.alpha) * prev
+            self.thumbs[faceId] = thumbs[faceId]
+            if i in hits:
+                # A new face; its age starts now, but a hit never refreshes it
+                self.age.setdefault(faceId, 0)
+            else:
+                self.age[faceId] = 0
+
+    def process(self, frame):
+        faces = self.faces.process(frame)
+        for faceId in self.faces.removed:
+            for state in (self.scores, self.thumbs, self.age):
+                state.pop(int(faceId), None)
+        for faceId in self.age:
+            self.age[faceId] += 1
+
+        stale, crops, thumbs = self._stale(frame, faces)
+        if stale:
+            self._score(frame, faces, stale, crops, thumbs)
+
+        out = []
+        for faceId, box in zip(faces.ids, faces.boxes):
+            scores = self.scores.get(int(faceId))
+            if scores is None:
+                continue
+            emotions = {k: round(float(v), 2) for k, v in zip(self.labels, scores)}
+            out.append({"id": int(faceId), "box": [int(v) for v in box], "emotions": emotions})
+        return out
+
+    @property
+    def facesPerPass(self):
+        return self.classifiedFaces / self.classifyCount if self.classifyCount else 0.0
+
+    def summary(self):
+        ms = self.classifyTime / self.classifyCount * 1000 if self.classifyCount else 0.0
+        text = (f"{self.classifyCount} emotion passes over {self.faces.frameIndex} frames, "
+                f"{self.facesPerPass:.1f} faces/pass, {ms:.1f} ms/pass")
+        if self.cache is not None:
+            text += f" | {self.cache.summary()}"
+        return text
+
+
+# One FER per worker process, created by initWorker so the networks load
+# once per process instead of once per chunk
+_workerFer = None
+
+
+def initWorker(mtcnn=True):
+    global _workerFer
+    _workerFer = loadFer(mtcnn)
+
+
+def analyzeChunk(path, start, end, fps, stride=1, interval=10):
+    """
+    Runs an EmotionEngine over frames [start, end) of a video, every
+    `stride`-th frame, in a worker set up by initWorker.
+
+    Returns {second: [frames, face detections, score sums]} so chunks can
+    be merged into a timeline in any order. The engine is fresh per chunk,
+    since chunks aren't contiguous in one worker, but the FER networks are
+    reused.
+    """
+    engine = EmotionEngine(_workerFer, interval=max(1, interval // stride), cache=False)
+    cap = cv2.VideoCapture(path)
+    if start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+    seconds = {}
+    index = start
+    while end is None or index < end:
+        # grab() skips the colour conversion and copy of frames stride leaves out
+        if (index - start) % stride:
+            if not cap.grab():
+                break
+            index += 1
+            continue
+        ret, frame = cap.read()
+        if not ret:
+            break
+        faces = engine.process(frame)
+        second = int(index / fps) if fps else 0
+        entry = seconds.setdefault(second, [0, 0, None])
+        entry[0] += 1
+        for face in faces:
+            scores = np.array(list(face["emotions"].values()), np.float64)
+            entry[1] += 1
+            entry[2] = scores if entry[2] is None else entry[2] + scores
+        index += 1
+    cap.release()
+    return seconds, engine.labels
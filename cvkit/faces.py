@@ -0,0 +1,213 @@
+import collections
+import time
+
+import cv2
+import numpy as np
+
+from .tracking import ObjectTracker
+
+
+HAAR_FRONTAL = cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+
+# boxes: (N, 4) int32 x, y, w, h in full-frame pixels (detectMultiScale layout)
+# ids: (N,) int32 face IDs, stable while a face stays tracked
+Faces = collections.namedtuple("Faces", ["boxes", "ids"])
+
+
+def emptyFaces():
+    return Faces(np.zeros((0, 4), np.int32), np.zeros(0, np.int32))
+
+
+def _xyxy(boxes):
+    boxes = np.asarray(boxes, np.float32).reshape(-1, 4)
+    return np.column_stack([boxes[:, :2], boxes[:, :2] + boxes[:, 2:]])
+
+
+def clipBoxes(boxes, shape, minSize=1):
+    """
+    x, y, w, h `boxes` clipped to an image of `shape`, and a bool mask of
+    the ones still at least `minSize` pixels wide and high; (clipped[mask], mask).
+    """
+    boxes = np.asarray(boxes, np.int32).reshape(-1, 4)
+    H, W = shape[:2]
+    x1 = np.clip(boxes[:, 0], 0, W)
+    y1 = np.clip(boxes[:, 1], 0, H)
+    x2 = np.clip(boxes[:, 0] + boxes[:, 2], 0, W)
+    y2 = np.clip(boxes[:, 1] + boxes[:, 3], 0, H)
+    clipped = np.column_stack([x1, y1, x2 - x1, y2 - y1]).astype(np.int32)
+    keep = (clipped[:, 2] >= minSize) & (clipped[:, 3] >= minSize)
+    return clipped[keep], keep
+
+
+class TemplateTracker:
+    """
+    Follows boxes between detections by template matching.
+
+    reset() clips each box to the frame and stores its patch as a template;
+    boxes left smaller than `minSize` pixels, e.g. a face mostly off the
+    edge, are dropped. update() searches for each template in a window
+    around the previous position, padded by `searchPad` of the box size,
+    with normalized cross-correlation. A box whose best match scores below
+    `minScore` is reported lost.
+    """
+
+    def __init__(self, searchPad=0.5, minScore=0.5, minSize=8):
+        self.searchPad = searchPad
+        self.minScore = minScore
+        self.minSize = minSize
+        self.boxes = np.zeros((0, 4), np.int32)
+        self.templates = []
+
+    def reset(self, gray, boxes):
+        """Starts tracking `boxes` in `gray`; returns a bool mask of the ones kept."""
+        self.boxes, keep = clipBoxes(boxes, gray.shape, self.minSize)
+        self.templates = [gray[y:y + h, x:x + w].copy() for x, y, w, h in self.boxes]
+        return keep
+
+    def update(self, gray):
+        """Moves the boxes to `gray`; returns a bool mask of the ones still found."""
+        H, W = gray.shape[:2]
+        found = np.zeros(len(self.boxes), bool)
+        for i, (x, y, w, h) in enumerate(self.boxes):
+            px, py = int(w * self.searchPad), int(h * self.searchPad)
+            x1, y1 = max(x - px, 0), max(y - py, 0)
+            x2, y2 = min(x + w + px, W), min(y + h + py, H)
+            # Boxes stay inside the frame they were clipped to; a frame of another size may not hold them
+            th, tw = self.templates[i].shape[:2]
+            if x2 - x1 < tw or y2 - y1 < th:
+                continue
+            res = cv2.matchTemplate(gray[y1:y2, x1:x2], self.templates[i], cv2.TM_CCOEFF_NORMED)
+            _, score, _, (mx, my) = cv2.minMaxLoc(res)
+            if score >= self.minScore:
+                self.boxes[i, :2] = (x1 + mx, y1 + my)
+                found[i] = True
+        return found
+
+
+class FaceEngine:
+    """
+    Haar face detection on a downscaled frame, re-run every `interval`
+    frames, with template tracking in between and stable face IDs.
+
+    The cascade runs on the grayscale frame resized by `scale`, with
+    `minSize`/`maxSize` (full-frame pixels) bounding the pyramid so it
+    doesn't scan scales no face can have. Tracking runs at the same reduced
+    size. On each detection, an ObjectTracker matches the new boxes to the
+    tracked faces by IoU and centre distance, so a face keeps its ID. A
+    tracked face the cascade misses survives up to `maxMissed` detections
+    as long as its template is still found.
+
+    `detector`, if given, replaces the cascade: a callable taking the
+    full-size BGR frame and returning x, y, w, h face boxes in its pixels
+    (e.g. FER's MTCNN find_faces). Tracking still runs on the reduced frame.
+
+    Usage:
+        engine = FaceEngine(scale=0.5, interval=5)
+        faces = engine.process(frame)
+        for (x, y, w, h), faceId in zip(faces.boxes, faces.ids):
+            ...
+    """
+
+    def __init__(self, cascade=HAAR_FRONTAL, scale=0.5, interval=5, minSize=(40, 40), maxSize=None,
+                 scaleFactor=1.1, minNeighbors=5, searchPad=0.5, minScore=0.5, matchIou=0.3, maxMissed=1,
+                 detector=None):
+        self.detector = detector
+        if detector is None:
+            self.cascade = cv2.CascadeClassifier(cascade)
+            if self.cascade.empty():
+                raise IOError(f"Could not load Haar cascade {cascade}")
+        self.scale = scale
+        self.interval = max(1, interval)
+        self.minSize = minSize
+        self.maxSize = maxSize
+        self.scaleFactor = scaleFactor
+        self.minNeighbors = minNeighbors
+        self.tracker = TemplateTracker(searchPad, minScore)
+        self.idTracker = ObjectTracker(iouThreshold=matchIou, maxMissed=maxMissed)
+
+        self.ids = np.zeros(0, np.int32)
+        self.removed = np.zeros(0, np.int32)    # IDs whose faces left on this frame
+        self.frameIndex = 0
+        self.detectCount = 0
+        self.detectTime = 0.0
+        self.trackTime = 0.0
+
+    @property
+    def count(self):
+        return len(self.ids)
+
+    @property
+    def nextId(self):
+        """Number of distinct IDs handed out so far."""
+        return self.idTracker.nextId
+
+    def _small(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        if self.scale != 1.0:
+            gray = cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        return gray
+
+    def detect(self, small):
+        """Raw cascade boxes on the reduced image, (N, 4) int32 x, y, w, h."""
+        s = self.scale
+        kwargs = dict(scaleFactor=self.scaleFactor, minNeighbors=self.minNeighbors,
+                      minSize=(max(1, int(self.minSize[0] * s)), max(1, int(self.minSize[1] * s))))
+        if self.maxSize:
+            kwargs["maxSize"] = (int(self.maxSize[0] * s), int(self.maxSize[1] * s))
+        boxes = self.cascade.detectMultiScale(small, **kwargs)
+        return np.asarray(boxes, np.int32).reshape(-1, 4)
+
+    def _assign(self, small, boxes, found):
+        """Matches fresh detections to tracked faces and carries IDs over."""
+        # Match against where the templates say the faces are now
+        tracked = self.tracker.boxes
+        self.idTracker.move(self.ids[found], _xyxy(tracked[found]))
+        # Faces cut by the frame edge are tracked by their visible part; slivers are dropped
+        boxes, _ = clipBoxes(boxes, small.shape, self.tracker.minSize)
+        ids = self.idTracker.update(_xyxy(boxes))
+        self.removed = self.idTracker.removed
+
+        # Keep faces the cascade missed this time if the ID tracker still holds them
+        # and the template is still found
+        keep = found & np.isin(self.ids, self.idTracker.ids) & ~np.isin(self.ids, ids)
+        boxes = np.concatenate([boxes, tracked[keep]])
+        ids = np.concatenate([ids, self.ids[keep]])
+        self.ids = ids[self.tracker.reset(small, boxes)]
+
+    def process(self, frame):
+        """Returns Faces for `frame`, detected or tracked."""
+        small = self._small(frame)
+
+        start = time.perf_counter()
+        found = self.tracker.update(small)
+        if self.frameIndex % self.interval == 0:
+            self.trackTime += time.perf_counter() - start
+            start = time.perf_counter()
+            if self.detector is None:
+                boxes = self.detect(small)
+            else:
+                boxes = np.asarray(self.detector(frame), np.float32).reshape(-1, 4)
+                boxes = np.round(boxes * self.scale).astype(np.int32)
+            self._assign(small, boxes, found)
+            self.detectTime += time.perf_counter() - start
+            self.detectCount += 1
+        else:
+            self.tracker.boxes = self.tracker.boxes[found]
+            self.tracker.templates = [t for t, f in zip(self.tracker.templates, found) if f]
+            self.ids = self.ids[found]
+            self.removed = np.zeros(0, np.int32)
+            self.trackTime += time.perf_counter() - start
+
+        self.frameIndex += 1
+        if not len(self.ids):
+            return emptyFaces()
+        boxes = np.round(self.tracker.boxes / self.scale).astype(np.int32)
+        return Faces(boxes, self.ids.copy())
+
+
+def drawFaces(img, faces, color=(0, 255, 0), label="Face"):
+    for (x, y, w, h), faceId in zip(faces.boxes, faces.ids):
+        cv2.rectangle(img, (x, y), (x + w, y + h), color, 2)
+        if label:
+            cv2.putText(img, f"{label} {faceId}", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+    return img
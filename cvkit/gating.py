@@ -0,0 +1,164 @@
+import time
+
+import numpy as np
+
+from .detection import Detections, emptyDetections
+from .motion import MotionEngine
+
+
+class MotionGate:
+    """
+    Decides per frame whether an expensive detector needs to run.
+
+    Frame differencing (a MotionEngine, "frame_diff" by default) runs on a
+    downscaled copy of every frame, which costs a fraction of a millisecond.
+    The detector is only worth running when:
+
+      - there is motion (at least `minArea` pixels of changed regions),
+      - motion stopped less than `holdFrames` frames ago, so the detector
+        still sees an object that has just come to rest, or
+      - `keepAlive` seconds have passed since the last run, so a static
+        scene (someone sitting still) is still re-checked now and then.
+
+    Usage:
+        gate = MotionGate(keepAlive=10)
+        if gate.check(frame):
+            dets = detector(frame)      # otherwise keep the previous result
+        gate.boxes                      # motion regions of this frame
+    """
+
+    def __init__(self, engine=None, keepAlive=10.0, holdFrames=5, minArea=500, level=2, threshold=25):
+        self.engine = engine or MotionEngine("frame_diff", level=level, threshold=threshold,
+                                             minArea=minArea, blur=3, dilate=2)
+        self.keepAlive = keepAlive
+        self.holdFrames = holdFrames
+
+        self.boxes = None          # (N, 4) x, y, w, h motion regions of the last frame
+        self.reason = None         # "motion", "hold", "keepalive", or None when skipped
+        self.idle = holdFrames     # Frames since motion was last seen
+        self.lastRun = None
+        self.frames = 0
+        self.runs = 0
+
+    def check(self, frame):
+        """Updates the motion model with `frame`; True if the detector should run on it."""
+        self.frames += 1
+        self.boxes = self.engine.apply(frame)
+        now = time.monotonic()
+
+        if len(self.boxes):
+            self.idle = 0
+            self.reason = "motion"
+        else:
+            self.idle += 1
+            if self.idle <= self.holdFrames:
+                self.reason = "hold"
+            elif self.lastRun is None or now - self.lastRun >= self.keepAlive:
+                self.reason = "keepalive"
+            else:
+                self.reason = None
+
+        if self.reason is None:
+            return False
+        self.lastRun = now
+        self.runs += 1
+        return True
+
+    @property
+    def dutyCycle(self):
+        """Fraction of frames the detector actually ran on."""
+        return self.runs / self.frames if self.frames else 0.0
+
+    def summary(self):
+        return f"detector ran on {self.runs}/{self.frames} frames ({self.dutyCycle:.0%})"
+
+
+def _expandBox(box, pad, minSize, w, h):
+    """
+    Pads an x1, y1, x2, y2 box into a square of at least minSize (square, so
+    the detector's resize doesn't distort it) and shifts it inside the frame.
+    """
+    x1, y1, x2, y2 = box
+    side = max((x2 - x1) * (1 + 2 * pad), (y2 - y1) * (1 + 2 * pad), minSize)
+    sw, sh = min(side, w), min(side, h)
+    cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+    nx1 = int(np.clip(cx - sw / 2, 0, w - sw))
+    ny1 = int(np.clip(cy - sh / 2, 0, h - sh))
+    return np.array([nx1, ny1, nx1 + int(sw), ny1 + int(sh)], np.int32)
+
+
+def _overlaps(rois):
+    """Upper-triangle boolean matrix of which x1, y1, x2, y2 boxes intersect."""
+    x1 = np.maximum(rois[:, None, 0], rois[None, :, 0])
+    y1 = np.maximum(rois[:, None, 1], rois[None, :, 1])
+    x2 = np.minimum(rois[:, None, 2], rois[None, :, 2])
+    y2 = np.minimum(rois[:, None, 3], rois[None, :, 3])
+    return np.triu((x2 > x1) & (y2 > y1), k=1)
+
+
+def mergeRegions(boxes, shape, pad=0.25, minSize=300, maxRegions=3, maxCoverage=0.6):
+    """
+    Turns motion boxes into a few padded, non-overlapping crops for a detector.
+
+    `boxes` are (N, 4) x, y, w, h motion regions (MotionEngine/MotionGate
+    output) and `shape` the frame shape. Each box is padded by `pad` of its
+    size on every side and grown to at least `minSize` pixels (the detector's
+    input size, so small regions aren't upscaled). Overlapping crops are
+    merged, then the closest pairs are merged until at most `maxRegions`
+    remain.
+
+    Returns (M, 4) int32 x1, y1, x2, y2 crops, or None when the crops would
+    cover more than `maxCoverage` of the frame and a single full-frame pass
+    is cheaper.
+    """
+    h, w = shape[:2]
+    if len(boxes) == 0:
+        return np.zeros((0, 4), np.int32)
+
+    xyxy = np.column_stack([boxes[:, :2], boxes[:, :2] + boxes[:, 2:]])
+    rois = np.array([_expandBox(b, pad, minSize, w, h) for b in xyxy], np.int32)
+
+    def merge(i, j):
+        union = np.concatenate([np.minimum(rois[i, :2], rois[j, :2]), np.maximum(rois[i, 2:], rois[j, 2:])])
+        merged = _expandBox(union, 0, minSize, w, h)
+        return np.vstack([np.delete(rois, [i, j], axis=0), merged])
+
+    while len(rois) > 1:
+        pairs = np.argwhere(_overlaps(rois))
+        if len(pairs):
+            rois = merge(*pairs[0])
+            continue
+        if len(rois) <= maxRegions:
+            break
+        # Merge the pair whose union adds the least area
+        area = (rois[:, 2] - rois[:, 0]) * (rois[:, 3] - rois[:, 1])
+        ux1 = np.minimum(rois[:, None, 0], rois[None, :, 0])
+        uy1 = np.minimum(rois[:, None, 1], rois[None, :, 1])
+        ux2 = np.maximum(rois[:, None, 2], rois[None, :, 2])
+        uy2 = np.maximum(rois[:, None, 3], rois[None, :, 3])
+        cost = (ux2 - ux1) * (uy2 - uy1) - area[:, None] - area[None, :]
+        cost[np.tril_indices(len(rois))] = np.iinfo(cost.dtype).max
+        rois = merge(*np.unravel_index(np.argmin(cost), cost.shape))
+
+    area = ((rois[:, 2] - rois[:, 0]) * (rois[:, 3] - rois[:, 1])).sum()
+    if area > maxCoverage * w * h:
+        return None
+    return rois
+
+
+def detectRegions(frame, regions, detect, scale=1.0):
+    """
+    Runs `detect(crop)` on each x1, y1, x2, y2 region of `frame` and maps the
+    Detections back to frame coordinates, multiplied by `scale` (e.g. to
+    draw on a resized display copy). `detect` gets a crop view and returns
+    Detections in crop pixels.
+    """
+    parts = []
+    for x1, y1, x2, y2 in regions:
+        dets = detect(frame[y1:y2, x1:x2])
+        if len(dets.boxes):
+            offset = np.array([x1, y1, x1, y1], np.float32)
+            parts.append(Detections((dets.boxes + offset) * scale, dets.scores, dets.classIds))
+    if not parts:
+        return emptyDetections()
+    return Detections(*(np.concatenate(field) for field in zip(*parts)))
@@ -0,0 +1,308 @@
+import importlib
+import math
+import threading
+
+import cv2
+import numpy as np
+
+
+_mpLock = threading.Lock()
+_mp = None
+
+
+def loadMediapipe():
+    """Imports mediapipe on first call and returns the module."""
+    global _mp
+    with _mpLock:
+        if _mp is None:
+            _mp = importlib.import_module("mediapipe")
+    return _mp
+
+
+class handDetector():
+    """
+    MediaPipe hand landmark detector.
+
+    MediaPipe is only imported, and its graph only built, on first use. Pass
+    preload=True to do that on a background thread while the camera opens.
+
+    With roiTracking=True, once a hand is found the next frames only run
+    inference on a padded crop around it (roiPad is the padding as a
+    fraction of the hand size). Landmarks are mapped back to full-frame
+    coordinates, so findPosition() and drawing work unchanged. The crop
+    stays put while its graph tracks the hand in it, so that graph's
+    tracking state always refers to the same pixels; each graph is reset
+    when it takes over from the other or the crop moves. The full frame is
+    searched again, and the crop re-centred, when the crop loses the hand,
+    when the hand has used up half the padding on a side, and every
+    roiRefresh frames.
+    """
+
+    def __init__(self, mode=False, maxHands=2, detectionCon=0.5, trackCon=0.5, preload=False,
+                 roiTracking=False, roiPad=0.5, roiMinSize=96, roiRefresh=30):
+        self.mode = mode
+        self.maxHands = maxHands
+        self.detectionCon = detectionCon
+        self.trackCon = trackCon
+
+        self.roiTracking = roiTracking
+        self.roiPad = roiPad
+        self.roiMinSize = roiMinSize
+        self.roiRefresh = roiRefresh
+        self.roi = None           # x0, y0, x1, y1 to search in the next frame
+        self.roiFrames = 0        # Consecutive frames served from the crop
+
+        self._hands = None
+        self._roiHands = None
+        self._handsLock = threading.Lock()
+        self.tipIds = [4, 8, 12, 16, 20]
+        self.results = None
+        self.lmList = []
+        self.lmArray = np.zeros((0, 21, 3), np.float32)
+
+        if preload:
+            self.preload()
+
+    @property
+    def mpHands(self):
+        return loadMediapipe().solutions.hands
+
+    @property
+    def mpDraw(self):
+        return loadMediapipe().solutions.drawing_utils
+
+    def _newGraph(self):
+        return self.mpHands.Hands(
+            static_image_mode=self.mode,
+            max_num_hands=self.maxHands,
+            min_detection_confidence=self.detectionCon,
+            min_tracking_confidence=self.trackCon
+        )
+
+    @property
+    def hands(self):
+        # Built lazily; the lock makes a background preload and the first
+        # findHands() call share the same graph
+        with self._handsLock:
+            if self._hands is None:
+                self._hands = self._newGraph()
+        return self._hands
+
+    @property
+    def roiHands(self):
+        # Crops get their own graph so MediaPipe's frame-to-frame tracking
+        # state never mixes crop and full-frame coordinates; it is reset
+        # whenever the crop moves
+        with self._handsLock:
+            if self._roiHands is None:
+                self._roiHands = self._newGraph()
+        return self._roiHands
+
+    def preload(self):
+        """Imports MediaPipe and builds the graph on a background thread."""
+        def build():
+            self.hands
+            if self.roiTracking:
+                self.roiHands
+        threading.Thread(target=build, daemon=True).start()
+        return self
+
+    def findHands(self, img, draw=True):
+        if self.roiTracking:
+            self.results = self._processTracked(img)
+        else:
+            imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            self.results = self.hands.process(imgRGB)
+
+        if draw:
+            self.drawHands(img)
+        return img
+
+    def drawHands(self, img):
+        """Draws the landmarks from the last findHands() call, e.g. on a frame that was skipped."""
+        if self.results and self.results.multi_hand_landmarks:
+            for handLms in self.results.multi_hand_landmarks:
+                self.mpDraw.draw_landmarks(img, handLms, self.mpHands.HAND_CONNECTIONS)
+        return img
+
+    def _processTracked(self, img):
+        h, w = img.shape[:2]
+        if self.roi is not None and self.roiFrames < self.roiRefresh:
+            x0, y0, x1, y1 = self.roi
+            crop = cv2.cvtColor(img[y0:y1, x0:x1], cv2.COLOR_BGR2RGB)
+            results = self.roiHands.process(crop)
+            if results.multi_hand_landmarks:
+                sx, sy = (x1 - x0) / w, (y1 - y0) / h
+                ox, oy = x0 / w, y0 / h
+                for handLms in results.multi_hand_landmarks:
+                    for lm in handLms.landmark:
+                        lm.x = lm.x * sx + ox
+                        lm.y = lm.y * sy + oy
+                        lm.z = lm.z * sx
+                self.roiFrames += 1
+                if self._nearEdge(self._handBox(results, w, h), w, h):
+                    self.roiFrames = self.roiRefresh
+                return results
+
+        # No previous hand, hand lost in the crop, hand near its edge, or time for a refresh
+        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        if self.roiFrames:
+            # The full-frame graph last saw the hand before the crop took over
+            self.hands.reset()
+        results = self.hands.process(imgRGB)
+        self.roiFrames = 0
+        roi = self._nextRoi(results, w, h)
+        if roi != self.roi and self._roiHands is not None:
+            self._roiHands.reset()
+        self.roi = roi
+        return results
+
+    @staticmethod
+    def _handBox(results, w, h):
+        """xmin, ymin, xmax, ymax in pixels around all detected hands."""
+        pts = np.array([(lm.x, lm.y) for handLms in results.multi_hand_landmarks
+                        for lm in handLms.landmark], np.float32) * (w, h)
+        (xmin, ymin), (xmax, ymax) = pts.min(axis=0), pts.max(axis=0)
+        return xmin, ymin, xmax, ymax
+
+    def _nearEdge(self, box, w, h):
+        """Whether the hand has used up half the crop's padding on a side that isn't the frame border."""
+        x0, y0, x1, y1 = self.roi
+        xmin, ymin, xmax, ymax = box
+        margin = 0.5 * self.roiPad * max(xmax - xmin, ymax - ymin)
+        return ((x0 > 0 and xmin - x0 < margin) or (y0 > 0 and ymin - y0 < margin)
+                or (x1 < w and x1 - xmax < margin) or (y1 < h and y1 - ymax < margin))
+
+    def _nextRoi(self, results, w, h):
+        """Padded square around all detected hands, or None to search the full frame."""
+        if not results.multi_hand_landmarks:
+            return None
+
+        xmin, ymin, xmax, ymax = self._handBox(results, w, h)
+        cx, cy = (xmin + xmax) / 2, (ymin + ymax) / 2
+        side = max(xmax - xmin, ymax - ymin) * (1 + 2 * self.roiPad)
+        side = max(side, self.roiMinSize)
+
+        x0, y0 = int(max(cx - side / 2, 0)), int(max(cy - side / 2, 0))
+        x1, y1 = int(min(cx + side / 2, w)), int(min(cy + side / 2, h))
+        # Cropping most of the frame saves nothing
+        if (x1 - x0) * (y1 - y0) > 0.5 * w * h or x1 <= x0 or y1 <= y0:
+            return None
+        return x0, y0, x1, y1
+
+    def findPosition(self, img, handNo=0, draw=True):
+        xList = []
+        yList = []
+        bbox = []
+        self.lmList = []
+
+        if self.results.multi_hand_landmarks:
+            myHand = self.results.multi_hand_landmarks[handNo]
+            h, w, c = img.shape
+            for id, lm in enumerate(myHand.landmark):
+                cx, cy = int(lm.x * w), int(lm.y * h)
+                xList.append(cx)
+                yList.append(cy)
+                self.lmList.append([id, cx, cy])
+                if draw:
+                    cv2.circle(img, (cx, cy), 5, (255, 0, 255), cv2.FILLED)
+
+            xmin, xmax = min(xList), max(xList)
+            ymin, ymax = min(yList), max(yList)
+            bbox = xmin, ymin, xmax, ymax
+
+            if draw:
+                cv2.rectangle(img, (bbox[0] - 20, bbox[1] - 20),
+                              (bbox[2] + 20, bbox[3] + 20), (0, 255, 0), 2)
+
+        return self.lmList, bbox
+
+    def fingersUp(self):
+        fingers = []
+        if not self.lmList:
+            return fingers
+
+        # Thumb
+        if self.lmList[self.tipIds[0]][1] > self.lmList[self.tipIds[0] - 1][1]:
+            fingers.append(1)
+        else:
+            fingers.append(0)
+
+        # Other fingers
+        for id in range(1, 5):
+            if self.lmList[self.tipIds[id]][2] < self.lmList[self.tipIds[id] - 2][2]:
+                fingers.append(1)
+            else:
+                fingers.append(0)
+
+        return fingers
+
+    def findDistance(self, p1, p2, img, draw=True):
+        x1, y1 = self.lmList[p1][1], self.lmList[p1][2]
+        x2, y2 = self.lmList[p2][1], self.lmList[p2][2]
+        cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+
+        if draw:
+            cv2.circle(img, (x1, y1), 15, (255, 0, 255), cv2.FILLED)
+            cv2.circle(img, (x2, y2), 15, (255, 0, 255), cv2.FILLED)
+            cv2.line(img, (x1, y1), (x2, y2), (255, 0, 255), 3)
+            cv2.circle(img, (cx, cy), 15, (255, 0, 255), cv2.FILLED)
+
+        length = math.hypot(x2 - x1, y2 - y1)
+        return length, img, [x1, y1, x2, y2, cx, cy]
+
+    def findPositions(self, img, draw=False):
+        """
+        Returns every detected hand as one (n_hands, 21, 3) float32 array of
+        (x, y, z) landmarks. x and y are in pixels, z keeps MediaPipe's
+        relative depth scaled like x.
+        """
+        hands = self.results.multi_hand_landmarks if self.results else None
+        if not hands:
+            self.lmArray = np.zeros((0, 21, 3), np.float32)
+            return self.lmArray
+
+        h, w = img.shape[:2]
+        self.lmArray = np.array(
+            [[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in hands],
+            dtype=np.float32
+        )
+        self.lmArray *= np.array([w, h, w], np.float32)
+
+        if draw:
+            for cx, cy in self.lmArray[:, :, :2].reshape(-1, 2).astype(np.int32):
+                cv2.circle(img, (int(cx), int(cy)), 5, (255, 0, 255), cv2.FILLED)
+        return self.lmArray
+
+
+def fingersUpArray(lmArray, tipIds=(4, 8, 12, 16, 20)):
+    """
+    Batched fingersUp() for a (n_hands, 21, 3) landmark array.
+    Returns an (n_hands, 5) uint8 array of 1 (up) / 0 (down). Positions are
+    compared unrounded, so it can only disagree with fingersUp() when two
+    landmarks fall within the same pixel.
+    """
+    tips = np.asarray(tipIds)
+    # Thumb compares x against the joint below, the rest compare y two joints down
+    thumb = lmArray[:, tips[0], 0] > lmArray[:, tips[0] - 1, 0]
+    others = lmArray[:, tips[1:], 1] < lmArray[:, tips[1:] - 2, 1]
+    return np.column_stack([thumb, others]).astype(np.uint8)
+
+
+def distanceArray(lmArray, p1, p2):
+    """Distance in pixels between landmarks p1 and p2 for every hand."""
+    diff = lmArray[:, p2, :2] - lmArray[:, p1, :2]
+    return np.hypot(diff[:, 0], diff[:, 1])
+
+
+def pairwiseDistanceArray(lmArray, ids=(4, 8, 12, 16, 20)):
+    """(n_hands, len(ids), len(ids)) matrix of distances between the given landmarks."""
+    pts = lmArray[:, list(ids), :2]
+    diff = pts[:, :, None, :] - pts[:, None, :, :]
+    return np.sqrt((diff ** 2).sum(axis=-1))
+
+
+def bboxArray(lmArray):
+    """(n_hands, 4) int32 array of xmin, ymin, xmax, ymax per hand."""
+    xy = lmArray[:, :, :2]
+    return np.concatenate([xy.min(axis=1), xy.max(axis=1)], axis=1).astype(np.int32)
@@ -0,0 +1,169 @@
+import collections
+import csv
+import os
+import time
+
+import numpy as np
+
+
+def _writeAtomic(path, text):
+    # Write then rename so a scraper never sees a half-written file
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class _Stage:
+    __slots__ = ("timings", "start")
+
+    def __init__(self, window):
+        self.timings = collections.deque(maxlen=window)
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timings.append(time.perf_counter() - self.start)
+
+
+class StageTimer:
+    """
+    Rolling per-stage timings plus an exponentially smoothed FPS.
+
+    Usage:
+        timer = StageTimer()
+        while True:
+            with timer.stage("read"):
+                frame = vs.read()
+            ...
+            timer.tick()        # once per frame
+    """
+
+    def __init__(self, window=120, alpha=0.1):
+        self.window = window
+        self.alpha = alpha
+        self.stages = collections.OrderedDict()
+        self.fps = 0.0
+        self.frames = 0
+        self.lastTick = None
+
+    def stage(self, name):
+        st = self.stages.get(name)
+        if st is None:
+            st = self.stages[name] = _Stage(self.window)
+        return st
+
+    def add(self, name, seconds):
+        """Records `seconds` for stage `name`, for work timed outside stage()."""
+        self.stage(name).timings.append(seconds)
+
+    def tick(self):
+        now = time.perf_counter()
+        if self.lastTick is not None:
+            instant = 1.0 / max(now - self.lastTick, 1e-9)
+            self.fps = instant if self.frames == 1 else self.alpha * instant + (1 - self.alpha) * self.fps
+        self.lastTick = now
+        self.frames += 1
+
+    def stats(self):
+        """{stage: (mean ms, p90 ms)} over the rolling window."""
+        out = collections.OrderedDict()
+        for name, st in self.stages.items():
+            if st.timings:
+                ms = np.fromiter(st.timings, np.float64) * 1000
+                out[name] = (float(ms.mean()), float(np.percentile(ms, 90)))
+        return out
+
+    def summary(self):
+        parts = [f"{name} {mean:.1f}" for name, (mean, _) in self.stats().items()]
+        return f"FPS {self.fps:.1f} | " + " ".join(parts) + " ms"
+
+
+class MetricsExporter:
+    """
+    Periodically writes StageTimer stats to a CSV file (one row per stage
+    per export) and/or a Prometheus text-format file, e.g. for
+    node_exporter's textfile collector.
+    """
+
+    def __init__(self, timer, csvPath=None, promPath=None, interval=5.0, prefix="cv"):
+        self.timer = timer
+        self.csvPath = csvPath
+        self.promPath = promPath
+        self.interval = interval
+        self.prefix = prefix
+        self.lastExport = time.monotonic()
+
+        if csvPath and not os.path.exists(csvPath):
+            with open(csvPath, "w", newline="") as f:
+                csv.writer(f).writerow(["timestamp", "stage", "mean_ms", "p90_ms", "fps"])
+
+    def maybeExport(self):
+        if time.monotonic() - self.lastExport >= self.interval:
+            self.export()
+
+    def export(self):
+        self.lastExport = time.monotonic()
+        stats = self.timer.stats()
+        if self.csvPath:
+            now = time.time()
+            with open(self.csvPath, "a", newline="") as f:
+                writer = csv.writer(f)
+                for name, (mean, p90) in stats.items():
+                    writer.writerow([f"{now:.3f}", name, f"{mean:.3f}", f"{p90:.3f}", f"{self.timer.fps:.2f}"])
+        if self.promPath:
+            p = self.prefix
+            lines = [
+                f"# TYPE {p}_fps gauge",
+                f"{p}_fps {self.timer.fps:.3f}",
+                f"# TYPE {p}_frames_total counter",
+                f"{p}_frames_total {self.timer.frames}",
+                f"# TYPE {p}_stage_seconds gauge",
+            ]
+            for name, (mean, p90) in stats.items():
+                lines.append(f'{p}_stage_seconds{{stage="{name}",stat="mean"}} {mean / 1000:.6f}')
+                lines.append(f'{p}_stage_seconds{{stage="{name}",stat="p90"}} {p90 / 1000:.6f}')
+            _writeAtomic(self.promPath, "\n".join(lines) + "\n")
+
+
+class StatsExporter:
+    """
+    Periodically writes a dict of numbers, from calling `statsFn`, as one
+    CSV row per export and/or as Prometheus gauges named `prefix_<key>`.
+    The CSV columns come from the keys of the first export.
+    """
+
+    def __init__(self, statsFn, csvPath=None, promPath=None, interval=60.0, prefix="cv"):
+        self.statsFn = statsFn
+        self.csvPath = csvPath
+        self.promPath = promPath
+        self.interval = interval
+        self.prefix = prefix
+        self.lastExport = time.monotonic()
+        self.header = None
+
+    def maybeExport(self):
+        if time.monotonic() - self.lastExport >= self.interval:
+            self.export()
+
+    def export(self):
+        self.lastExport = time.monotonic()
+        stats = self.statsFn()
+        if self.csvPath:
+            if self.header is None:
+                self.header = list(stats)
+                if not os.path.exists(self.csvPath):
+                    with open(self.csvPath, "w", newline="") as f:
+                        csv.writer(f).writerow(["timestamp"] + self.header)
+            with open(self.csvPath, "a", newline="") as f:
+                csv.writer(f).writerow([f"{time.time():.3f}"] + [stats.get(k, "") for k in self.header])
+        if self.promPath:
+            lines = []
+            for key, value in stats.items():
+                lines.append(f"# TYPE {self.prefix}_{key} gauge")
+                lines.append(f"{self.prefix}_{key} {value}")
+            _writeAtomic(self.promPath, "\n".join(lines) + "\n")
+        return stats
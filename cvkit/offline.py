@@ -0,0 +1,239 @@
+import collections
+import concurrent.futures
+import csv
+import importlib
+import json
+import os
+import shutil
+import subprocess
+
+import cv2
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp")
+
+
+def frameCount(path):
+    cap = cv2.VideoCapture(path)
+    count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+    cap.release()
+    return count, fps
+
+
+def listImages(directory):
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.lower().endswith(IMAGE_EXTENSIONS))
+
+
+def keyframeTimes(path):
+    """
+    Presentation times (seconds) of the video keyframes, read from packet
+    flags with ffprobe without decoding. None if ffprobe isn't installed or
+    can't read the file.
+    """
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe is None:
+        return None
+    cmd = [ffprobe, "-v", "error", "-select_streams", "v:0",
+           "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", path]
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    times = []
+    for line in out.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags and pts not in ("", "N/A"):
+            times.append(float(pts))
+    return sorted(times) or None
+
+
+def videoChunks(path, chunks, minFrames=1):
+    """
+    Splits a video into about `chunks` (start, end) frame ranges for
+    parallel decoding.
+
+    Boundaries are placed on keyframes when ffprobe can list them, so each
+    worker's seek lands exactly on a frame the decoder can start from
+    without decoding from an earlier keyframe. Otherwise the video is split
+    uniformly. Chunks are at least `minFrames` long.
+    """
+    total, fps = frameCount(path)
+    if total <= 0:
+        return [(0, None)]
+    target = max(minFrames, -(-total // max(1, chunks)))
+
+    starts = None
+    times = keyframeTimes(path) if fps else None
+    if times:
+        keys = sorted({min(total, int(round(t * fps))) for t in times} | {0})
+        starts = [0]
+        for k in keys:
+            if k - starts[-1] >= target and total - k >= minFrames:
+                starts.append(k)
+    if not starts or (len(starts) == 1 and total > target):
+        # No usable keyframe list (or a single keyframe): uniform split
+        starts = list(range(0, total, target))
+    return list(zip(starts, starts[1:] + [total]))
+
+
+def _decodeVideoRange(path, start, end):
+    cap = cv2.VideoCapture(path)
+    if start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    frames = []
+    while end is None or start + len(frames) < end:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def _decodeImages(paths):
+    return [cv2.imread(p) for p in paths]
+
+
+def _frameBytes(source, paths=None):
+    """Bytes of one decoded BGR frame of `source`, or None if unknown."""
+    if paths is not None:
+        img = cv2.imread(paths[0]) if paths else None
+        return img.nbytes if img is not None else None
+    cap = cv2.VideoCapture(source)
+    w, h = cap.get(cv2.CAP_PROP_FRAME_WIDTH), cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+    cap.release()
+    return int(w * h * 3) or None
+
+
+def _splitRanges(ranges, maxLen):
+    """Cuts (start, end) ranges longer than `maxLen` into equal pieces."""
+    out = []
+    for start, end in ranges:
+        pieces = max(1, -(-(end - start) // maxLen))
+        step = -(-(end - start) // pieces)
+        out.extend((s, min(s + step, end)) for s in range(start, end, step))
+    return out
+
+
+def iterFrames(source, workers=None, chunkSize=64, maxBytes=1 << 30):
+    """
+    Yields (index, name, frame) for a video file or a directory of images,
+    in order, with decoding spread over a process pool.
+
+    Videos are split with videoChunks into ranges of about `chunkSize`
+    frames that start on keyframes, so each worker's seek lands on a frame
+    it can decode from directly. Images are read `chunkSize` at a time.
+
+    Every decoded frame of a job is pickled back to this process, so jobs
+    are only submitted while the frames of all jobs in flight, including
+    the one being yielded, fit in `maxBytes` (1 GiB by default; at least
+    one job always runs). A range longer than its share of the budget, e.g.
+    from a long keyframe interval, is cut into smaller ranges at
+    non-keyframes, which then cost a decode from the previous keyframe.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    if os.path.isdir(source):
+        paths = listImages(source)
+        groups = [paths[i:i + chunkSize] for i in range(0, len(paths), chunkSize)]
+        jobs = [(_decodeImages, (group,), group, len(group)) for group in groups]
+        frameBytes = _frameBytes(source, paths)
+    else:
+        total, _ = frameCount(source)
+        if total <= 0:
+            # Container doesn't report a length, so it can't be split
+            yield from ((i, str(i), f) for i, f in enumerate(_decodeVideoRange(source, 0, None)))
+            return
+        frameBytes = _frameBytes(source)
+        ranges = videoChunks(source, -(-total // chunkSize))
+        if frameBytes:
+            ranges = _splitRanges(ranges, max(1, maxBytes // frameBytes // workers))
+        jobs = [(_decodeVideoRange, (source, start, end), None, end - start) for start, end in ranges]
+
+    budget = max(1, maxBytes // frameBytes) if frameBytes else 2 * workers * chunkSize
+
+    index = 0
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        pending = collections.deque()
+        inFlight = 0
+        nextJob = 0
+
+        def submit():
+            nonlocal inFlight, nextJob
+            while nextJob < len(jobs) and (not pending or inFlight + jobs[nextJob][3] <= budget):
+                fn, args, names, count = jobs[nextJob]
+                pending.append((pool.submit(fn, *args), names, count))
+                inFlight += count
+                nextJob += 1
+
+        submit()
+        while pending:
+            future, names, count = pending.popleft()
+            frames = future.result()
+            for i, frame in enumerate(frames):
+                name = names[i] if names else str(index)
+                if frame is not None:
+                    yield index, name, frame
+                index += 1
+            # Only count a job's frames as gone once they have all been handed out
+            del frames, future
+            inFlight -= count
+            submit()
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class RecordWriter:
+    """
+    Writes dict records to .jsonl or .csv (streamed) or .parquet (buffered,
+    needs pyarrow) depending on the file extension. CSV columns come from
+    the first record.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.format = os.path.splitext(path)[1].lower().lstrip(".")
+        if self.format not in ("jsonl", "csv", "parquet"):
+            raise ValueError(f"Unsupported output format: {path} (use .jsonl, .csv or .parquet)")
+        self.rows = []
+        self.csv = None
+        self.file = open(path, "w", newline="") if self.format in ("jsonl", "csv") else None
+        if self.format == "parquet":
+            # Fail before any work is done if pyarrow is missing
+            importlib.import_module("pyarrow.parquet")
+
+    def write(self, record):
+        if self.format == "csv":
+            if self.csv is None:
+                self.csv = csv.DictWriter(self.file, fieldnames=list(record))
+                self.csv.writeheader()
+            self.csv.writerow(record)
+        elif self.file is not None:
+            self.file.write(json.dumps(record) + "\n")
+        else:
+            self.rows.append(record)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+        else:
+            pa = importlib.import_module("pyarrow")
+            pq = importlib.import_module("pyarrow.parquet")
+            pq.write_table(pa.Table.from_pylist(self.rows), self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
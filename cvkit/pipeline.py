@@ -0,0 +1,196 @@
+import collections
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class LatencyHistogram:
+    """Log-spaced latency histogram in milliseconds (0.1 ms .. ~100 s)."""
+
+    def __init__(self, name, lowMs=0.1, highMs=100000.0, bucketsPerDecade=10):
+        self.name = name
+        decades = np.log10(highMs / lowMs)
+        self.edges = lowMs * np.logspace(0, decades, int(decades * bucketsPerDecade) + 1)
+        self.counts = np.zeros(len(self.edges) + 1, np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        ms = seconds * 1000.0
+        with self.lock:
+            self.counts[np.searchsorted(self.edges, ms)] += 1
+            self.count += 1
+            self.total += ms
+
+    def percentile(self, q):
+        """Upper edge of the bucket holding the q-th percentile, in ms."""
+        with self.lock:
+            if self.count == 0:
+                return 0.0
+            rank = np.searchsorted(np.cumsum(self.counts), q / 100.0 * self.count)
+        return float(self.edges[min(rank, len(self.edges) - 1)])
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        return (f"{self.name:<10} n={self.count:<6} mean={self.mean:7.1f} ms  "
+                f"p50={self.percentile(50):7.1f}  p90={self.percentile(90):7.1f}  "
+                f"p99={self.percentile(99):7.1f}")
+
+
+class StageQueue:
+    """
+    Bounded queue between pipeline stages.
+
+    policy="drop_oldest" never blocks the producer: when full, the oldest
+    item is discarded and counted in `dropped`. policy="block" makes the
+    producer wait for space, which is what you want for a video file where
+    every frame matters.
+    """
+
+    def __init__(self, maxsize=2, policy="drop_oldest"):
+        if policy not in ("drop_oldest", "block"):
+            raise ValueError(f"Unknown back-pressure policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.items = collections.deque()
+        self.cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self.cond:
+            if self.policy == "block":
+                self.cond.wait_for(lambda: len(self.items) < self.maxsize or self.closed)
+            if self.closed:
+                return False
+            if len(self.items) >= self.maxsize:
+                self.items.popleft()
+                self.dropped += 1
+            self.items.append(item)
+            self.cond.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """Returns the next item, or None once the queue is closed and empty."""
+        with self.cond:
+            self.cond.wait_for(lambda: self.items or self.closed, timeout)
+            if not self.items:
+                return None
+            item = self.items.popleft()
+            self.cond.notify_all()
+            return item
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+class Packet:
+    __slots__ = ("index", "timestamp", "frame", "result")
+
+    def __init__(self, index, timestamp, frame):
+        self.index = index
+        self.timestamp = timestamp    # time.monotonic() at capture
+        self.frame = frame
+        self.result = None
+
+
+class Pipeline:
+    """
+    Capture -> inference -> render, each stage on its own thread.
+
+    `source` is anything cv2.VideoCapture accepts (camera index, file,
+    stream URL). `infer(frame)` produces the result attached to each packet;
+    `render(packet)` runs on the thread that calls run() (so cv2.imshow
+    works everywhere) and returns False to stop.
+
+    Stages are joined by StageQueues using `policy` for back-pressure. Each
+    stage keeps a LatencyHistogram, plus one for end-to-end latency from
+    capture to render.
+    """
+
+    def __init__(self, source, infer, render, policy="drop_oldest", queueSize=2):
+        self.source = source
+        self.infer = infer
+        self.render = render
+        self.inferQueue = StageQueue(queueSize, policy)
+        self.renderQueue = StageQueue(queueSize, policy)
+        self.histograms = {name: LatencyHistogram(name)
+                           for name in ("capture", "infer", "render", "end2end")}
+        self.running = False
+        self.frames = 0
+        self.threads = []
+
+    def _capture(self):
+        cap = cv2.VideoCapture(self.source)
+        index = 0
+        try:
+            while self.running:
+                start = time.monotonic()
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                self.histograms["capture"].record(time.monotonic() - start)
+                if not self.inferQueue.put(Packet(index, start, frame)):
+                    break
+                index += 1
+        finally:
+            cap.release()
+            self.inferQueue.close()
+
+    def _inference(self):
+        try:
+            while True:
+                packet = self.inferQueue.get()
+                if packet is None:
+                    break
+                start = time.monotonic()
+                packet.result = self.infer(packet.frame)
+                self.histograms["infer"].record(time.monotonic() - start)
+                if not self.renderQueue.put(packet):
+                    break
+        finally:
+            self.renderQueue.close()
+
+    def run(self):
+        self.running = True
+        self.threads = [threading.Thread(target=self._capture, daemon=True),
+                        threading.Thread(target=self._inference, daemon=True)]
+        for t in self.threads:
+            t.start()
+        try:
+            while True:
+                packet = self.renderQueue.get()
+                if packet is None:
+                    break
+                start = time.monotonic()
+                keepGoing = self.render(packet)
+                end = time.monotonic()
+                self.histograms["render"].record(end - start)
+                self.histograms["end2end"].record(end - packet.timestamp)
+                self.frames += 1
+                if keepGoing is False:
+                    break
+        finally:
+            self.stop()
+            for t in self.threads:
+                t.join(timeout=5.0)
+        return self
+
+    def stop(self):
+        self.running = False
+        self.inferQueue.close()
+        self.renderQueue.close()
+
+    def report(self):
+        lines = [h.summary() for h in self.histograms.values()]
+        lines.append(f"dropped: infer queue {self.inferQueue.dropped}, "
+                     f"render queue {self.renderQueue.dropped}")
+        return "\n".join(lines)
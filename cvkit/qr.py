@@ -0,0 +1,247 @@
+import collections
+import time
+
+import cv2
+import numpy as np
+
+from .tracking import ObjectTracker
+
+
+# quads: (N, 4, 2) float32 corners in full-frame pixels, in the detector's
+# order (the top-left finder pattern first); data: list of N payload
+# strings, "" while a code hasn't been decoded; ids: (N,) int32 code IDs
+Codes = collections.namedtuple("Codes", ["quads", "data", "ids"])
+
+
+def emptyCodes():
+    return Codes(np.zeros((0, 4, 2), np.float32), [], np.zeros(0, np.int32))
+
+
+def _locator():
+    # The ArUco-based detector (OpenCV 4.8+) still finds codes at half
+    # resolution, where the classic one mostly doesn't
+    if hasattr(cv2, "QRCodeDetectorAruco"):
+        return cv2.QRCodeDetectorAruco()
+    return cv2.QRCodeDetector()
+
+
+def _side(quad):
+    return float(np.sqrt(cv2.contourArea(quad)))
+
+
+def quadKey(quad, grid=8):
+    """Hashable key of a quad, its corners snapped to a `grid` pixel grid."""
+    return tuple(np.round(quad.ravel() / grid).astype(int).tolist())
+
+
+class QrScanner:
+    """
+    Multi-code QR scanner that decodes each code once instead of on every
+    frame.
+
+    Codes are located with detectMulti on the grayscale frame resized by
+    `scale` (every `fullInterval` frames at full size instead, to pick up
+    codes too small for the reduced pass). An ObjectTracker matches the
+    quads to the codes of earlier frames. A tracked code keeps its payload
+    as long as, from one frame to the next, its corners move less than
+    `moveTolerance` of its side length and its rectified patch changes by
+    at most `changeThreshold` (mean grey-level difference of an 8x8
+    thumbnail). Otherwise, e.g. when the code jumps, its label is swapped or
+    the full-size pass places it a few pixels differently, the known
+    payload has to be confirmed by verify(): decode() at the quad the code
+    was last read at (or at the new one if it really moved), which skips
+    detection and costs about half a full decode.
+
+    Codes that appear, move or change are first looked up in a payload
+    cache keyed by the quad snapped to a `grid` pixel grid, and checked
+    against the cached thumbnail. That covers codes that were hidden for a
+    moment, e.g. by a hand. The thumbnail is too coarse to tell apart codes
+    with nearly the same payload, so a hit is likewise only trusted once
+    verify() reads the same payload. The rest are decoded one by one, with
+    detectAndDecodeMulti on a padded full-resolution crop around each quad.
+    A static shelf of codes therefore costs one reduced localization pass
+    per frame.
+
+    Usage:
+        scanner = QrScanner()
+        codes = scanner.scan(frame)
+        for quad, data in zip(codes.quads, codes.data):
+            ...
+    """
+
+    def __init__(self, scale=0.5, fullInterval=30, moveTolerance=0.1, changeThreshold=12.0, pad=0.2,
+                 grid=8, cacheSize=256, cacheTtl=60.0, maxMissed=2):
+        self.locator = _locator()
+        self.decoder = _locator()
+        self.scale = scale
+        self.fullInterval = fullInterval
+        self.moveTolerance = moveTolerance
+        self.changeThreshold = changeThreshold
+        self.pad = pad
+        self.grid = grid
+        self.cacheSize = cacheSize
+        self.cacheTtl = cacheTtl
+        self.tracker = ObjectTracker(iouThreshold=0.3, maxMissed=maxMissed)
+
+        self.codes = {}                         # code ID -> (quad, payload, thumbnail, read quad) when decoded
+        self.cache = collections.OrderedDict()  # quadKey -> (payload, thumbnail, read quad, time stored)
+        self.frameIndex = 0
+        self.decodeCount = 0
+        self.cacheHits = 0
+        self.verifyCount = 0
+        self.verifyTime = 0.0
+        self.locateTime = 0.0
+        self.decodeTime = 0.0
+
+    def locate(self, gray):
+        """Quads of the codes in `gray`, (N, 4, 2) float32 full-frame corners."""
+        scale = self.scale
+        if self.fullInterval and self.frameIndex % self.fullInterval == 0:
+            scale = 1.0
+        small = gray if scale == 1.0 else cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        ok, points = self.locator.detectMulti(small)
+        if not ok or points is None:
+            return np.zeros((0, 4, 2), np.float32)
+        return (points.reshape(-1, 4, 2) / scale).astype(np.float32)
+
+    @staticmethod
+    def _thumb(gray, quad, size=8):
+        # warpPerspective point-samples, which aliases on the module grid;
+        # rectify at about the code's own resolution and average down
+        big = size * max(1, int(np.ceil(_side(quad) / size)))
+        square = np.float32([[0, 0], [big, 0], [big, big], [0, big]])
+        M = cv2.getPerspectiveTransform(quad, square)
+        patch = cv2.warpPerspective(gray, M, (big, big), flags=cv2.INTER_LINEAR)
+        return cv2.resize(patch, (size, size), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    def _moved(self, quad, other):
+        return np.abs(quad - other).max() > self.moveTolerance * _side(other)
+
+    def _same(self, thumb, other):
+        return np.abs(thumb - other).mean() <= self.changeThreshold
+
+    def _cached(self, key, thumb, now):
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        payload, cachedThumb, readQuad, stored = entry
+        if now - stored >= self.cacheTtl or not self._same(thumb, cachedThumb):
+            del self.cache[key]
+            return None
+        self.cache.move_to_end(key)
+        return payload, readQuad
+
+    def _store(self, key, payload, thumb, readQuad, now):
+        self.cache[key] = (payload, thumb, readQuad, now)
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cacheSize:
+            self.cache.popitem(last=False)
+
+    def _crop(self, gray, quad):
+        H, W = gray.shape[:2]
+        x, y, w, h = cv2.boundingRect(quad)
+        pad = int(self.pad * max(w, h))
+        x1, y1 = max(x - pad, 0), max(y - pad, 0)
+        x2, y2 = min(x + w + pad, W), min(y + h + pad, H)
+        return gray[y1:y2, x1:x2], x1, y1
+
+    def verify(self, gray, quad):
+        """Payload read at exactly `quad`, skipping detection; "" if that fails."""
+        start = time.perf_counter()
+        crop, x1, y1 = self._crop(gray, quad)
+        payload, _ = self.decoder.decode(crop, (quad - np.float32([x1, y1])).reshape(1, 4, 2))
+        self.verifyTime += time.perf_counter() - start
+        self.verifyCount += 1
+        return payload or ""
+
+    def decode(self, gray, quad):
+        """
+        (payload, quad it was read at) of the code at `quad`, from a
+        full-resolution crop; ("", None) if unreadable.
+        """
+        start = time.perf_counter()
+        crop, x1, y1 = self._crop(gray, quad)
+        ok, payloads, points, _ = self.decoder.detectAndDecodeMulti(crop)
+        self.decodeTime += time.perf_counter() - start
+        self.decodeCount += 1
+
+        if not ok or points is None:
+            return "", None
+        # The crop may hold a neighbour too; take the code closest to the quad
+        points = (points.reshape(-1, 4, 2) + np.float32([x1, y1])).astype(np.float32)
+        best = int(np.argmin(np.linalg.norm(points.mean(axis=1) - quad.mean(axis=0), axis=1)))
+        return payloads[best], points[best]
+
+    def scan(self, frame):
+        """Returns Codes for `frame`."""
+        now = time.monotonic()
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+
+        start = time.perf_counter()
+        quads = self.locate(gray)
+        self.locateTime += time.perf_counter() - start
+        self.frameIndex += 1
+
+        boxes = np.zeros((0, 4), np.float32)
+        if len(quads):
+            boxes = np.column_stack([quads.min(axis=1), quads.max(axis=1)])
+        ids = self.tracker.update(boxes)
+        for codeId in self.tracker.removed:
+            self.codes.pop(int(codeId), None)
+        if not len(quads):
+            return emptyCodes()
+
+        data = []
+        for quad, codeId in zip(quads, ids):
+            codeId = int(codeId)
+            thumb = self._thumb(gray, quad)
+            known = self.codes.get(codeId)
+            key = quadKey(quad, self.grid)
+            if known is not None:
+                oldQuad, candidate, oldThumb, readQuad = known
+                if not self._moved(quad, oldQuad) and self._same(thumb, oldThumb):
+                    self.codes[codeId] = (quad.copy(), candidate, thumb, readQuad)
+                    data.append(candidate)
+                    continue
+                fromCache = False
+            else:
+                candidate, readQuad = self._cached(key, thumb, now) or (None, None)
+                fromCache = candidate is not None
+
+            payload = ""
+            if candidate is not None:
+                # The reduced pass can place a corner several pixels off, too rough to read at;
+                # the quad the code was last read at is better unless the code really moved
+                if self._moved(quad, readQuad):
+                    readQuad = quad
+                payload = self.verify(gray, readQuad)
+            if payload and payload == candidate:
+                self.cacheHits += fromCache
+            elif not payload:
+                # Nothing to check against, or nothing readable there
+                payload, readQuad = self.decode(gray, quad)
+            if payload:
+                self._store(key, payload, thumb, readQuad, now)
+                self.codes[codeId] = (quad.copy(), payload, thumb, readQuad)
+            else:
+                # Try again on the next frame
+                self.codes.pop(codeId, None)
+            data.append(payload)
+        return Codes(quads, data, ids.astype(np.int32))
+
+    def summary(self):
+        locateMs = self.locateTime / self.frameIndex * 1000 if self.frameIndex else 0.0
+        decodeMs = self.decodeTime / self.decodeCount * 1000 if self.decodeCount else 0.0
+        verifyMs = self.verifyTime / self.verifyCount * 1000 if self.verifyCount else 0.0
+        return (f"{self.frameIndex} frames, locate {locateMs:.1f} ms/frame, {self.decodeCount} decodes "
+                f"({decodeMs:.1f} ms each), {self.cacheHits} verified cache hits of {self.verifyCount} "
+                f"({verifyMs:.1f} ms each)")
+
+
+def drawCodes(img, codes, color=(255, 0, 0)):
+    for quad, data in zip(codes.quads, codes.data):
+        cv2.polylines(img, [quad.astype(np.int32)], True, color, 2)
+        if data:
+            x, y = quad.min(axis=0).astype(int)
+            cv2.putText(img, data, (int(x), int(y) - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+    return img
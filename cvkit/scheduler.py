@@ -0,0 +1,173 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from .detection import Detections, emptyDetections
+
+
+class FlowTracker:
+    """
+    Carries detection boxes from one frame to the next with sparse
+    Lucas-Kanade optical flow.
+
+    Each box is seeded with corner features. On every update a box moves by
+    the median displacement of its surviving points and is rescaled by the
+    median change in their spread.
+    """
+
+    def __init__(self, pointsPerBox=20, minPoints=4, winSize=(21, 21), maxLevel=3):
+        self.pointsPerBox = pointsPerBox
+        self.minPoints = minPoints
+        self.lkParams = dict(
+            winSize=winSize, maxLevel=maxLevel,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03)
+        )
+        self.prevGray = None
+        self.boxes = np.zeros((0, 4), np.float32)
+        self.points = np.zeros((0, 1, 2), np.float32)
+        self.owner = np.zeros(0, np.int32)    # Box index for every point
+
+    def _seed(self, gray, boxIndex):
+        h, w = gray.shape[:2]
+        x1, y1, x2, y2 = self.boxes[boxIndex].astype(int)
+        x1, y1, x2, y2 = max(x1, 0), max(y1, 0), min(x2, w), min(y2, h)
+        if x2 - x1 < 4 or y2 - y1 < 4:
+            return np.zeros((0, 1, 2), np.float32)
+
+        pts = cv2.goodFeaturesToTrack(gray[y1:y2, x1:x2], self.pointsPerBox, 0.01, 3)
+        if pts is None or len(pts) < self.minPoints:
+            # Flat texture: fall back to a regular grid inside the box
+            n = int(np.ceil(np.sqrt(self.pointsPerBox)))
+            gx, gy = np.meshgrid(np.linspace(0, x2 - x1 - 1, n + 2)[1:-1],
+                                 np.linspace(0, y2 - y1 - 1, n + 2)[1:-1])
+            pts = np.stack([gx.ravel(), gy.ravel()], axis=1).reshape(-1, 1, 2)
+        return (pts + np.array([x1, y1], np.float32)).astype(np.float32)
+
+    def reset(self, gray, boxes):
+        """Start tracking `boxes` (x1, y1, x2, y2) found in `gray`."""
+        self.prevGray = gray
+        self.boxes = np.asarray(boxes, np.float32).reshape(-1, 4).copy()
+        seeds = [self._seed(gray, i) for i in range(len(self.boxes))]
+        self.owner = np.concatenate([np.full(len(p), i, np.int32) for i, p in enumerate(seeds)]
+                                    or [np.zeros(0, np.int32)])
+        self.points = np.concatenate(seeds) if seeds else np.zeros((0, 1, 2), np.float32)
+
+    def update(self, gray):
+        """Moves the boxes to `gray` and returns them."""
+        if self.prevGray is None or len(self.points) == 0:
+            self.prevGray = gray
+            return self.boxes
+
+        new, status, _ = cv2.calcOpticalFlowPyrLK(self.prevGray, gray, self.points, None, **self.lkParams)
+        good = status.ravel() == 1
+        old, new, owner = self.points[good, 0], new[good, 0], self.owner[good]
+
+        for i in range(len(self.boxes)):
+            mask = owner == i
+            if mask.sum() < self.minPoints:
+                continue
+            p0, p1 = old[mask], new[mask]
+            c0, c1 = np.median(p0, axis=0), np.median(p1, axis=0)
+            spread0 = np.median(np.linalg.norm(p0 - c0, axis=1))
+            spread1 = np.median(np.linalg.norm(p1 - c1, axis=1))
+            scale = spread1 / spread0 if spread0 > 1e-3 else 1.0
+
+            x1, y1, x2, y2 = self.boxes[i]
+            bc = np.array([(x1 + x2) / 2, (y1 + y2) / 2]) + (c1 - c0)
+            half = np.array([x2 - x1, y2 - y1]) * scale / 2
+            self.boxes[i] = np.concatenate([bc - half, bc + half])
+
+        self.prevGray = gray
+        self.points = new.reshape(-1, 1, 2)
+        self.owner = owner
+
+        # Re-seed boxes that lost most of their points
+        counts = np.bincount(self.owner, minlength=len(self.boxes))
+        for i in np.flatnonzero(counts < self.minPoints):
+            pts = self._seed(gray, i)
+            self.points = np.concatenate([self.points, pts])
+            self.owner = np.concatenate([self.owner, np.full(len(pts), i, np.int32)])
+
+        return self.boxes
+
+
+class DetectionScheduler:
+    """
+    Runs an expensive detector on only some frames and tracks its boxes with
+    optical flow on the rest, so display rate no longer depends on
+    inference rate.
+
+    `detector` is any callable frame -> Detections. In sync mode it runs
+    inline every `interval` frames. In async mode it runs on a worker
+    thread: a new frame is handed over whenever the previous detection has
+    finished and at least `interval` frames have passed. Results are then
+    carried forward to the current frame.
+    """
+
+    def __init__(self, detector, interval=5, asyncDetect=False, tracker=None):
+        self.detector = detector
+        self.interval = max(1, interval)
+        self.asyncDetect = asyncDetect
+        self.tracker = tracker or FlowTracker()
+
+        self.dets = emptyDetections()
+        self.frameIndex = 0
+        self.lastSubmit = -self.interval
+        self.detectCount = 0
+        self.detectTime = 0.0
+
+        self._lock = threading.Lock()
+        self._busy = False
+        self._pending = None      # (gray the detector saw, Detections)
+
+    @property
+    def inferenceFps(self):
+        return self.detectCount / self.detectTime if self.detectTime else 0.0
+
+    def _detect(self, frame):
+        start = time.perf_counter()
+        dets = self.detector(frame)
+        self.detectTime += time.perf_counter() - start
+        self.detectCount += 1
+        return dets
+
+    def _worker(self, frame, gray):
+        dets = self._detect(frame)
+        with self._lock:
+            self._pending = (gray, dets)
+            self._busy = False
+
+    def _apply(self, gray, dets, currentGray):
+        self.tracker.reset(gray, dets.boxes)
+        boxes = self.tracker.update(currentGray) if currentGray is not gray else self.tracker.boxes
+        self.dets = Detections(boxes.copy(), dets.scores, dets.classIds)
+
+    def process(self, frame):
+        """Returns Detections for `frame`, detected or tracked."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        due = self.frameIndex - self.lastSubmit >= self.interval
+
+        if not self.asyncDetect:
+            if due:
+                self.lastSubmit = self.frameIndex
+                self._apply(gray, self._detect(frame), gray)
+            else:
+                self.dets = self.dets._replace(boxes=self.tracker.update(gray).copy())
+        else:
+            with self._lock:
+                pending, self._pending = self._pending, None
+                submit = due and not self._busy
+                if submit:
+                    self._busy = True
+            if pending is not None:
+                self._apply(pending[0], pending[1], gray)
+            else:
+                self.dets = self.dets._replace(boxes=self.tracker.update(gray).copy())
+            if submit:
+                self.lastSubmit = self.frameIndex
+                threading.Thread(target=self._worker, args=(frame.copy(), gray), daemon=True).start()
+
+        self.frameIndex += 1
+        return self.dets
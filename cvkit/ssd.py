@@ -0,0 +1,124 @@
+import importlib
+
+import cv2
+import numpy as np
+
+from .detection import Detections, cvThreads, emptyDetections
+
+
+# COCO classes used by the TensorFlow SSD models
+COCO_NAMES = {
+    0: 'background', 1: 'person', 2: 'bicycle', 3: 'car', 4: 'motorcycle', 5: 'airplane',
+    6: 'bus', 7: 'train', 8: 'truck', 9: 'boat', 10: 'traffic light', 11: 'fire hydrant',
+    13: 'stop sign', 14: 'parking meter', 15: 'bench', 16: 'bird', 17: 'cat', 18: 'dog',
+    19: 'horse', 20: 'sheep', 21: 'cow', 22: 'elephant', 23: 'bear', 24: 'zebra', 25: 'giraffe',
+    27: 'backpack', 28: 'umbrella', 31: 'handbag', 32: 'tie', 33: 'suitcase', 34: 'frisbee',
+    35: 'skis', 36: 'snowboard', 37: 'sports ball', 38: 'kite', 39: 'baseball bat',
+    40: 'baseball glove', 41: 'skateboard', 42: 'surfboard', 43: 'tennis racket', 44: 'bottle',
+    46: 'wine glass', 47: 'cup', 48: 'fork', 49: 'knife', 50: 'spoon', 51: 'bowl', 52: 'banana',
+    53: 'apple', 54: 'sandwich', 55: 'orange', 56: 'broccoli', 57: 'carrot', 58: 'hot dog',
+    59: 'pizza', 60: 'donut', 61: 'cake', 62: 'chair', 63: 'couch', 64: 'potted plant',
+    65: 'bed', 67: 'dining table', 70: 'toilet', 72: 'tv', 73: 'laptop', 74: 'mouse',
+    75: 'remote', 76: 'keyboard', 77: 'cell phone', 78: 'microwave', 79: 'oven', 80: 'toaster',
+    81: 'sink', 82: 'refrigerator', 84: 'book', 85: 'clock', 86: 'vase', 87: 'scissors',
+    88: 'teddy bear', 89: 'hair drier', 90: 'toothbrush'
+}
+
+PERSON = 1
+
+# Output names of the TF Object Detection API graph, as exported by tf2onnx
+ONNX_OUTPUTS = ["detection_boxes:0", "detection_classes:0", "detection_scores:0", "num_detections:0"]
+
+
+class SsdDetector:
+    """
+    TensorFlow SSD object detector with two interchangeable runtimes.
+
+    variant="fp32" runs the original frozen graph through cv2.dnn.
+    variant="int8" runs the quantized ONNX model made by QuantizeSSD.py
+    (in "Programs of Computer Vision Raspbery Pi") through onnxruntime.
+
+    forward() always returns the cv2.dnn DetectionOutput layout,
+    shape (1, 1, N, 7) with rows [image, classId, score, x1, y1, x2, y2] in
+    0..1 coordinates, so post-processing doesn't care which runtime ran.
+
+    `threads` caps inference threads; for fp32 only while cv2.dnn runs,
+    since OpenCV's thread pool is process-wide.
+    """
+
+    def __init__(self, variant="fp32", pb=None, pbtxt=None, onnxPath=None, size=300, threads=None):
+        self.variant = variant
+        self.size = size
+        self.threads = threads
+
+        if variant == "fp32":
+            self.net = cv2.dnn.readNetFromTensorflow(pb, pbtxt)
+        elif variant == "int8":
+            ort = importlib.import_module("onnxruntime")
+            options = ort.SessionOptions()
+            if threads:
+                options.intra_op_num_threads = threads
+            self.session = ort.InferenceSession(onnxPath, options, providers=["CPUExecutionProvider"])
+            self.inputName = self.session.get_inputs()[0].name
+        else:
+            raise ValueError(f"Unknown SSD variant: {variant}")
+
+    def blob(self, frame):
+        """Network input for a BGR frame."""
+        if self.variant == "fp32":
+            return cv2.dnn.blobFromImage(frame, size=(self.size, self.size), swapRB=True)
+        rgb = cv2.cvtColor(cv2.resize(frame, (self.size, self.size)), cv2.COLOR_BGR2RGB)
+        return rgb[None]      # NHWC uint8, as the TF graph expects
+
+    def run(self, blob):
+        if self.variant == "fp32":
+            self.net.setInput(blob)
+            with cvThreads(self.threads):
+                return self.net.forward()
+
+        boxes, classes, scores, num = self.session.run(ONNX_OUTPUTS, {self.inputName: blob})
+        n = int(num[0])
+        out = np.zeros((1, 1, n, 7), np.float32)
+        out[0, 0, :, 1] = classes[0, :n]
+        out[0, 0, :, 2] = scores[0, :n]
+        # TF boxes are ymin, xmin, ymax, xmax
+        out[0, 0, :, 3:7] = boxes[0, :n][:, [1, 0, 3, 2]]
+        return out
+
+    def forward(self, frame):
+        return self.run(self.blob(frame))
+
+
+def postprocess(output, width, height, conf=0.6, classes=None, nms=None):
+    """
+    Vectorized post-processing of a (1, 1, N, 7) DetectionOutput tensor.
+
+    Applies the confidence threshold and optional class filter to all rows
+    at once, scales boxes to `width` x `height` pixels in one operation and,
+    if `nms` is an IoU threshold, runs class-aware NMS. Returns Detections.
+    """
+    rows = output[0, 0]
+    mask = rows[:, 2] > conf
+    if classes is not None:
+        mask &= np.isin(rows[:, 1], classes)
+    if not mask.any():
+        return emptyDetections()
+
+    rows = rows[mask]
+    boxes = rows[:, 3:7] * np.array([width, height, width, height], np.float32)
+    scores = rows[:, 2].astype(np.float32)
+    classIds = rows[:, 1].astype(np.int32)
+
+    if nms is not None and len(rows) > 1:
+        xywh = np.column_stack([boxes[:, :2], boxes[:, 2:] - boxes[:, :2]])
+        keep = cv2.dnn.NMSBoxesBatched(xywh.tolist(), scores.tolist(), classIds.tolist(), conf, nms)
+        keep = np.asarray(keep, np.int64).reshape(-1)
+        boxes, scores, classIds = boxes[keep], scores[keep], classIds[keep]
+
+    return Detections(boxes.astype(np.float32), scores, classIds)
+
+
+def containsClass(output, classId=PERSON, conf=0.6):
+    """True as soon as any row of `classId` clears `conf`; no boxes are built."""
+    rows = output[0, 0]
+    return bool(np.any((rows[:, 1] == classId) & (rows[:, 2] > conf)))
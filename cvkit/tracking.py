@@ -0,0 +1,231 @@
+import time
+
+import numpy as np
+
+from .detection import boxIou
+
+
+def _centers(boxes):
+    return (boxes[:, :2] + boxes[:, 2:]) / 2
+
+
+def matchGreedy(affinity, valid):
+    """
+    Greedy one-to-one matching on an (N, M) affinity matrix, vectorized.
+
+    Each round accepts every pair that is the other's best choice (row
+    argmax == column argmax), removes those rows and columns and repeats.
+    The result is the same as sorting all pairs by affinity and taking them
+    in order, without a Python loop over N * M pairs. Returns (rows, cols).
+    """
+    aff = np.where(valid, affinity, -np.inf).astype(np.float32)
+    rows, cols = [], []
+    while aff.size and np.isfinite(aff).any():
+        bestCol = aff.argmax(axis=1)
+        bestRow = aff.argmax(axis=0)
+        r = np.flatnonzero((bestRow[bestCol] == np.arange(len(bestCol))) & np.isfinite(aff.max(axis=1)))
+        if not len(r):
+            break
+        c = bestCol[r]
+        rows.append(r)
+        cols.append(c)
+        aff[r, :] = -np.inf
+        aff[:, c] = -np.inf
+    if not rows:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+class ObjectTracker:
+    """
+    Centroid/IoU tracker with all state in NumPy arrays.
+
+    Every update matches the new boxes to the live tracks. A pair is allowed
+    if their IoU is at least `iouThreshold`, or their centres are closer
+    than `maxDistance` times the track's box diagonal (fast movers whose
+    boxes no longer overlap). Affinity is IoU minus normalized centre
+    distance. Matches are made with matchGreedy, so hundreds of boxes per
+    frame cost a few array operations. Unmatched boxes start new tracks, and
+    tracks unmatched for more than `maxMissed` updates are removed.
+
+    Usage:
+        tracker = ObjectTracker()
+        ids = tracker.update(boxes)     # boxes (N, 4) x1, y1, x2, y2 -> (N,) int32 IDs
+        tracker.removed                 # IDs dropped by this update
+    """
+
+    def __init__(self, iouThreshold=0.3, maxDistance=0.5, maxMissed=10):
+        self.iouThreshold = iouThreshold
+        self.maxDistance = maxDistance
+        self.maxMissed = maxMissed
+
+        self.ids = np.zeros(0, np.int32)
+        self.boxes = np.zeros((0, 4), np.float32)
+        self.missed = np.zeros(0, np.int32)     # Consecutive updates without a match
+        self.hits = np.zeros(0, np.int32)       # Updates with a match
+        self.removed = np.zeros(0, np.int32)
+        self.nextId = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def move(self, ids, boxes):
+        """Overrides the stored boxes of `ids`, e.g. with positions from a frame-to-frame tracker."""
+        ids = np.asarray(ids, np.int32)
+        idx = np.flatnonzero(np.isin(self.ids, ids))
+        sorter = np.argsort(ids)
+        pos = sorter[np.searchsorted(ids, self.ids[idx], sorter=sorter)]
+        self.boxes[idx] = np.asarray(boxes, np.float32).reshape(-1, 4)[pos]
+
+    def update(self, boxes):
+        boxes = np.asarray(boxes, np.float32).reshape(-1, 4)
+        out = np.full(len(boxes), -1, np.int32)
+
+        if len(boxes) and len(self.ids):
+            iou = boxIou(boxes, self.boxes)
+            diag = np.hypot(*(self.boxes[:, 2:] - self.boxes[:, :2]).T)
+            c, t = _centers(boxes), _centers(self.boxes)
+            dist = np.hypot(c[:, 0, None] - t[:, 0], c[:, 1, None] - t[:, 1])
+            dist /= np.maximum(diag, 1e-6)
+            valid = (iou >= self.iouThreshold) | (dist <= self.maxDistance)
+            rows, cols = matchGreedy(iou - dist, valid)
+        else:
+            rows = cols = np.zeros(0, np.int64)
+
+        matched = np.zeros(len(self.ids), bool)
+        matched[cols] = True
+        out[rows] = self.ids[cols]
+        self.boxes[cols] = boxes[rows]
+        self.missed[cols] = 0
+        self.hits[cols] += 1
+        self.missed[~matched] += 1
+
+        keep = self.missed <= self.maxMissed
+        self.removed = self.ids[~keep]
+        self.ids, self.boxes = self.ids[keep], self.boxes[keep]
+        self.missed, self.hits = self.missed[keep], self.hits[keep]
+
+        new = out < 0
+        n = int(new.sum())
+        if n:
+            newIds = np.arange(self.nextId, self.nextId + n, dtype=np.int32)
+            self.nextId += n
+            out[new] = newIds
+            self.ids = np.concatenate([self.ids, newIds])
+            self.boxes = np.concatenate([self.boxes, boxes[new]])
+            self.missed = np.concatenate([self.missed, np.zeros(n, np.int32)])
+            self.hits = np.concatenate([self.hits, np.ones(n, np.int32)])
+        return out
+
+
+class TrackCounter:
+    """
+    Aggregate statistics over tracked IDs.
+
+      unique  - IDs seen on at least `minHits` updates (one-frame flickers
+                aren't counted)
+      in/out  - centroid crossings of the segment `line`, ((x1, y1), (x2, y2));
+                for a line drawn left to right, "in" is moving down the frame.
+                Passing beyond either end of the segment doesn't count
+      dwell   - seconds between an ID's first and last sighting, for IDs that
+                have left (mean and p90 over the last `window` departures)
+
+    Per-ID state is kept in arrays sorted by ID so each update is a
+    searchsorted plus a few vector operations.
+    """
+
+    def __init__(self, line=None, minHits=3, window=500):
+        self.line = None if line is None else np.asarray(line, np.float32).reshape(2, 2)
+        self.minHits = minHits
+        self.window = window
+
+        self.ids = np.zeros(0, np.int32)
+        self.first = np.zeros(0, np.float64)
+        self.last = np.zeros(0, np.float64)
+        self.hits = np.zeros(0, np.int32)
+        self.side = np.zeros(0, np.int8)        # -1 / 0 / +1 side of the line
+        self.center = np.zeros((0, 2), np.float32)  # Centroid at the last sighting
+        self.dwell = np.zeros(0, np.float64)    # Recent completed dwell times
+        self.unique = 0
+        self.entered = 0
+        self.exited = 0
+        self.current = 0
+
+    def _side(self, centers):
+        (x1, y1), (x2, y2) = self.line
+        cross = (x2 - x1) * (centers[:, 1] - y1) - (y2 - y1) * (centers[:, 0] - x1)
+        return np.sign(cross).astype(np.int8)
+
+    def _onSegment(self, start, end):
+        """Whether each move from `start` to `end` meets the line between its endpoints."""
+        p, d = self.line[0], self.line[1] - self.line[0]
+        e = end - start
+        denom = d[0] * e[:, 1] - d[1] * e[:, 0]
+        # Position along the line (0..1 between its ends) where the move meets it
+        rel = start - p
+        num = rel[:, 0] * e[:, 1] - rel[:, 1] * e[:, 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = num / denom
+        return (denom != 0) & (s >= 0) & (s <= 1)
+
+    def update(self, ids, boxes, removed=(), now=None):
+        """`ids` and `boxes` (x1, y1, x2, y2) of this frame; `removed` are IDs the tracker dropped."""
+        now = time.monotonic() if now is None else now
+        ids = np.asarray(ids, np.int32)
+        boxes = np.asarray(boxes, np.float32).reshape(-1, 4)
+        self.current = len(ids)
+
+        # Insert IDs seen for the first time
+        new = ~np.isin(ids, self.ids)
+        if new.any():
+            n = int(new.sum())
+            self.ids = np.concatenate([self.ids, ids[new]])
+            self.first = np.concatenate([self.first, np.full(n, now)])
+            self.last = np.concatenate([self.last, np.full(n, now)])
+            self.hits = np.concatenate([self.hits, np.zeros(n, np.int32)])
+            self.side = np.concatenate([self.side, np.zeros(n, np.int8)])
+            self.center = np.concatenate([self.center, _centers(boxes[new])])
+            order = np.argsort(self.ids, kind="stable")
+            self.ids, self.first, self.last = self.ids[order], self.first[order], self.last[order]
+            self.hits, self.side, self.center = self.hits[order], self.side[order], self.center[order]
+
+        if len(ids):
+            idx = np.searchsorted(self.ids, ids)
+            self.last[idx] = now
+            self.hits[idx] += 1
+            self.unique += int((self.hits[idx] == self.minHits).sum())
+
+            centers = _centers(boxes)
+            if self.line is not None:
+                side = self._side(centers)
+                prev = self.side[idx]
+                crossed = self._onSegment(self.center[idx], centers)
+                self.entered += int(((prev < 0) & (side > 0) & crossed).sum())
+                self.exited += int(((prev > 0) & (side < 0) & crossed).sum())
+                # A centroid exactly on the line keeps its previous side
+                self.side[idx] = np.where(side != 0, side, prev)
+            self.center[idx] = centers
+
+        if len(removed):
+            gone = np.isin(self.ids, removed)
+            counted = gone & (self.hits >= self.minHits)
+            self.dwell = np.concatenate([self.dwell, self.last[counted] - self.first[counted]])[-self.window:]
+            keep = ~gone
+            self.ids, self.first, self.last = self.ids[keep], self.first[keep], self.last[keep]
+            self.hits, self.side, self.center = self.hits[keep], self.side[keep], self.center[keep]
+
+    def stats(self):
+        dwell = self.dwell
+        return {
+            "current": self.current,
+            "unique": self.unique,
+            "in": self.entered,
+            "out": self.exited,
+            "dwell_mean_s": float(dwell.mean()) if len(dwell) else 0.0,
+            "dwell_p90_s": float(np.percentile(dwell, 90)) if len(dwell) else 0.0,
+        }
+
+    def summary(self):
+        s = self.stats()
+        return (f"current {s['current']} | unique {s['unique']} | in {s['in']} out {s['out']} | "
+                f"dwell {s['dwell_mean_s']:.1f}s (p90 {s['dwell_p90_s']:.1f}s)")
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from cvkit.alerts import AlertDispatcher, WebhookSink, WebhookStub
+
+
+def waitFor(condition, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def stub():
+    with WebhookStub() as server:
+        yield server
+
+
+def test_debounce_needs_consecutive_frames(stub):
+    dispatcher = AlertDispatcher([WebhookSink(stub.url)], minInterval=0.0, holdFrames=3)
+    # A flicker that never holds for three frames in a row
+    assert [dispatcher.update(a) for a in (True, True, False, True, False, True, True)] == [False] * 7
+    assert dispatcher.update(True, area=1200)
+    dispatcher.close()
+    assert waitFor(lambda: len(stub.received) == 1, 2.0)
+    assert stub.received[0]["area"] == 1200
+    assert dispatcher.fired == 1
+
+
+def test_rate_limit(stub):
+    dispatcher = AlertDispatcher([WebhookSink(stub.url)], minInterval=60.0, holdFrames=1)
+    results = [dispatcher.update(True) for _ in range(10)]
+    assert results == [True] + [False] * 9
+    assert dispatcher.suppressed == 9
+    # Once the interval has passed the next frame fires again
+    dispatcher.lastFired -= 60.0
+    assert dispatcher.update(True)
+    dispatcher.close()
+    assert waitFor(lambda: len(stub.received) == 2, 2.0)
+    assert (dispatcher.fired, dispatcher.dropped) == (2, 0)
+
+
+def test_full_queue_drops_without_blocking():
+    with WebhookStub(delay=0.5) as slow:
+        dispatcher = AlertDispatcher([WebhookSink(slow.url)], minInterval=0.0, holdFrames=1, queueSize=1)
+        assert dispatcher.update(True, n=0)
+        # The worker is now stuck on the slow endpoint with the first alert
+        assert waitFor(dispatcher.queue.empty, 2.0)
+        start = time.monotonic()
+        results = [dispatcher.update(True, n=i) for i in range(1, 5)]
+        assert time.monotonic() - start < 0.1
+        assert results == [True, False, False, False]
+        assert (dispatcher.fired, dispatcher.dropped) == (2, 3)
+        dispatcher.close()
+        assert waitFor(lambda: len(slow.received) == 2, 3.0)
+        assert [a["n"] for a in slow.received] == [0, 1]
+
+
+def test_failing_sink_is_counted():
+    with WebhookStub() as gone:
+        url = gone.url
+    dispatcher = AlertDispatcher([WebhookSink(url, timeout=0.5)], minInterval=0.0, holdFrames=1)
+    assert dispatcher.update(True)
+    dispatcher.close()
+    assert dispatcher.errors == 1
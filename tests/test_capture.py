@@ -0,0 +1,114 @@
+import time
+
+import pytest
+
+from CaptureModule import FrameReader
+from MjpegStubServer import MjpegStubServer
+
+
+@pytest.fixture
+def server():
+    with MjpegStubServer(fps=60, width=320, height=240) as stub:
+        yield stub
+
+
+def waitFor(condition, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_slow_reader_gets_newest_frame(server):
+    with FrameReader(server.url) as cap:
+        ret, _, _, first = cap.readWithInfo(timeout=5.0)
+        assert ret
+        time.sleep(0.5)
+        ret, frame, _, newest = cap.readWithInfo(timeout=1.0)
+        assert ret and frame.shape == (240, 320, 3)
+        # Frames decoded while we slept were dropped, not queued
+        assert newest - first > 5
+        assert cap.dropped >= newest - first - 2
+        assert newest >= cap.frameId - 2
+
+
+def test_read_waits_for_a_new_frame(server):
+    with FrameReader(server.url) as cap:
+        ids = [cap.readWithInfo(timeout=5.0)[3] for _ in range(5)]
+        assert all(b > a for a, b in zip(ids, ids[1:]))
+
+
+def test_reconnects_after_killed_connection(server):
+    with FrameReader(server.url, readTimeout=1.0, backoff=0.05, maxBackoff=0.2) as cap:
+        assert cap.read(timeout=5.0)[0]
+        assert server.killConnections() >= 1
+        assert waitFor(lambda: cap.reconnects >= 1, 10.0)
+        assert cap.stalls >= 1
+        ret, _, _, frameId = cap.readWithInfo(timeout=5.0)
+        assert ret and cap.connected and cap.running
+        assert frameId == cap.lastId
+
+
+def test_recovers_from_stalled_stream(server):
+    with FrameReader(server.url, readTimeout=0.5, backoff=0.05, maxBackoff=0.2) as cap:
+        assert cap.read(timeout=5.0)[0]
+        server.stall(2.0)
+        assert waitFor(lambda: cap.stalls >= 1, 5.0)
+        assert not cap.connected
+        # No frames while the stream is stalled, but the reader keeps going
+        assert waitFor(lambda: cap.reconnects >= 1, 10.0)
+        assert cap.read(timeout=5.0)[0]
+        assert cap.running
+
+
+def test_watchdog_replaces_hung_capture(server, monkeypatch):
+    # Without the FFmpeg timeouts grab() blocks on a stalled socket; only the watchdog can recover
+    monkeypatch.delattr("cv2.CAP_PROP_READ_TIMEOUT_MSEC", raising=False)
+    monkeypatch.delattr("cv2.CAP_PROP_OPEN_TIMEOUT_MSEC", raising=False)
+    with FrameReader(server.url, readTimeout=0.5, backoff=0.05, maxBackoff=0.2) as cap:
+        assert cap.read(timeout=5.0)[0]
+        server.stall(1.5)
+        assert waitFor(lambda: cap.generation >= 1, 5.0)
+        assert cap.stalls >= 1
+        assert waitFor(lambda: cap.reconnects >= 1, 10.0)
+        assert cap.read(timeout=5.0)[0]
+
+
+def test_watchdog_replaces_capture_hung_in_open(server, monkeypatch):
+    monkeypatch.delattr("cv2.CAP_PROP_READ_TIMEOUT_MSEC", raising=False)
+    monkeypatch.delattr("cv2.CAP_PROP_OPEN_TIMEOUT_MSEC", raising=False)
+    with FrameReader(server.url, readTimeout=0.5, backoff=0.05, maxBackoff=0.2) as cap:
+        assert cap.read(timeout=5.0)[0]
+        # The reopen after the kill connects but gets no response until the stall ends
+        server.stallConnects(3.0)
+        server.killConnections()
+        assert waitFor(lambda: cap.generation >= 1, 5.0)
+        assert not cap.connected
+        assert waitFor(lambda: cap.reconnects >= 1, 10.0)
+        assert cap.read(timeout=5.0)[0]
+
+
+def test_release_closes_connection(server):
+    with FrameReader(server.url) as cap:
+        assert cap.read(timeout=5.0)[0]
+        assert server.connections
+    assert cap.cap is None
+    assert waitFor(lambda: not server.connections, 2.0)
+
+
+def test_read_gives_up_on_unreachable_source():
+    with MjpegStubServer() as stub:
+        url = stub.url
+    # Nothing listens on the port any more
+    with FrameReader(url, readTimeout=0.5, backoff=0.05, maxBackoff=0.2, timeout=1.0) as cap:
+        start = time.monotonic()
+        assert cap.read() == (False, None)
+        assert time.monotonic() - start < 3.0
+
+
+def test_missing_file_stops_reader(tmp_path):
+    with FrameReader(str(tmp_path / "missing.avi")) as cap:
+        assert cap.read() == (False, None)
+        assert not cap.running
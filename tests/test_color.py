@@ -0,0 +1,64 @@
+import cv2
+import numpy as np
+import pytest
+
+from cvkit.color import COLORS, ColorEngine
+
+
+def reference(bgr, classes=COLORS):
+    """Label image from cv2.inRange on HSV, first class winning, like the per-class masks it replaces."""
+    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+    labels = np.zeros(bgr.shape[:2], np.uint8)
+    for label, ranges in enumerate(classes.values(), start=1):
+        hit = np.zeros(bgr.shape[:2], bool)
+        for lower, upper in ranges:
+            hit |= cv2.inRange(hsv, lower, upper) > 0
+        labels[hit & (labels == 0)] = label
+    return labels
+
+
+def hsvPalette(h, s, v):
+    H, S, V = np.meshgrid(h, s, v, indexing="ij")
+    hsv = np.stack([H, S, V], axis=-1).reshape(-1, 1, 3).astype(np.uint8)
+    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+
+
+def test_lut_matches_inrange_on_random_palette():
+    bgr = np.random.default_rng(0).integers(0, 256, (512, 512, 3), np.uint8)
+    engine = ColorEngine(level=0)
+    labels, expected = engine.apply(bgr), reference(bgr)
+    mismatch = (labels != expected).mean()
+    assert mismatch < 0.04, f"{mismatch:.2%} of pixels labelled differently"
+    for i, name in enumerate(engine.names, start=1):
+        rate = ((labels == i) != (expected == i)).mean()
+        assert rate < 0.015, f"{name}: {rate:.2%} of pixels differ"
+
+
+def test_lut_matches_inrange_at_bin_edges():
+    # The first and last value of bins, where quantization moves a colour the most
+    v = np.uint8([0, 7, 8, 15, 16, 63, 64, 127, 128, 191, 192, 247, 248, 255])
+    b, g, r = np.meshgrid(v, v, v, indexing="ij")
+    bgr = np.stack([b, g, r], axis=-1).reshape(-1, 1, 3)
+    mismatch = (ColorEngine(level=0).apply(bgr) != reference(bgr)).mean()
+    assert mismatch < 0.04, f"{mismatch:.2%} of bin-edge colours labelled differently"
+
+
+def test_red_wraps_around_hue_circle():
+    engine = ColorEngine(level=0)
+    red = engine.names.index("red") + 1
+    bgr = hsvPalette([0, 1, 2, 5, 172, 175, 178, 179], np.arange(180, 256, 15), np.arange(180, 256, 15))
+    assert (engine.apply(bgr) == red).all()
+    # Halfway round the circle at the same saturation and value is never red
+    bgr = hsvPalette([60, 90, 120], np.arange(180, 256, 15), np.arange(180, 256, 15))
+    assert not (engine.apply(bgr) == red).any()
+
+
+@pytest.mark.parametrize("name", list(COLORS))
+def test_interior_colours_keep_their_class(name):
+    engine = ColorEngine(level=0)
+    for lower, upper in COLORS[name]:
+        # Two hue steps and 30 S/V levels inside the range, away from any boundary
+        bgr = hsvPalette(np.arange(lower[0] + 2, upper[0] - 1), np.arange(lower[1] + 30, 256, 8),
+                         np.arange(lower[2] + 30, 256, 8))
+        mismatch = (engine.apply(bgr) != engine.names.index(name) + 1).mean()
+        assert mismatch < 0.005, f"{name} {lower}-{upper}: {mismatch:.2%} mislabelled"
@@ -0,0 +1,57 @@
+import cv2
+import numpy as np
+import pytest
+
+from cvkit.detection import OnnxDetector, cvThreads
+
+
+@pytest.fixture
+def restoreThreads():
+    previous = cv2.getNumThreads()
+    yield
+    cv2.setNumThreads(previous)
+
+
+def test_cv_threads_restores_previous_count(restoreThreads):
+    cv2.setNumThreads(2)
+    with cvThreads(3):
+        assert cv2.getNumThreads() == 3
+    assert cv2.getNumThreads() == 2
+    with pytest.raises(RuntimeError):
+        with cvThreads(5):
+            raise RuntimeError
+    assert cv2.getNumThreads() == 2
+    with cvThreads(None):
+        assert cv2.getNumThreads() == 2
+
+
+class FakeNet:
+    """cv2.dnn.Net stand-in recording the OpenCV thread count each forward pass ran with."""
+
+    def __init__(self):
+        self.seen = []
+
+    def setPreferableBackend(self, backend):
+        pass
+
+    def setPreferableTarget(self, target):
+        pass
+
+    def setInput(self, blob):
+        self.blob = blob
+
+    def forward(self):
+        self.seen.append(cv2.getNumThreads())
+        return np.zeros((1, 84, 0), np.float32)
+
+
+def test_opencv_backend_only_caps_threads_while_inferring(monkeypatch, restoreThreads):
+    net = FakeNet()
+    monkeypatch.setattr(cv2.dnn, "readNetFromONNX", lambda path: net)
+    cv2.setNumThreads(2)
+    detector = OnnxDetector("model.onnx", backend="opencv", threads=3, names={})
+    # Constructing the detector leaves the rest of the process alone
+    assert cv2.getNumThreads() == 2
+    detector._forward(np.zeros((1, 3, 64, 64), np.float32))
+    assert net.seen == [3]
+    assert cv2.getNumThreads() == 2
@@ -0,0 +1,51 @@
+import numpy as np
+
+from cvkit.faces import FaceEngine, TemplateTracker, clipBoxes
+
+
+def faceFrame(x, y, size=80, shape=(240, 320), seed=0):
+    """Flat grey frame with a `size` px noise patch as the face, cut off where it leaves the frame."""
+    patch = np.random.default_rng(seed).integers(0, 256, (size, size), np.uint8)
+    frame = np.full(shape, 128, np.uint8)
+    H, W = shape
+    x1, y1, x2, y2 = max(x, 0), max(y, 0), min(x + size, W), min(y + size, H)
+    if x2 > x1 and y2 > y1:
+        frame[y1:y2, x1:x2] = patch[y1 - y:y2 - y, x1 - x:x2 - x]
+    return frame
+
+
+def test_clip_boxes():
+    boxes, keep = clipBoxes([[-30, 10, 80, 80], [300, 200, 80, 80], [400, 0, 20, 20]], (240, 320), 8)
+    assert keep.tolist() == [True, True, False]
+    assert boxes.tolist() == [[0, 10, 50, 80], [300, 200, 20, 40]]
+
+
+def test_tracker_drops_slivers_and_offframe_boxes():
+    tracker = TemplateTracker(minSize=8)
+    frame = faceFrame(-76, 50)
+    keep = tracker.reset(frame, [[-76, 50, 80, 80], [500, 50, 80, 80], [100, 100, 0, 0]])
+    assert not keep.any()
+    assert tracker.update(frame).shape == (0,)
+
+
+def test_face_at_frame_edge_is_tracked():
+    x = -30
+    engine = FaceEngine(detector=lambda frame: [(x, 60, 80, 80)], scale=1.0, interval=5)
+    ids = set()
+    for i in range(12):
+        x = -30 + 2 * i
+        faces = engine.process(faceFrame(x, 60))
+        assert len(faces.ids) == 1
+        ids.update(faces.ids.tolist())
+        bx, by, bw, bh = faces.boxes[0]
+        assert bx >= 0 and by >= 0 and bx + bw <= 320 and by + bh <= 240
+        if i % 5 == 0:
+            # Detections track the visible part of the face, not the part beyond the edge
+            assert (bx, bx + bw) == (max(x, 0), x + 80)
+    assert ids == {0}
+
+
+def test_sliver_at_frame_edge_is_ignored():
+    engine = FaceEngine(detector=lambda frame: [(316, 60, 80, 80)], scale=0.5, interval=2)
+    for _ in range(4):
+        assert len(engine.process(faceFrame(316, 60)).ids) == 0
@@ -0,0 +1,166 @@
+import numpy as np
+import pytest
+
+from cvkit import gating
+from cvkit.detection import Detections, emptyDetections
+from cvkit.gating import MotionGate, detectRegions, mergeRegions
+
+
+def blockFrame(x, y=100, size=60, shape=(240, 320)):
+    """Grey BGR frame with a white square at x, y; x=None gives the empty scene."""
+    frame = np.full(shape + (3,), 90, np.uint8)
+    if x is not None:
+        frame[y:y + size, x:x + size] = 255
+    return frame
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the gate's monotonic clock with one the test advances by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(gating.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_still_scene_only_runs_on_keepalive(clock):
+    gate = MotionGate(keepAlive=10.0, holdFrames=3)
+    # The first frame has no run to compare against, so it always runs
+    assert gate.check(blockFrame(50))
+    assert gate.reason == "keepalive"
+    for _ in range(20):
+        clock[0] += 0.4
+        assert not gate.check(blockFrame(50))
+        assert gate.reason is None and len(gate.boxes) == 0
+    clock[0] += 2.5
+    assert gate.check(blockFrame(50))
+    assert gate.reason == "keepalive"
+    # The keep-alive interval restarts from that run
+    clock[0] += 9.0
+    assert not gate.check(blockFrame(50))
+    assert (gate.runs, gate.frames) == (2, 23)
+
+
+def test_motion_then_hold_then_skip(clock):
+    gate = MotionGate(keepAlive=10.0, holdFrames=3)
+    gate.check(blockFrame(None))
+    reasons = []
+    for x in (20, 60, 100, 140):
+        clock[0] += 0.1
+        assert gate.check(blockFrame(x))
+        reasons.append(gate.reason)
+        # The motion regions cover the square in its new spot
+        x1, y1 = gate.boxes[:, :2].min(axis=0)
+        x2, y2 = (gate.boxes[:, :2] + gate.boxes[:, 2:]).max(axis=0)
+        assert x1 <= x and y1 <= 100 and x2 >= x + 60 and y2 >= 160
+    assert reasons == ["motion"] * 4
+    # The square has stopped: the detector keeps running for holdFrames frames
+    for expected in ("hold", "hold", "hold", None, None):
+        clock[0] += 0.1
+        assert gate.check(blockFrame(140)) == (expected is not None)
+        assert gate.reason == expected
+        assert len(gate.boxes) == 0
+    # Motion always runs, however recently the detector ran
+    clock[0] += 0.1
+    assert gate.check(blockFrame(180))
+    assert gate.reason == "motion" and gate.idle == 0
+    assert gate.summary() == "detector ran on 9/11 frames (82%)"
+
+
+def test_hold_counts_from_the_last_motion(clock):
+    gate = MotionGate(keepAlive=100.0, holdFrames=2)
+    gate.check(blockFrame(None))
+    runs = [gate.check(blockFrame(x)) for x in (20, 20, 60, 60, 60, 60)]
+    assert runs == [True, True, True, True, True, False]
+    assert gate.dutyCycle == pytest.approx(6 / 7)
+
+
+SHAPE = (720, 1280, 3)
+
+
+def covers(region, box):
+    x1, y1, x2, y2 = region
+    x, y, w, h = box
+    return x1 <= x and y1 <= y and x + w <= x2 and y + h <= y2
+
+
+def test_merge_regions_empty():
+    rois = mergeRegions(np.zeros((0, 4), np.int32), SHAPE)
+    assert rois.shape == (0, 4) and rois.dtype == np.int32
+
+
+def test_small_box_grows_to_min_size_square():
+    rois = mergeRegions(np.int32([[600, 300, 20, 40]]), SHAPE, minSize=300)
+    # Centred on the box, 300 px square however small the motion was
+    assert rois.tolist() == [[460, 170, 760, 470]]
+    # A large box is padded by `pad` of its size instead
+    rois = mergeRegions(np.int32([[500, 300, 200, 100]]), SHAPE, pad=0.25, minSize=100)
+    assert rois.tolist() == [[450, 200, 750, 500]]
+
+
+@pytest.mark.parametrize("box, expected", [
+    ([0, 0, 20, 20], [0, 0, 300, 300]),
+    ([1270, 710, 10, 10], [980, 420, 1280, 720]),
+    ([5, 600, 30, 30], [0, 420, 300, 720]),
+])
+def test_regions_are_shifted_inside_the_frame(box, expected):
+    rois = mergeRegions(np.int32([box]), SHAPE, minSize=300)
+    assert rois.tolist() == [expected]
+
+
+def test_min_size_larger_than_frame_is_clamped():
+    rois = mergeRegions(np.int32([[100, 100, 20, 20]]), (240, 320, 3), minSize=500, maxCoverage=1.0)
+    assert rois.tolist() == [[0, 0, 320, 240]]
+
+
+def test_overlapping_regions_are_merged():
+    boxes = np.int32([[400, 300, 40, 40], [600, 320, 40, 40]])
+    rois = mergeRegions(boxes, SHAPE, minSize=300)
+    assert len(rois) == 1
+    x1, y1, x2, y2 = rois[0]
+    assert x2 - x1 == y2 - y1
+    assert all(covers(rois[0], b) for b in boxes)
+
+
+def test_far_regions_stay_separate_up_to_max_regions():
+    boxes = np.int32([[20, 20, 30, 30], [300, 20, 30, 30], [800, 600, 30, 30], [1200, 650, 30, 30]])
+    rois = mergeRegions(boxes, SHAPE, minSize=200, maxRegions=4)
+    assert len(rois) == 4
+    # One over the limit: the closest pair shares a crop, every box is still covered
+    rois = mergeRegions(boxes, SHAPE, minSize=200, maxRegions=3)
+    assert len(rois) == 3
+    assert all(any(covers(r, b) for r in rois) for b in boxes)
+    assert sum(covers(r, boxes[0]) and covers(r, boxes[1]) for r in rois) == 1
+
+
+def test_full_frame_when_crops_cover_too_much():
+    boxes = np.int32([[100, 100, 400, 400], [700, 200, 400, 400]])
+    assert mergeRegions(boxes, SHAPE, maxCoverage=0.6) is None
+    assert mergeRegions(boxes, SHAPE, maxCoverage=1.0) is not None
+
+
+def fakeDetect(crop):
+    """One detection at a fixed spot of each crop, scored by the crop's width."""
+    if crop.shape[1] < 100:
+        return emptyDetections()
+    return Detections(np.float32([[10, 20, 50, 80]]), np.float32([crop.shape[1] / 1000]), np.int32([1]))
+
+
+def test_detect_regions_maps_back_to_frame():
+    frame = np.zeros(SHAPE, np.uint8)
+    regions = np.int32([[100, 50, 400, 350], [900, 300, 1200, 600], [0, 0, 50, 50]])
+    dets = detectRegions(frame, regions, fakeDetect)
+    # The 50 px crop found nothing and is left out
+    assert dets.boxes.tolist() == [[110, 70, 150, 130], [910, 320, 950, 380]]
+    np.testing.assert_allclose(dets.scores, [0.3, 0.3])
+    assert dets.classIds.tolist() == [1, 1]
+    # Scaled for a half-size display copy
+    dets = detectRegions(frame, regions, fakeDetect, scale=0.5)
+    assert dets.boxes.tolist() == [[55, 35, 75, 65], [455, 160, 475, 190]]
+
+
+def test_detect_regions_empty():
+    frame = np.zeros(SHAPE, np.uint8)
+    for regions in (np.zeros((0, 4), np.int32), np.int32([[0, 0, 50, 50]])):
+        dets = detectRegions(frame, regions, fakeDetect)
+        assert dets.boxes.shape == (0, 4) and dets.boxes.dtype == np.float32
+        assert len(dets.scores) == len(dets.classIds) == 0
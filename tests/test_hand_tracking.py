@@ -0,0 +1,157 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from cvkit import hand_tracking
+from cvkit.hand_tracking import bboxArray, distanceArray, fingersUpArray, handDetector, pairwiseDistanceArray
+
+
+class FakeHands:
+    """
+    Stand-in for mp.solutions.hands.Hands that finds one bright block.
+
+    Its 21 landmarks lie on a grid over the block, z scaled by the block
+    width like MediaPipe's relative depth. In video mode, like
+    MediaPipe, it only looks near where the hand was in its previous input
+    until it loses it or is reset; `detections` counts the full searches.
+    """
+
+    def __init__(self, static_image_mode, max_num_hands, min_detection_confidence, min_tracking_confidence):
+        self.static = static_image_mode
+        self.state = None
+        self.detections = 0
+        self.calls = 0
+
+    def reset(self):
+        self.state = None
+
+    def process(self, rgb):
+        self.calls += 1
+        h, w = rgb.shape[:2]
+        mask = rgb[..., 0] > 128
+        if self.state is not None and not self.static:
+            x0, y0, x1, y1 = self.state
+            near = np.zeros_like(mask)
+            near[max(y0 - 20, 0):y1 + 20, max(x0 - 20, 0):x1 + 20] = True
+            mask &= near
+        else:
+            self.detections += 1
+        ys, xs = np.nonzero(mask)
+        if not len(xs):
+            self.state = None
+            return SimpleNamespace(multi_hand_landmarks=None)
+
+        xmin, xmax, ymin, ymax = xs.min(), xs.max(), ys.min(), ys.max()
+        self.state = (xmin, ymin, xmax + 1, ymax + 1)
+        landmark = [SimpleNamespace(x=(xmin + (i % 5) / 4 * (xmax - xmin)) / w,
+                                    y=(ymin + (i // 5) / 4 * (ymax - ymin)) / h,
+                                    z=0.01 * i * (xmax - xmin) / w) for i in range(21)]
+        return SimpleNamespace(multi_hand_landmarks=[SimpleNamespace(landmark=landmark)])
+
+
+@pytest.fixture(autouse=True)
+def fakeMediapipe(monkeypatch):
+    hands = SimpleNamespace(Hands=FakeHands, HAND_CONNECTIONS=())
+    monkeypatch.setattr(hand_tracking, "_mp", SimpleNamespace(solutions=SimpleNamespace(hands=hands)))
+
+
+def handFrame(x, y, size=(640, 480)):
+    frame = np.zeros((size[1], size[0], 3), np.uint8)
+    frame[y:y + 80, x:x + 60] = 255
+    return frame
+
+
+def test_roi_landmarks_match_full_frame():
+    full = handDetector()
+    tracked = handDetector(roiTracking=True)
+    for i in range(40):
+        frame = handFrame(100 + 4 * i, 150 + i)
+        full.findHands(frame, draw=False)
+        tracked.findHands(frame, draw=False)
+        expected = full.findPositions(frame)
+        assert expected.shape == (1, 21, 3)
+        np.testing.assert_allclose(tracked.findPositions(frame), expected, atol=1e-3)
+    # Most frames were served from the crop
+    assert tracked.roiHands.calls > 30
+
+
+def test_crop_stays_fixed_while_tracking():
+    det = handDetector(roiTracking=True)
+    crops = []
+    for i in range(40):
+        det.findHands(handFrame(100 + 4 * i, 150), draw=False)
+        if det.roiFrames:
+            assert det.roi == crops[-1]
+        elif det.roi != (crops[-1] if crops else None):
+            crops.append(det.roi)
+        # The block is always inside the crop it is searched in next
+        x0, y0, x1, y1 = det.roi
+        assert x0 <= 100 + 4 * (i + 1) and 160 + 4 * (i + 1) <= x1 and y0 <= 150 and 230 <= y1
+    # The hand drifted towards the edge and the crop was re-centred a few times,
+    # each time restarting the crop graph instead of tracking with stale state
+    assert len(crops) >= 3
+    assert det.roiHands.detections == len(crops)
+
+
+def landmarkResults(pixels, w, h):
+    """MediaPipe-style results for (n_hands, 21, 2) integer pixel positions."""
+    hands = [SimpleNamespace(landmark=[SimpleNamespace(x=(x + 0.5) / w, y=(y + 0.5) / h, z=0.0)
+                                       for x, y in hand]) for hand in pixels]
+    return SimpleNamespace(multi_hand_landmarks=hands)
+
+
+@pytest.fixture
+def randomHands():
+    """A detector holding 50 random hands on a 640x480 image, half of them mirrored (thumb pointing left)."""
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(40, 440, (50, 21, 2))
+    # Left hands: thumb tip left of the joint below it; right hands: to the right
+    pixels[:25, 4, 0] = pixels[:25, 3, 0] - rng.integers(1, 40, 25)
+    pixels[25:, 4, 0] = pixels[25:, 3, 0] + rng.integers(1, 40, 25)
+    img = np.zeros((480, 640, 3), np.uint8)
+    det = handDetector(maxHands=50)
+    det.results = landmarkResults(pixels, 640, 480)
+    return det, img
+
+
+def listApi(det, img, handNo):
+    lmList, bbox = det.findPosition(img, handNo, draw=False)
+    return lmList, bbox, det.fingersUp()
+
+
+def test_fingers_up_array_matches_list_api(randomHands):
+    det, img = randomHands
+    fingers = fingersUpArray(det.findPositions(img))
+    for i in range(len(fingers)):
+        assert fingers[i].tolist() == listApi(det, img, i)[2]
+    # Both thumb directions occur, and the thumb follows them
+    assert fingers[:25, 0].sum() == 0 and fingers[25:, 0].sum() == 25
+
+
+def test_distance_arrays_match_find_distance(randomHands):
+    det, img = randomHands
+    hands = det.findPositions(img)
+    ids = (4, 8, 12, 16, 20)
+    pairwise = pairwiseDistanceArray(hands, ids)
+    for i in range(len(hands)):
+        listApi(det, img, i)
+        for a, p1 in enumerate(ids):
+            for b, p2 in enumerate(ids):
+                length = det.findDistance(p1, p2, img, draw=False)[0]
+                assert pairwise[i, a, b] == pytest.approx(length, abs=1e-3)
+        assert distanceArray(hands, 4, 8)[i] == pytest.approx(det.findDistance(4, 8, img, draw=False)[0], abs=1e-3)
+
+
+def test_bbox_array_matches_find_position(randomHands):
+    det, img = randomHands
+    boxes = bboxArray(det.findPositions(img))
+    for i in range(len(boxes)):
+        assert tuple(boxes[i]) == listApi(det, img, i)[1]
+
+
+def test_empty_landmark_array():
+    empty = np.zeros((0, 21, 3), np.float32)
+    assert fingersUpArray(empty).shape == (0, 5)
+    assert distanceArray(empty, 4, 8).shape == (0,)
+    assert bboxArray(empty).shape == (0, 4)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from cvkit.motion import MODELS, MotionEngine
+
+
+@pytest.fixture(scope="module")
+def background():
+    """Textured 320x240 scene, so the subtractors learn more than a flat grey."""
+    rng = np.random.default_rng(0)
+    tiles = rng.integers(40, 160, (12, 16, 3), np.uint8)
+    return np.kron(tiles, np.ones((20, 20, 1), np.uint8))
+
+
+def withNoise(frame, rng, sigma=2.0):
+    return np.clip(frame + rng.normal(0, sigma, frame.shape), 0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_static_background_then_moving_block(model, background):
+    rng = np.random.default_rng(1)
+    engine = MotionEngine(model, level=1, threshold=20, dilate=3, minArea=1000)
+    # MOG2 and KNN flag the whole frame until their model has a few samples
+    for _ in range(10):
+        engine.apply(withNoise(background, rng))
+    for _ in range(30):
+        boxes = engine.apply(withNoise(background, rng))
+        assert boxes.shape == (0, 4), f"{model} saw motion in a static scene: {boxes.tolist()}"
+
+    for x in range(40, 200, 20):
+        frame = background.copy()
+        frame[90:150, x:x + 60] = 255
+        boxes = engine.apply(withNoise(frame, rng))
+    assert len(boxes) >= 1
+    # Every backend boxes the block's last position; trails of where it was may widen the box
+    # but it stays inside the strip the block swept
+    x1, y1 = boxes[:, :2].min(axis=0)
+    x2, y2 = (boxes[:, :2] + boxes[:, 2:]).max(axis=0)
+    assert x1 <= x + 8 and x2 >= x + 52 and y1 <= 98 and y2 >= 142
+    assert x1 >= 40 - 20 and x2 <= x + 60 + 20 and y1 >= 90 - 20 and y2 <= 150 + 20
+
+
+def test_unknown_model():
+    with pytest.raises(ValueError, match="Unknown background model"):
+        MotionEngine("optical_flow")
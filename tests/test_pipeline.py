@@ -0,0 +1,82 @@
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from cvkit.pipeline import Pipeline
+
+
+FRAMES = 40
+
+
+@pytest.fixture(scope="module")
+def video(tmp_path_factory):
+    """FRAMES grey 160x120 frames; frame i is filled with 5 * i so it can be told apart after MJPG."""
+    path = str(tmp_path_factory.mktemp("pipeline") / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (160, 120))
+    assert writer.isOpened()
+    for i in range(FRAMES):
+        writer.write(np.full((120, 160, 3), 5 * i, np.uint8))
+    writer.release()
+    return path
+
+
+def frameIndex(frame):
+    return int(round(frame.mean() / 5))
+
+
+def test_block_delivers_every_frame_in_order(video):
+    seen = []
+
+    def render(packet):
+        seen.append((packet.index, packet.result))
+
+    pipeline = Pipeline(video, frameIndex, render, policy="block").run()
+    assert seen == [(i, i) for i in range(FRAMES)]
+    assert pipeline.frames == FRAMES
+    assert pipeline.inferQueue.dropped == pipeline.renderQueue.dropped == 0
+
+
+def test_drop_oldest_drops_but_stays_bounded(video):
+    seen = []
+    depths = []
+
+    def infer(frame):
+        time.sleep(0.01)
+        return frameIndex(frame)
+
+    def render(packet):
+        depths.append(len(pipeline.inferQueue.items))
+        seen.append(packet.result)
+        time.sleep(0.02)
+
+    pipeline = Pipeline(video, infer, render, policy="drop_oldest", queueSize=2)
+    pipeline.run()
+    dropped = pipeline.inferQueue.dropped + pipeline.renderQueue.dropped
+    assert dropped > 0
+    assert len(seen) + dropped == FRAMES
+    # Whatever got through is still in capture order
+    assert seen == sorted(seen) and len(set(seen)) == len(seen)
+    assert max(depths) <= 2
+
+
+@pytest.mark.parametrize("policy", ["block", "drop_oldest"])
+def test_stop_joins_stage_threads(video, policy):
+    pipeline = Pipeline(video, frameIndex, lambda packet: pipeline.frames < 5, policy=policy)
+    pipeline.run()
+    # drop_oldest may drop most of the short clip before render gets to stop it
+    assert pipeline.frames == 6 if policy == "block" else 1 <= pipeline.frames <= 6
+    assert len(pipeline.threads) == 2
+    assert not any(t.is_alive() for t in pipeline.threads)
+
+
+def test_histograms_filled(video):
+    pipeline = Pipeline(video, frameIndex, lambda packet: None, policy="block").run()
+    hists = pipeline.histograms
+    assert hists["capture"].count == hists["infer"].count == FRAMES
+    assert hists["render"].count == hists["end2end"].count == FRAMES
+    for hist in hists.values():
+        assert hist.counts.sum() == hist.count
+        assert 0.0 < hist.percentile(50) <= hist.percentile(99)
+    assert hists["end2end"].mean >= hists["infer"].mean
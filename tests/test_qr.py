@@ -0,0 +1,42 @@
+import cv2
+import numpy as np
+
+from cvkit.qr import QrScanner
+
+
+def shelf(payloads, size=(1280, 720), hidden=()):
+    """A grey frame with a row of QR codes, 150 px each, `hidden` indices blanked out."""
+    encoder = cv2.QRCodeEncoder.create()
+    frame = np.full((size[1], size[0], 3), 200, np.uint8)
+    for i, payload in enumerate(payloads):
+        if i in hidden:
+            continue
+        code = cv2.resize(encoder.encode(payload), (150, 150), interpolation=cv2.INTER_NEAREST)
+        code = cv2.copyMakeBorder(code, 15, 15, 15, 15, cv2.BORDER_CONSTANT, value=255)
+        x = 60 + i * 300
+        frame[200:200 + code.shape[0], x:x + code.shape[1]] = code[..., None]
+    return frame
+
+
+def test_static_codes_decode_once():
+    payloads = ["SHELF-001-BIN-01", "SHELF-002-BIN-02", "SHELF-003-BIN-03"]
+    scanner = QrScanner()
+    frame = shelf(payloads)
+    for _ in range(10):
+        codes = scanner.scan(frame)
+        assert sorted(codes.data) == payloads
+    assert scanner.decodeCount == len(payloads)
+
+
+def test_similar_label_in_same_spot_is_reread():
+    old = ["SHELF-001-BIN-01", "SHELF-002-BIN-02"]
+    new = ["SHELF-001-BIN-07", "SHELF-002-BIN-02"]
+    scanner = QrScanner(maxMissed=0)
+    for _ in range(3):
+        scanner.scan(shelf(old))
+    # Hide the first code long enough for its track to end, then put a near-identical label there
+    for _ in range(2):
+        scanner.scan(shelf(old, hidden={0}))
+    for _ in range(3):
+        codes = scanner.scan(shelf(new))
+        assert sorted(codes.data) == new
@@ -0,0 +1,49 @@
+import math
+
+import cv2
+import numpy as np
+import pytest
+
+from cvkit.sketch import SketchFilter
+
+
+def original(frame, ksize=21):
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    blur = cv2.GaussianBlur(255 - gray, (ksize, ksize), 0)
+    return cv2.divide(gray, 255 - blur, scale=256)
+
+
+def texturedFrame(seed, brightness=1.0, size=(1920, 1080)):
+    """Multi-scale noise plus a fine checkerboard, so the blur has detail at every scale."""
+    rng = np.random.default_rng(seed)
+    w, h = size
+    img = np.zeros((h, w), np.float32)
+    for s in (1, 2, 4, 8, 16, 32, 64):
+        noise = rng.normal(0, 1, (h // s + 1, w // s + 1)).astype(np.float32)
+        img += cv2.resize(noise, (w, h), interpolation=cv2.INTER_CUBIC) * 40 / math.sqrt(s)
+    img += (np.indices((h, w)).sum(axis=0) // 6 % 2) * 40
+    img = cv2.normalize(img, None, 0, 255 * brightness, cv2.NORM_MINMAX)
+    return cv2.cvtColor(img.astype(np.uint8), cv2.COLOR_GRAY2BGR)
+
+
+@pytest.mark.parametrize("brightness", [1.0, 0.3])
+def test_default_within_tolerance(brightness):
+    frame = texturedFrame(0, brightness)
+    diff = np.abs(SketchFilter().apply(frame).astype(np.int16) - original(frame))
+    assert diff.mean() <= 1.5
+    assert (diff <= 8).mean() >= 0.995
+
+
+def test_level0_matches_original():
+    frame = texturedFrame(1, size=(640, 480))
+    diff = np.abs(SketchFilter(level=0).apply(frame).astype(np.int16) - original(frame))
+    assert diff.max() == 0
+
+
+def test_buffers_follow_frame_size():
+    sketcher = SketchFilter()
+    for size in ((640, 480), (321, 241), (640, 480)):
+        frame = texturedFrame(2, size=size)
+        out = sketcher.apply(frame)
+        assert out.shape == frame.shape[:2]
+        assert (np.abs(out.astype(np.int16) - original(frame)) <= 8).mean() >= 0.99
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from cvkit.ssd import COCO_NAMES, ONNX_OUTPUTS, PERSON, SsdDetector, containsClass, postprocess
+
+
+def ssdOutput(rows):
+    """(1, 1, N, 7) DetectionOutput tensor from [classId, score, x1, y1, x2, y2] rows."""
+    rows = np.asarray(rows, np.float32).reshape(-1, 6)
+    return np.concatenate([np.zeros((len(rows), 1), np.float32), rows], axis=1)[None, None]
+
+
+OUTPUT = ssdOutput([
+    [1, 0.90, 0.10, 0.20, 0.30, 0.60],    # person
+    [3, 0.75, 0.50, 0.50, 0.90, 0.80],    # car
+    [1, 0.55, 0.60, 0.10, 0.70, 0.40],    # person below the default threshold
+    [18, 0.61, 0.00, 0.00, 1.00, 1.00],   # dog just above it
+    [1, 0.60, 0.20, 0.20, 0.40, 0.40],    # exactly at the threshold: dropped
+])
+
+
+def test_threshold_and_scaling():
+    dets = postprocess(OUTPUT, 600, 400)
+    assert dets.classIds.tolist() == [1, 3, 18]
+    assert [COCO_NAMES[c] for c in dets.classIds] == ["person", "car", "dog"]
+    np.testing.assert_allclose(dets.scores, [0.90, 0.75, 0.61], rtol=1e-6)
+    np.testing.assert_allclose(dets.boxes[0], [60, 80, 180, 240], rtol=1e-5)
+    np.testing.assert_allclose(dets.boxes[2], [0, 0, 600, 400], rtol=1e-5)
+    assert dets.boxes.dtype == np.float32 and dets.classIds.dtype == np.int32
+
+
+def test_lower_threshold_keeps_more():
+    assert len(postprocess(OUTPUT, 600, 400, conf=0.5).boxes) == 5
+
+
+def test_class_filter():
+    dets = postprocess(OUTPUT, 600, 400, conf=0.5, classes=(PERSON,))
+    assert dets.classIds.tolist() == [1, 1, 1]
+    dets = postprocess(OUTPUT, 600, 400, classes=(3, 18))
+    assert dets.classIds.tolist() == [3, 18]
+
+
+@pytest.mark.parametrize("output", [OUTPUT, ssdOutput([])])
+def test_empty_result(output):
+    dets = postprocess(output, 600, 400, conf=0.95)
+    assert dets.boxes.shape == (0, 4) and len(dets.scores) == len(dets.classIds) == 0
+    assert len(postprocess(output, 600, 400, classes=(90,)).boxes) == 0
+
+
+def test_nms_is_class_aware():
+    output = ssdOutput([
+        [1, 0.9, 0.10, 0.10, 0.50, 0.50],
+        [1, 0.8, 0.12, 0.12, 0.52, 0.52],    # duplicate person
+        [3, 0.7, 0.12, 0.12, 0.52, 0.52],    # car on the same spot stays
+    ])
+    dets = postprocess(output, 100, 100, conf=0.5, nms=0.5)
+    order = np.argsort(dets.classIds)
+    assert dets.classIds[order].tolist() == [1, 3]
+    np.testing.assert_allclose(dets.scores[order], [0.9, 0.7], rtol=1e-6)
+
+
+def test_contains_class():
+    assert containsClass(OUTPUT, PERSON, 0.6)
+    assert not containsClass(OUTPUT, PERSON, 0.9)
+    assert containsClass(OUTPUT, 18, 0.6)
+    assert not containsClass(OUTPUT, 3, 0.8)
+    assert not containsClass(ssdOutput([]))
+
+
+class FakeSession:
+    """onnxruntime session returning TF Object Detection API outputs, padded past num_detections."""
+
+    def run(self, names, feeds):
+        assert names == ONNX_OUTPUTS
+        boxes = np.float32([[[0.2, 0.1, 0.6, 0.3], [0.5, 0.5, 0.8, 0.9], [0, 0, 0, 0]]])
+        classes = np.float32([[1, 3, 0]])
+        scores = np.float32([[0.9, 0.7, 0.0]])
+        return boxes, classes, scores, np.float32([2])
+
+
+def test_int8_output_maps_to_detection_layout():
+    det = SsdDetector.__new__(SsdDetector)
+    det.variant, det.size, det.session, det.inputName = "int8", 300, FakeSession(), "image_tensor:0"
+    out = det.run(np.zeros((1, 300, 300, 3), np.uint8))
+    assert out.shape == (1, 1, 2, 7)
+    dets = postprocess(out, 600, 400, conf=0.5)
+    assert dets.classIds.tolist() == [PERSON, 3]
+    # TF ymin, xmin, ymax, xmax become x1, y1, x2, y2
+    np.testing.assert_allclose(dets.boxes[0], [60, 80, 180, 240], rtol=1e-5)
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from cvkit.tracking import ObjectTracker, TrackCounter, matchGreedy
+
+
+def sortedGreedy(affinity, valid):
+    """Reference greedy matching: take pairs by descending affinity."""
+    rows, cols = set(), set()
+    pairs = []
+    for flat in np.argsort(-affinity, axis=None, kind="stable"):
+        r, c = np.unravel_index(flat, affinity.shape)
+        if valid[r, c] and r not in rows and c not in cols:
+            rows.add(r)
+            cols.add(c)
+            pairs.append((int(r), int(c)))
+    return sorted(pairs)
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (5, 8), (30, 20), (100, 100)])
+def test_match_greedy_equals_sorted_pairs(shape):
+    rng = np.random.default_rng(sum(shape))
+    for _ in range(20):
+        affinity = rng.random(shape).astype(np.float32)
+        valid = rng.random(shape) < 0.6
+        rows, cols = matchGreedy(affinity, valid)
+        assert sorted(zip(rows.tolist(), cols.tolist())) == sortedGreedy(affinity, valid)
+
+
+def test_match_greedy_empty():
+    rows, cols = matchGreedy(np.zeros((0, 3)), np.zeros((0, 3), bool))
+    assert len(rows) == len(cols) == 0
+    rows, cols = matchGreedy(np.ones((2, 2)), np.zeros((2, 2), bool))
+    assert len(rows) == len(cols) == 0
+
+
+def walkers(n, steps, seed=0, size=20.0):
+    """(steps, n, 4) x1, y1, x2, y2 boxes of `n` objects on a grid, each drifting a few pixels per step."""
+    rng = np.random.default_rng(seed)
+    side = int(np.ceil(np.sqrt(n)))
+    start = np.stack(np.divmod(np.arange(n), side), axis=1)[:, ::-1] * size * 3.0
+    drift = rng.normal(0, 2.0, (steps, n, 2)).cumsum(axis=0)
+    corners = start + drift
+    return np.concatenate([corners, corners + size], axis=2).astype(np.float32)
+
+
+def test_ids_stable_under_permutation():
+    rng = np.random.default_rng(1)
+    tracks = walkers(300, 30)
+    tracker = ObjectTracker()
+    first = tracker.update(tracks[0])
+    for boxes in tracks[1:]:
+        order = rng.permutation(len(boxes))
+        ids = tracker.update(boxes[order])
+        # Each object keeps its ID whatever order the boxes come in
+        assert (ids == first[order]).all()
+    assert tracker.nextId == 300
+
+
+def test_missed_tracks_are_removed():
+    tracker = ObjectTracker(maxMissed=2)
+    boxes = np.float32([[0, 0, 10, 10], [50, 50, 60, 60]])
+    ids = tracker.update(boxes)
+    for _ in range(2):
+        assert (tracker.update(boxes[:1]) == ids[:1]).all()
+        assert len(tracker.removed) == 0
+    tracker.update(boxes[:1])
+    assert tracker.removed.tolist() == [ids[1]]
+    # A box back in the same spot is a new object now
+    assert tracker.update(boxes)[1] == 2
+
+
+def box(cx, cy, half=5):
+    return [cx - half, cy - half, cx + half, cy + half]
+
+
+def test_counter_in_out_on_segment():
+    counter = TrackCounter(line=((100, 100), (200, 100)), minHits=1)
+    # ID 0 walks down through the segment and back up; ID 1 walks down to the left of it
+    for t, y in enumerate(range(60, 141, 10)):
+        counter.update([0, 1], [box(150, y), box(50, y)], now=t)
+    for t, y in enumerate(range(140, 59, -10), start=10):
+        counter.update([0, 1], [box(150, y), box(50, y)], now=t)
+    stats = counter.stats()
+    assert (stats["in"], stats["out"]) == (1, 1)
+    assert stats["unique"] == 2
+
+
+def test_counter_ignores_crossing_beyond_segment_end():
+    counter = TrackCounter(line=((100, 100), (200, 100)), minHits=1)
+    # Diagonal move that crosses y = 100 at x = 205, just past the end of the segment
+    counter.update([0], [box(195, 90)], now=0)
+    counter.update([0], [box(215, 110)], now=1)
+    assert counter.stats()["in"] == 0
+    # Back across through the segment itself
+    counter.update([0], [box(175, 90)], now=2)
+    assert counter.stats()["out"] == 1
+
+
+def test_counter_dwell_and_removal():
+    counter = TrackCounter(minHits=2)
+    for t in range(5):
+        counter.update([3, 7], [box(10, 10), box(50, 50)], now=float(t))
+    counter.update([7], [box(50, 50)], removed=[3], now=5.0)
+    assert counter.ids.tolist() == [7]
+    assert counter.stats()["dwell_mean_s"] == 4.0